@@ -8,23 +8,133 @@ Database utilities for Persian Life Manager Application
 import os
 import sqlite3
 import logging
+import threading
 import time
-from typing import List, Dict, Any, Union, Optional, Tuple
+from contextlib import contextmanager
+from typing import List, Dict, Any, Union, Optional, Tuple, Iterator
 
 logger = logging.getLogger(__name__)
 
+# Compiled statements kept per connection; services reuse the same SQL text on hot paths
+STATEMENT_CACHE_SIZE = 256
+
+# Rows fetched per round when streaming a result set
+FETCH_BATCH_SIZE = 500
+
+# Applied to every connection; WAL itself is recorded in the database file
+# when the database is opened, so NORMAL is safe for all of them
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+)
+
+# Applied once when a long-lived connection is opened
+PERSISTENT_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA wal_autocheckpoint=1000",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+)
+
+# Schema version recorded in PRAGMA user_version once every migration below
+# has been applied
+SCHEMA_VERSION = 1
+
+# Finance categories sharing a (user_id, name), as older versions allowed.
+# Each group is merged into its lowest ID: transactions move to it and the
+# other rows are deleted. A group mixing types keeps 'both', so every moved
+# transaction still matches its category's type.
+_SQL_DUPLICATE_CATEGORIES = (
+    "SELECT user_id, name, GROUP_CONCAT(id) AS ids, COUNT(DISTINCT type) AS types "
+    "FROM finance_categories GROUP BY user_id, name HAVING COUNT(*) > 1"
+)
+_SQL_MERGE_DUPLICATE_CATEGORIES = (
+    "UPDATE finance_categories SET type = 'both' "
+    "WHERE id IN (SELECT MIN(id) FROM finance_categories GROUP BY user_id, name "
+    "HAVING COUNT(*) > 1 AND COUNT(DISTINCT type) > 1)",
+    "UPDATE finance_transactions SET category_id = ("
+    "SELECT MIN(k.id) FROM finance_categories d JOIN finance_categories k "
+    "ON k.user_id = d.user_id AND k.name = d.name "
+    "WHERE d.id = finance_transactions.category_id) "
+    "WHERE category_id IN (SELECT d.id FROM finance_categories d "
+    "JOIN finance_categories k ON k.user_id = d.user_id AND k.name = d.name AND k.id < d.id)",
+    "DELETE FROM finance_categories WHERE id IN (SELECT d.id FROM finance_categories d "
+    "JOIN finance_categories k ON k.user_id = d.user_id AND k.name = d.name AND k.id < d.id)",
+)
+
+
+def _merge_duplicate_categories(conn: sqlite3.Connection) -> None:
+    """Migration 1: merge duplicate finance category names
+    
+    Lets FinanceService build its unique (user_id, name) index.
+    
+    Args:
+        conn (sqlite3.Connection): Connection inside the migration transaction
+    """
+    if not conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'finance_categories'").fetchone():
+        return
+    
+    for row in conn.execute(_SQL_DUPLICATE_CATEGORIES).fetchall():
+        ids = sorted(int(i) for i in row['ids'].split(','))
+        logger.warning(
+            f"Merging duplicate finance categories {ids} (user {row['user_id']}, "
+            f"name {row['name']!r}) into category {ids[0]}"
+            + (", which now accepts both types" if row['types'] > 1 else "")
+        )
+    
+    for statement in _SQL_MERGE_DUPLICATE_CATEGORIES:
+        conn.execute(statement)
+
+
+# (version, migration) pairs in the order they are applied
+_MIGRATIONS = (
+    (1, _merge_duplicate_categories),
+)
+
 class DatabaseManager:
     """SQLite database manager for Persian Life Manager"""
     
-    def __init__(self, db_path: str):
+    # Persistent managers handed out by shared(), one per database path
+    _shared = {}
+    _shared_lock = threading.Lock()
+    
+    def __init__(self, db_path: str, persistent: bool = False):
         """Initialize the database manager
         
         Args:
             db_path (str): Path to the SQLite database file
+            persistent (bool, optional): Reuse one connection per thread instead of
+                opening a new connection for every call
         """
         self.db_path = db_path
+        self.persistent = persistent
+        self._local = threading.local()
         self._initialize_db()
     
+    @classmethod
+    def shared(cls, db_path: str) -> 'DatabaseManager':
+        """Get the process-wide persistent manager for a database file
+        
+        Services that are instantiated several times (one per window) use
+        this so they share each thread's connection, and with it the
+        prepared-statement and page caches, instead of opening their own.
+        
+        Args:
+            db_path (str): Path to the SQLite database file
+            
+        Returns:
+            DatabaseManager: Persistent manager for db_path
+        """
+        key = os.path.abspath(db_path)
+        with cls._shared_lock:
+            manager = cls._shared.get(key)
+            if manager is None:
+                manager = cls(db_path, persistent=True)
+                cls._shared[key] = manager
+            return manager
+    
     def _initialize_db(self):
         """Initialize the database file and structure"""
         # Create directory if it doesn't exist
@@ -38,6 +148,45 @@ class DatabaseManager:
             self._create_schema()
         else:
             logger.info("Database already exists, skipping initialization")
+        
+        # Readers and the writer no longer block each other; the setting is
+        # stored in the file, so later connections inherit it
+        conn = self.get_connection()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+        finally:
+            conn.close()
+        
+        self._migrate()
+    
+    def _migrate(self):
+        """Apply the schema migrations this database has not had yet
+        
+        Each migration runs once, in its own transaction together with the
+        user_version bump that records it.
+        """
+        conn = self.get_connection()
+        conn.isolation_level = None
+        try:
+            if conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+                return
+            
+            for version, migration in _MIGRATIONS:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    # Re-read under the write lock; another process may have migrated
+                    if conn.execute("PRAGMA user_version").fetchone()[0] < version:
+                        logger.info(f"Applying database migration {version}")
+                        migration(conn)
+                        conn.execute(f"PRAGMA user_version = {version}")
+                    conn.execute("COMMIT")
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
+        except Exception as e:
+            logger.error(f"Error migrating database: {str(e)}")
+        finally:
+            conn.close()
     
     def _create_schema(self):
         """Create the initial database schema"""
@@ -143,7 +292,7 @@ class DatabaseManager:
                     all_day INTEGER,
                     has_reminder INTEGER,
                     reminder_time TEXT,
-                    created_at TEXT
+                    created_at TEXT DEFAULT CURRENT_TIMESTAMP
                 )
             """)
             
@@ -237,10 +386,86 @@ class DatabaseManager:
         Returns:
             sqlite3.Connection: Database connection
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite3.connect(self.db_path, cached_statements=STATEMENT_CACHE_SIZE)
         conn.row_factory = sqlite3.Row
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+    
+    def get_persistent_connection(self) -> sqlite3.Connection:
+        """Get the long-lived connection for the calling thread
+        
+        The connection runs in autocommit mode; explicit transactions are
+        opened by the caller when several statements must commit together.
+        
+        Returns:
+            sqlite3.Connection: Database connection owned by the current thread
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.db_path, check_same_thread=False, isolation_level=None,
+                cached_statements=STATEMENT_CACHE_SIZE
+            )
+            conn.row_factory = sqlite3.Row
+            for pragma in PERSISTENT_PRAGMAS:
+                conn.execute(pragma)
+            self._local.conn = conn
         return conn
     
+    @contextmanager
+    def transaction(self, mode: str = "DEFERRED"):
+        """Run several statements on the persistent connection as one transaction
+        
+        Nested use joins the outer transaction instead of opening a new one.
+        
+        Args:
+            mode (str, optional): SQLite BEGIN mode (DEFERRED, IMMEDIATE or EXCLUSIVE)
+            
+        Yields:
+            sqlite3.Connection: The calling thread's persistent connection
+        """
+        conn = self.get_persistent_connection()
+        if conn.in_transaction:
+            yield conn
+            return
+        
+        conn.execute(f"BEGIN {mode}")
+        try:
+            yield conn
+        except Exception:
+            conn.rollback()
+            raise
+        conn.commit()
+    
+    def close(self) -> None:
+        """Close the calling thread's persistent connection, if any"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+    
+    def _acquire_connection(self) -> sqlite3.Connection:
+        """Get the connection used by the execute_* helpers"""
+        if self.persistent:
+            return self.get_persistent_connection()
+        return self.get_connection()
+    
+    def _release_connection(self, conn: sqlite3.Connection) -> None:
+        """Close a per-call connection; persistent connections stay open"""
+        if not self.persistent:
+            conn.close()
+    
+    def _commit(self, conn: sqlite3.Connection) -> None:
+        """Commit a per-call connection; persistent ones autocommit"""
+        if not self.persistent:
+            conn.commit()
+    
+    def _rollback(self, conn: sqlite3.Connection) -> None:
+        """Roll back a per-call connection; persistent ones leave it to the transaction owner"""
+        if not self.persistent:
+            conn.rollback()
+    
     def execute_query(self, query: str, params: tuple = ()) -> List[Dict[str, Any]]:
         """Execute a query and return the results
         
@@ -251,23 +476,107 @@ class DatabaseManager:
         Returns:
             list: List of dictionaries with query results
         """
-        conn = self.get_connection()
+        conn = self._acquire_connection()
         try:
+            # Rows are turned into dicts straight from plain tuples; going
+            # through sqlite3.Row first only adds a per-row object and lookups
             cursor = conn.cursor()
+            cursor.row_factory = None
             cursor.execute(query, params)
             
-            if query.strip().upper().startswith(("SELECT", "PRAGMA")):
-                results = [dict(row) for row in cursor.fetchall()]
-                return results
+            # Any statement producing rows (SELECT, PRAGMA, ... RETURNING) is materialized
+            results = []
+            if cursor.description is not None:
+                columns = [column[0] for column in cursor.description]
+                results = [dict(zip(columns, row)) for row in cursor.fetchall()]
             
-            conn.commit()
-            return []
+            self._commit(conn)
+            return results
         except Exception as e:
-            conn.rollback()
+            self._rollback(conn)
             logger.error(f"Error executing query: {str(e)}")
             raise
         finally:
-            conn.close()
+            self._release_connection(conn)
+    
+    def execute_fetchall(self, query: str, params: tuple = ()) -> List[sqlite3.Row]:
+        """Execute a read-only query and return its rows in one call
+        
+        Unlike execute_query, rows are returned as fetched (sqlite3.Row, which
+        supports row['column']) without being copied into dicts, and no commit
+        is issued. Use execute_query for statements that write.
+        
+        Args:
+            query (str): SQL query
+            params (tuple, optional): Query parameters
+            
+        Returns:
+            list: List of sqlite3.Row results
+        """
+        conn = self._acquire_connection()
+        try:
+            return conn.execute(query, params).fetchall()
+        except Exception as e:
+            logger.error(f"Error executing query: {str(e)}")
+            raise
+        finally:
+            self._release_connection(conn)
+    
+    def execute_exists(self, query: str, params: tuple = ()) -> bool:
+        """Execute an existence check and report whether it matched a row
+        
+        Meant for `SELECT 1 FROM ... LIMIT 1` queries: only the first row
+        is stepped and no row object is built.
+        
+        Args:
+            query (str): SQL query
+            params (tuple, optional): Query parameters
+            
+        Returns:
+            bool: True if the query produced at least one row
+        """
+        conn = self._acquire_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            return cursor.execute(query, params).fetchone() is not None
+        except Exception as e:
+            logger.error(f"Error executing query: {str(e)}")
+            raise
+        finally:
+            self._release_connection(conn)
+    
+    def execute_query_iter(self, query: str, params: tuple = (),
+                           arraysize: int = FETCH_BATCH_SIZE) -> Iterator[tuple]:
+        """Execute a read-only query and stream its rows
+        
+        Rows are fetched `arraysize` at a time and yielded as plain tuples,
+        so a large result set is never held in memory all at once. The query
+        runs when iteration starts; errors are raised from the iteration.
+        
+        Args:
+            query (str): SQL query
+            params (tuple, optional): Query parameters
+            arraysize (int, optional): Number of rows fetched per round
+            
+        Yields:
+            tuple: One result row, columns in SELECT order
+        """
+        conn = self._acquire_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(arraysize)
+                if not rows:
+                    break
+                yield from rows
+        except Exception as e:
+            logger.error(f"Error executing query: {str(e)}")
+            raise
+        finally:
+            self._release_connection(conn)
     
     def execute_insert(self, query: str, params: tuple = ()) -> int:
         """Execute an insert query and return the new row ID
@@ -279,18 +588,18 @@ class DatabaseManager:
         Returns:
             int: ID of the new row
         """
-        conn = self.get_connection()
+        conn = self._acquire_connection()
         try:
             cursor = conn.cursor()
             cursor.execute(query, params)
-            conn.commit()
+            self._commit(conn)
             return cursor.lastrowid
         except Exception as e:
-            conn.rollback()
+            self._rollback(conn)
             logger.error(f"Error executing insert: {str(e)}")
             raise
         finally:
-            conn.close()
+            self._release_connection(conn)
     
     def execute_update(self, query: str, params: tuple = ()) -> int:
         """Execute an update query and return the number of affected rows
@@ -302,18 +611,18 @@ class DatabaseManager:
         Returns:
             int: Number of affected rows
         """
-        conn = self.get_connection()
+        conn = self._acquire_connection()
         try:
             cursor = conn.cursor()
             cursor.execute(query, params)
-            conn.commit()
+            self._commit(conn)
             return cursor.rowcount
         except Exception as e:
-            conn.rollback()
+            self._rollback(conn)
             logger.error(f"Error executing update: {str(e)}")
             raise
         finally:
-            conn.close()
+            self._release_connection(conn)
     
     def execute_batch(self, query: str, params_list: List[tuple]) -> int:
         """Execute a batch of queries
@@ -325,18 +634,18 @@ class DatabaseManager:
         Returns:
             int: Number of operations
         """
-        conn = self.get_connection()
+        conn = self._acquire_connection()
         try:
             cursor = conn.cursor()
             cursor.executemany(query, params_list)
-            conn.commit()
+            self._commit(conn)
             return cursor.rowcount
         except Exception as e:
-            conn.rollback()
+            self._rollback(conn)
             logger.error(f"Error executing batch: {str(e)}")
             raise
         finally:
-            conn.close()
+            self._release_connection(conn)
     
     def execute_script(self, script: str) -> None:
         """Execute a SQL script
@@ -344,17 +653,17 @@ class DatabaseManager:
         Args:
             script (str): SQL script with multiple statements
         """
-        conn = self.get_connection()
+        conn = self._acquire_connection()
         try:
             cursor = conn.cursor()
             cursor.executescript(script)
-            conn.commit()
+            self._commit(conn)
         except Exception as e:
-            conn.rollback()
+            self._rollback(conn)
             logger.error(f"Error executing script: {str(e)}")
             raise
         finally:
-            conn.close()
+            self._release_connection(conn)
     
     def backup_database(self, backup_path: str) -> bool:
         """Create a backup of the database
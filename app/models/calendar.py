@@ -10,6 +10,9 @@ from datetime import datetime
 class Event:
     """Calendar event model"""
     
+    __slots__ = ('id', 'user_id', 'title', 'date', 'start_time', 'end_time',
+                 'location', 'description', 'all_day', 'has_reminder')
+    
     def __init__(self, id, user_id, title, date, start_time=None, end_time=None, 
                  location=None, description=None, all_day=False, has_reminder=False):
         """Initialize a calendar event
@@ -37,6 +40,30 @@ class Event:
         self.all_day = all_day
         self.has_reminder = has_reminder
     
+    @classmethod
+    def _from_row(cls, row):
+        """Build an event from a database row without going through __init__
+        
+        Args:
+            row (tuple): Columns in constructor order, with all_day and
+                has_reminder stored as integers
+                
+        Returns:
+            Event: The event object
+        """
+        obj = cls.__new__(cls)
+        obj.id = row[0]
+        obj.user_id = row[1]
+        obj.title = row[2]
+        obj.date = row[3]
+        obj.start_time = row[4]
+        obj.end_time = row[5]
+        obj.location = row[6] or ""
+        obj.description = row[7] or ""
+        obj.all_day = bool(row[8])
+        obj.has_reminder = bool(row[9])
+        return obj
+    
     def __str__(self):
         if self.all_day:
             return f"Event({self.id}, {self.title}, {self.date}, All Day)"
@@ -69,6 +96,9 @@ class Event:
 class Task:
     """Task model"""
     
+    __slots__ = ('id', 'user_id', 'title', 'due_date', 'priority', 'description',
+                 'completed', 'completion_date', 'has_reminder')
+    
     def __init__(self, id, user_id, title, due_date, priority="medium", 
                  description=None, completed=False, completion_date=None, has_reminder=False):
         """Initialize a task
@@ -94,6 +124,29 @@ class Task:
         self.completion_date = completion_date
         self.has_reminder = has_reminder
     
+    @classmethod
+    def _from_row(cls, row):
+        """Build a task from a database row without going through __init__
+        
+        Args:
+            row (tuple): Columns in constructor order, with completed and
+                has_reminder stored as integers
+                
+        Returns:
+            Task: The task object
+        """
+        obj = cls.__new__(cls)
+        obj.id = row[0]
+        obj.user_id = row[1]
+        obj.title = row[2]
+        obj.due_date = row[3]
+        obj.priority = row[4]
+        obj.description = row[5] or ""
+        obj.completed = bool(row[6])
+        obj.completion_date = row[7]
+        obj.has_reminder = bool(row[8])
+        return obj
+    
     def __str__(self):
         status = "Completed" if self.completed else "Pending"
         return f"Task({self.id}, {self.title}, {self.due_date}, {self.priority}, {status})"
@@ -110,6 +163,8 @@ class Task:
 class Reminder:
     """Reminder model"""
     
+    __slots__ = ('id', 'user_id', 'title', 'date', 'time', 'source_type', 'source_id')
+    
     def __init__(self, id, user_id, title, date, time, source_type, source_id):
         """Initialize a reminder
         
@@ -130,6 +185,26 @@ class Reminder:
         self.source_type = source_type
         self.source_id = source_id
     
+    @classmethod
+    def _from_row(cls, row):
+        """Build a reminder from a database row without going through __init__
+        
+        Args:
+            row (tuple): Columns in constructor order; extra trailing columns are ignored
+                
+        Returns:
+            Reminder: The reminder object
+        """
+        obj = cls.__new__(cls)
+        obj.id = row[0]
+        obj.user_id = row[1]
+        obj.title = row[2]
+        obj.date = row[3]
+        obj.time = row[4]
+        obj.source_type = row[5]
+        obj.source_id = row[6]
+        return obj
+    
     def __str__(self):
         return f"Reminder({self.id}, {self.title}, {self.date} {self.time}, {self.source_type})"
     
@@ -8,6 +8,8 @@ Finance-related data models for Persian Life Manager Application
 class Category:
     """Financial category model"""
     
+    __slots__ = ('id', 'user_id', 'name', 'type')
+    
     def __init__(self, id, user_id, name, type):
         """Initialize a financial category
         
@@ -29,6 +31,9 @@ class Category:
 class Transaction:
     """Financial transaction model"""
     
+    __slots__ = ('id', 'user_id', 'title', 'amount', 'date', 'type',
+                 'category_id', 'category_name', 'description')
+    
     def __init__(self, id, user_id, title, amount, date, type, category_id, category_name=None, description=None):
         """Initialize a financial transaction
         
@@ -53,6 +58,28 @@ class Transaction:
         self.category_name = category_name
         self.description = description or ""
     
+    @classmethod
+    def _from_row(cls, row):
+        """Build a transaction from a database row without going through __init__
+        
+        Args:
+            row (tuple): Columns in constructor order
+                
+        Returns:
+            Transaction: The transaction object
+        """
+        obj = cls.__new__(cls)
+        obj.id = row[0]
+        obj.user_id = row[1]
+        obj.title = row[2]
+        obj.amount = row[3]
+        obj.date = row[4]
+        obj.type = row[5]
+        obj.category_id = row[6]
+        obj.category_name = row[7]
+        obj.description = row[8] or ""
+        return obj
+    
     def __str__(self):
         return f"Transaction({self.id}, {self.title}, {self.amount}, {self.date}, {self.type})"
 
@@ -5,6 +5,29 @@
 Health-related data models for Persian Life Manager Application
 """
 
+from enum import IntEnum
+
+
+class GoalType(IntEnum):
+    """Health goal types"""
+    WEIGHT = 1
+    WEEKLY_EXERCISE = 2
+    WEEKLY_CALORIES = 3
+    DAILY_SLEEP = 4
+    DAILY_STEPS = 5
+
+
+# Display names, as shown in the UI and stored in health_goals.goal_type
+GOAL_TYPE_NAMES = {
+    GoalType.WEIGHT: "وزن",
+    GoalType.WEEKLY_EXERCISE: "ورزش هفتگی",
+    GoalType.WEEKLY_CALORIES: "کالری مصرفی هفتگی",
+    GoalType.DAILY_SLEEP: "مدت خواب روزانه",
+    GoalType.DAILY_STEPS: "تعداد قدم روزانه",
+}
+GOAL_TYPE_IDS = {name: goal_type for goal_type, name in GOAL_TYPE_NAMES.items()}
+
+
 class Exercise:
     """Exercise model"""
     
@@ -28,6 +51,26 @@ class Exercise:
         self.calories_burned = calories_burned
         self.notes = notes or ""
     
+    @classmethod
+    def _from_row(cls, row):
+        """Build an exercise from a database row without going through __init__
+        
+        Args:
+            row (tuple): Columns in constructor order
+                
+        Returns:
+            Exercise: The exercise object
+        """
+        obj = cls.__new__(cls)
+        obj.id = row[0]
+        obj.user_id = row[1]
+        obj.date = row[2]
+        obj.exercise_type = row[3]
+        obj.duration = row[4]
+        obj.calories_burned = row[5]
+        obj.notes = row[6] or ""
+        return obj
+    
     def __str__(self):
         return f"Exercise({self.id}, {self.exercise_type}, {self.duration} min, {self.date})"
 
@@ -60,6 +103,28 @@ class HealthMetric:
         self.sleep_hours = sleep_hours
         self.notes = notes or ""
     
+    @classmethod
+    def _from_row(cls, row):
+        """Build health metrics from a database row without going through __init__
+        
+        Args:
+            row (tuple): Columns in constructor order
+                
+        Returns:
+            HealthMetric: The health metric object
+        """
+        obj = cls.__new__(cls)
+        obj.id = row[0]
+        obj.user_id = row[1]
+        obj.date = row[2]
+        obj.weight = row[3]
+        obj.systolic = row[4]
+        obj.diastolic = row[5]
+        obj.heart_rate = row[6]
+        obj.sleep_hours = row[7]
+        obj.notes = row[8] or ""
+        return obj
+    
     def __str__(self):
         return f"HealthMetric({self.id}, {self.date}, weight={self.weight}, BP={self.systolic}/{self.diastolic})"
 
@@ -87,6 +152,31 @@ class HealthGoal:
         self.progress = progress
         self.notes = notes or ""
     
+    @classmethod
+    def _from_row(cls, row):
+        """Build a health goal from a database row without going through __init__
+        
+        Args:
+            row (tuple): Columns in constructor order
+                
+        Returns:
+            HealthGoal: The health goal object
+        """
+        obj = cls.__new__(cls)
+        obj.id = row[0]
+        obj.user_id = row[1]
+        obj.goal_type = row[2]
+        obj.target_value = row[3]
+        obj.deadline = row[4]
+        obj.progress = row[5]
+        obj.notes = row[6] or ""
+        return obj
+    
+    @property
+    def goal_type_id(self):
+        """GoalType of this goal, or None for an unknown goal type"""
+        return GOAL_TYPE_IDS.get(self.goal_type)
+    
     def __str__(self):
         return f"HealthGoal({self.id}, {self.goal_type}, target={self.target_value}, progress={self.progress}%)"
 
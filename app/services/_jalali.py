@@ -0,0 +1,191 @@
+"""
+Pure-integer Jalali (Persian) calendar arithmetic for Persian Life Manager Application
+Port of the Borkowski break-year algorithm (as used by jalaali-js); all functions
+work on plain ints and never allocate date objects.
+"""
+
+# Jalali years at which the 33-year leap cycle pattern shifts
+_BREAKS = (
+    -61, 9, 38, 199, 426, 686, 756, 818, 1111, 1181, 1210,
+    1635, 2060, 2097, 2192, 2262, 2324, 2394, 2456, 3178
+)
+
+
+def _div(a, b):
+    """Integer division truncating toward zero"""
+    q = abs(a) // abs(b)
+    return q if (a >= 0) == (b >= 0) else -q
+
+
+def _mod(a, b):
+    """Remainder matching _div (sign follows the dividend)"""
+    return a - _div(a, b) * b
+
+
+def _jal_cal(jy):
+    """Compute leap status and the start of Jalali year jy
+
+    Args:
+        jy (int): Jalali year
+
+    Returns:
+        tuple: (leap, gy, march) where leap is 0 for a leap year, gy is the
+            Gregorian year in which jy starts and march is the March day of Nowruz
+    """
+    if jy < _BREAKS[0] or jy >= _BREAKS[-1]:
+        raise ValueError(f"Jalali year out of supported range: {jy}")
+
+    gy = jy + 621
+    leap_j = -14
+    jp = _BREAKS[0]
+    jump = 0
+    for jm in _BREAKS[1:]:
+        jump = jm - jp
+        if jy < jm:
+            break
+        leap_j += _div(jump, 33) * 8 + _div(_mod(jump, 33), 4)
+        jp = jm
+
+    n = jy - jp
+    leap_j += _div(n, 33) * 8 + _div(_mod(n, 33) + 3, 4)
+    if _mod(jump, 33) == 4 and jump - n == 4:
+        leap_j += 1
+
+    leap_g = _div(gy, 4) - _div((_div(gy, 100) + 1) * 3, 4) - 150
+    march = 20 + leap_j - leap_g
+
+    if jump - n < 6:
+        n = n - jump + _div(jump + 4, 33) * 33
+    leap = _mod(_mod(n + 1, 33) - 1, 4)
+    if leap == -1:
+        leap = 4
+
+    return leap, gy, march
+
+
+def _g2d(gy, gm, gd):
+    """Gregorian date to Julian Day Number"""
+    d = (_div((gy + _div(gm - 8, 6) + 100100) * 1461, 4)
+         + _div(153 * _mod(gm + 9, 12) + 2, 5)
+         + gd - 34840408)
+    return d - _div(_div(gy + 100100 + _div(gm - 8, 6), 100) * 3, 4) + 752
+
+
+def _d2g(jdn):
+    """Julian Day Number to Gregorian (year, month, day)"""
+    j = 4 * jdn + 139361631
+    j += _div(_div(4 * jdn + 183187720, 146097) * 3, 4) * 4 - 3908
+    i = _div(_mod(j, 1461), 4) * 5 + 308
+    gd = _div(_mod(i, 153), 5) + 1
+    gm = _mod(_div(i, 153), 12) + 1
+    gy = _div(j, 1461) - 100100 + _div(8 - gm, 6)
+    return gy, gm, gd
+
+
+def is_leap(jy):
+    """Check whether a Jalali year is a leap year
+
+    Args:
+        jy (int): Jalali year
+
+    Returns:
+        bool: True if Esfand has 30 days in this year
+    """
+    return _jal_cal(jy)[0] == 0
+
+
+def days_in_month(jy, jm):
+    """Get number of days in a Jalali month
+
+    Args:
+        jy (int): Jalali year
+        jm (int): Jalali month (1-12)
+
+    Returns:
+        int: Number of days in the month
+    """
+    if not 1 <= jm <= 12:
+        raise ValueError(f"Jalali month out of range: {jm}")
+    if jm <= 6:
+        return 31
+    if jm < 12:
+        return 30
+    return 30 if is_leap(jy) else 29
+
+
+def j2d(jy, jm, jd):
+    """Jalali date to Julian Day Number, validating the date"""
+    if not 1 <= jd <= days_in_month(jy, jm):
+        raise ValueError(f"Jalali day out of range: {jy}/{jm}/{jd}")
+    _, gy, march = _jal_cal(jy)
+    return _g2d(gy, 3, march) + (jm - 1) * 31 - _div(jm, 7) * (jm - 7) + jd - 1
+
+
+def d2j(jdn):
+    """Julian Day Number to Jalali (year, month, day)"""
+    gy = _d2g(jdn)[0]
+    jy = gy - 621
+    leap, _, march = _jal_cal(jy)
+    k = jdn - _g2d(gy, 3, march)
+
+    if k >= 0:
+        if k <= 185:
+            return jy, 1 + _div(k, 31), _mod(k, 31) + 1
+        k -= 186
+    else:
+        jy -= 1
+        k += 179
+        if leap == 1:
+            k += 1
+
+    return jy, 7 + _div(k, 30), _mod(k, 30) + 1
+
+
+def g2d(gy, gm, gd):
+    """Gregorian date to Julian Day Number, validating the date"""
+    jdn = _g2d(gy, gm, gd)
+    if _d2g(jdn) != (gy, gm, gd):
+        raise ValueError(f"Invalid Gregorian date: {gy}-{gm}-{gd}")
+    return jdn
+
+
+def d2g(jdn):
+    """Julian Day Number to Gregorian (year, month, day)"""
+    return _d2g(jdn)
+
+
+def g2j(gy, gm, gd):
+    """Convert a Gregorian date to Jalali
+
+    Args:
+        gy (int): Gregorian year
+        gm (int): Gregorian month
+        gd (int): Gregorian day
+
+    Returns:
+        tuple: (year, month, day) in the Jalali calendar
+    """
+    return d2j(g2d(gy, gm, gd))
+
+
+def j2g(jy, jm, jd):
+    """Convert a Jalali date to Gregorian
+
+    Args:
+        jy (int): Jalali year
+        jm (int): Jalali month
+        jd (int): Jalali day
+
+    Returns:
+        tuple: (year, month, day) in the Gregorian calendar
+    """
+    return _d2g(j2d(jy, jm, jd))
+
+
+def weekday(jdn):
+    """Get weekday index for a Julian Day Number
+
+    Returns:
+        int: Weekday with Saturday as 0, matching jdatetime.date.weekday()
+    """
+    return (jdn + 2) % 7
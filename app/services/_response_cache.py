@@ -0,0 +1,130 @@
+"""
+In-process cache of AI model responses for Persian Life Manager Application
+Entries are found by an exact hash of the request, or failing that by a hash
+of its normalized text, so questions re-asked with different case, spacing
+or Arabic/Persian letter variants skip the API. Digits, signs, operators and
+other punctuation are kept, since they change what is being asked.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+# Bump when prompt templates change so old answers are not served
+TEMPLATE_VERSION = 2
+
+# Responses are kept for a week
+DEFAULT_TTL = 7 * 24 * 3600
+
+DEFAULT_MAX_ENTRIES = 512
+
+# Arabic code points that users type for their Persian look-alikes
+_PERSIAN_FOLD = str.maketrans({
+    "\u064a": "\u06cc",  # Arabic yeh -> Persian yeh
+    "\u0643": "\u06a9",  # Arabic kaf -> Persian keheh
+    "\u0629": "\u0647",  # teh marbuta -> heh
+    "\u200c": " ",       # zero-width non-joiner
+})
+
+
+def _digest(*parts):
+    """SHA-256 hex digest of the given strings"""
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(part.encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+def normalize_text(text):
+    """Fold the differences that do not change a request's meaning
+
+    Only letter case, runs of whitespace and Arabic/Persian letter variants
+    are folded; digits, signs, operators and punctuation are kept, so
+    "2+2" and "2*2" or -500000 and 500000 stay different requests.
+
+    Args:
+        text (str): Prompt or serialized request
+
+    Returns:
+        str: Case-folded text with whitespace runs collapsed to single spaces
+    """
+    return " ".join(text.translate(_PERSIAN_FOLD).casefold().split())
+
+
+class ResponseCache:
+    """Thread-safe LRU cache of model responses with a time-to-live"""
+
+    def __init__(self, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES):
+        """Initialize the cache
+
+        Args:
+            ttl (float, optional): Seconds an entry stays valid
+            max_entries (int, optional): Entries kept before the oldest are dropped
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def keys_for(self, model, payload):
+        """Compute the exact and normalized keys of a request
+
+        Args:
+            model (str): Model ID
+            payload: JSON-serializable request payload (prompt, parameters)
+
+        Returns:
+            tuple: (exact_key, normalized_key)
+        """
+        text = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+        exact = _digest("exact", str(TEMPLATE_VERSION), model, text)
+        normalized = _digest("normalized", str(TEMPLATE_VERSION), model, normalize_text(text))
+        return exact, normalized
+
+    def get(self, keys):
+        """Look a response up by its keys, in order
+
+        Args:
+            keys (tuple): Keys from keys_for
+
+        Returns:
+            The cached response, or None if there is no valid entry
+        """
+        now = time.monotonic()
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                expires, value = entry
+                if expires <= now:
+                    del self._entries[key]
+                    continue
+                self._entries.move_to_end(key)
+                return value
+        return None
+
+    def set(self, keys, value):
+        """Store a response under all of its keys
+
+        Args:
+            keys (tuple): Keys from keys_for
+            value: The response; None is never stored
+        """
+        if value is None:
+            return
+        expires = time.monotonic() + self.ttl
+        with self._lock:
+            for key in keys:
+                self._entries[key] = (expires, value)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self._entries.clear()
@@ -4,6 +4,7 @@ Integrates local AI models with OpenAI for comprehensive life management advice
 """
 
 import os
+import asyncio
 import logging
 from app.services.openai_service import OpenAIService
 
@@ -26,17 +27,8 @@ class AIAdvisor:
             dict: Dictionary with advice for all domains
         """
         try:
-            # Gather advice for each domain
-            health_advice = self.get_health_advice(user_data.get('health', {}))
-            finance_advice = self.get_finance_advice(user_data.get('finance', {}))
-            time_advice = self.get_time_management_advice(user_data.get('calendar', {}))
-            
-            # Combine all advice into a comprehensive response
-            return {
-                'health': health_advice,
-                'finance': finance_advice,
-                'time_management': time_advice
-            }
+            # The three domains are requested concurrently
+            return asyncio.run(self.openai_service.get_all_advice(user_data))
         except Exception as e:
             logger.error(f"Error getting comprehensive advice: {str(e)}")
             return {
@@ -1,27 +1,105 @@
 """
 AI Chat Service for Interactive Conversation with Persian Life Manager using Hugging Face API
 """
-import os
 import logging
 import json
+import string
 from datetime import datetime
+import httpx
 import requests
 
+from app.services._response_cache import ResponseCache
+from app.services.huggingface_service import (
+    API_URL, REQUEST_TIMEOUT, _api_key_from_env, _apost, _loads, _session
+)
+
 logger = logging.getLogger(__name__)
 
+# Successful API responses by request, so repeated questions skip the API
+_response_cache = ResponseCache()
+
+# Persian names of the suggest_activity options
+_TIME_FA = {"morning": "صبح", "afternoon": "بعد از ظهر", "evening": "عصر/شب"}
+_ENERGY_FA = {"low": "کم", "medium": "متوسط", "high": "زیاد"}
+
+# Prompt skeletons, built once; only the per-call values are filled in.
+# The system prompt keeps its fixed instructions ahead of the date.
+_SYSTEM_PROMPT = string.Template("""شما دستیار هوشمند Persian Life Manager هستید که به کاربران در مدیریت زندگی، سلامت، امور مالی و برنامه‌ریزی کمک می‌کنید.
+
+دستورالعمل‌های مهم:
+1. همیشه به فارسی پاسخ دهید (مگر اینکه کاربر به زبان دیگری سؤال کند).
+2. پاسخ‌هایتان باید دقیق، مفید و مرتبط با درخواست کاربر باشد.
+3. پاسخ‌های خود را کوتاه و مختصر نگه دارید (حداکثر 3-4 پاراگراف).
+4. همیشه صادق باشید. اگر اطلاعات کافی ندارید، این را اعلام کنید.
+5. محتوای نامناسب، غیراخلاقی یا تبلیغاتی ارائه ندهید.
+6. در مورد مسائل مالی و سلامت احتیاط کنید و تأکید کنید که توصیه‌های شما جایگزین مشاوره تخصصی نیست.
+
+امروز $date است.
+""")
+_CHAT_PROMPT = string.Template("$system\n\n$history\nکاربر: $message\n\nدستیار:")
+_ACTIVITY_INSTRUCTIONS = """لطفاً یک فعالیت مناسب با شرایط من پیشنهاد دهید و دلیل آن را توضیح دهید.
+
+پاسخ را در قالب JSON به شکل زیر ارائه دهید:
+{
+    "activity": "نام فعالیت",
+    "reason": "دلیل پیشنهاد این فعالیت"
+}
+"""
+_ACTIVITY_SITUATION = string.Template("\nمن در زمان «$time» هستم، سطح انرژی من «$energy» است و $minutes دقیقه وقت آزاد دارم.")
+
+
+def _extract_json_object(text):
+    """Find the first complete JSON object in a model answer
+    
+    Scans once from the first "{", counting brace depth outside of string
+    literals, so nested objects and prose after the object are handled in
+    linear time without regex backtracking.
+    
+    Args:
+        text (str): Model answer
+        
+    Returns:
+        str: The object's text, or None if no "{" is ever closed
+    """
+    start = text.find("{")
+    if start < 0:
+        return None
+    
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        c = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif c == "\\":
+                escaped = True
+            elif c == '"':
+                in_string = False
+        elif c == '"':
+            in_string = True
+        elif c == "{":
+            depth += 1
+        elif c == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
+
 class AIChatServiceHF:
     """Interactive AI Chat Service using Hugging Face API"""
     
     def __init__(self):
         """Initialize the AI Chat Service"""
-        # Try multiple environment variable names to be flexible
-        self.api_key = os.environ.get("HUGGINGFACE_API_KEY") or os.environ.get("XAI_API_KEY") or os.environ.get("OPENAI_API_KEY")
-        self.api_url = "https://api-inference.huggingface.co/models/"
+        self.api_key = _api_key_from_env()
+        self.api_url = f"{API_URL}/"
         self.default_model = "meta-llama/Meta-Llama-3-8B-Instruct"  # Good for multilingual support
         self.headers = {"Authorization": f"Bearer {self.api_key}"}
         
         if not self.api_key:
-            logger.warning("Hugging Face API key not found in any environment variable (HUGGINGFACE_API_KEY, XAI_API_KEY, or OPENAI_API_KEY)")
+            logger.warning("Hugging Face API key not found (HUGGINGFACE_API_KEY)")
         else:
             logger.info("Hugging Face client initialized successfully")
     
@@ -46,11 +124,54 @@ class AIChatServiceHF:
         if parameters:
             payload["parameters"] = parameters
         
+        cache_keys = _response_cache.keys_for(url, payload)
+        cached = _response_cache.get(cache_keys)
+        if cached is not None:
+            return cached
+        
         try:
-            response = requests.post(url, headers=self.headers, json=payload)
+            response = _session.post(url, headers=self.headers, json=payload, timeout=REQUEST_TIMEOUT)
             response.raise_for_status()  # Raise exception for HTTP errors
-            return response.json()
-        except requests.exceptions.RequestException as e:
+            result = _loads(response.content)
+            _response_cache.set(cache_keys, result)
+            return result
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.error(f"Error querying Hugging Face model: {str(e)}")
+            return {"error": str(e)}
+    
+    async def aquery_model(self, model, inputs, parameters=None):
+        """Make API call to Hugging Face without blocking the event loop
+        
+        Args:
+            model (str): Model ID
+            inputs (str): Input text
+            parameters (dict, optional): Optional parameters
+            
+        Returns:
+            dict: API response
+        """
+        if not self.api_key:
+            logger.error("Hugging Face API key not set")
+            return {"error": "API key not set"}
+        
+        url = f"{self.api_url}{model}"
+        payload = {"inputs": inputs}
+        
+        if parameters:
+            payload["parameters"] = parameters
+        
+        cache_keys = _response_cache.keys_for(url, payload)
+        cached = _response_cache.get(cache_keys)
+        if cached is not None:
+            return cached
+        
+        try:
+            response = await _apost(url, headers=self.headers, json=payload)
+            response.raise_for_status()
+            result = _loads(response.content)
+            _response_cache.set(cache_keys, result)
+            return result
+        except httpx.HTTPError as e:
             logger.error(f"Error querying Hugging Face model: {str(e)}")
             return {"error": str(e)}
             
@@ -69,20 +190,7 @@ class AIChatServiceHF:
             return "متأسفانه سرویس هوش مصنوعی در دسترس نیست. لطفاً بعداً دوباره تلاش کنید."
         
         try:
-            # Create system prompt
-            system_prompt = self._create_system_prompt(user_data)
-            
-            # Format chat history
-            history_text = ""
-            if chat_history and isinstance(chat_history, list):
-                # Take last 5 messages to avoid token limits
-                for msg in chat_history[-5:]:
-                    if 'role' in msg and 'content' in msg:
-                        role = "کاربر" if msg['role'] == "user" else "دستیار"
-                        history_text += f"{role}: {msg['content']}\n\n"
-            
-            # Create the full prompt
-            prompt = f"{system_prompt}\n\n{history_text}\nکاربر: {user_message}\n\nدستیار:"
+            prompt = self._chat_prompt(user_message, user_data, chat_history)
             
             # Call Hugging Face API
             response = self.query_model(
@@ -91,35 +199,103 @@ class AIChatServiceHF:
                 parameters={"max_new_tokens": 800, "temperature": 0.7}
             )
             
-            if isinstance(response, list) and len(response) > 0:
-                # Different response formats from different models
-                if "generated_text" in response[0]:
-                    result = response[0]["generated_text"]
-                else:
-                    result = str(response[0])
-            elif isinstance(response, dict):
-                if "error" in response:
-                    return f"متأسفانه خطایی رخ داد: {response['error']}"
-                elif "generated_text" in response:
-                    result = response["generated_text"]
-                else:
-                    result = str(response)
-            else:
-                result = str(response)
+            return self._chat_result(response, prompt)
             
-            # Clean up the response if needed
-            if result.startswith(prompt):
-                result = result[len(prompt):]
+        except Exception as e:
+            logger.error(f"Error in chat method: {str(e)}")
+            return f"متأسفانه خطایی رخ داد: {str(e)}"
+    
+    async def achat(self, user_message, user_data=None, chat_history=None):
+        """Chat with the AI without blocking the event loop
+        
+        Args:
+            user_message (str): User's message
+            user_data (dict, optional): User data to provide context
+            chat_history (list, optional): Previous chat messages
             
-            if "دستیار:" in result:
-                result = result.split("دستیار:", 1)[1]
-                
-            return result.strip()
+        Returns:
+            str: AI response in Persian
+        """
+        if not self.api_key:
+            return "متأسفانه سرویس هوش مصنوعی در دسترس نیست. لطفاً بعداً دوباره تلاش کنید."
+        
+        try:
+            prompt = self._chat_prompt(user_message, user_data, chat_history)
+            
+            response = await self.aquery_model(
+                self.default_model,
+                prompt,
+                parameters={"max_new_tokens": 800, "temperature": 0.7}
+            )
+            
+            return self._chat_result(response, prompt)
             
         except Exception as e:
-            logger.error(f"Error in chat method: {str(e)}")
+            logger.error(f"Error in achat method: {str(e)}")
             return f"متأسفانه خطایی رخ داد: {str(e)}"
     
+    def _chat_prompt(self, user_message, user_data, chat_history):
+        """Build the chat prompt
+        
+        Args:
+            user_message (str): User's message
+            user_data (dict): User data to provide context, or None
+            chat_history (list): Previous chat messages, or None
+            
+        Returns:
+            str: The full prompt
+        """
+        # Create system prompt
+        system_prompt = self._create_system_prompt(user_data)
+        
+        # Format chat history
+        history_text = ""
+        if chat_history and isinstance(chat_history, list):
+            # Take last 5 messages to avoid token limits
+            history_text = "".join([
+                f"{'کاربر' if msg['role'] == 'user' else 'دستیار'}: {msg['content']}\n\n"
+                for msg in chat_history[-5:]
+                if 'role' in msg and 'content' in msg
+            ])
+        
+        # Create the full prompt
+        return _CHAT_PROMPT.substitute(system=system_prompt, history=history_text, message=user_message)
+    
+    def _chat_result(self, response, prompt):
+        """Extract the assistant's reply from a chat response
+        
+        Args:
+            response: API response from query_model
+            prompt (str): The prompt that was sent
+            
+        Returns:
+            str: AI response in Persian
+        """
+        if isinstance(response, list) and len(response) > 0:
+            # Different response formats from different models
+            if "generated_text" in response[0]:
+                result = response[0]["generated_text"]
+            else:
+                result = str(response[0])
+        elif isinstance(response, dict):
+            if "error" in response:
+                return f"متأسفانه خطایی رخ داد: {response['error']}"
+            elif "generated_text" in response:
+                result = response["generated_text"]
+            else:
+                result = str(response)
+        else:
+            result = str(response)
+        
+        # Clean up the response if needed
+        if result.startswith(prompt):
+            result = result[len(prompt):]
+        
+        if "دستیار:" in result:
+            result = result.split("دستیار:", 1)[1]
+            
+        return result.strip()
+    
     def suggest_activity(self, time_of_day, energy_level, available_time, user_data=None):
         """Suggest an activity based on time of day, energy level and available time
         
@@ -138,41 +314,8 @@ class AIChatServiceHF:
             }
         
         try:
-            # Convert time of day to Persian
-            if time_of_day == "morning":
-                time_persian = "صبح"
-            elif time_of_day == "afternoon":
-                time_persian = "بعد از ظهر"
-            elif time_of_day == "evening":
-                time_persian = "عصر/شب"
-            else:
-                time_persian = time_of_day
-                
-            # Convert energy level to Persian
-            if energy_level == "low":
-                energy_persian = "کم"
-            elif energy_level == "medium":
-                energy_persian = "متوسط"
-            elif energy_level == "high":
-                energy_persian = "زیاد"
-            else:
-                energy_persian = energy_level
-            
-            prompt = f"""من در زمان «{time_persian}» هستم، سطح انرژی من «{energy_persian}» است و {available_time} دقیقه وقت آزاد دارم.
-لطفاً یک فعالیت مناسب با شرایط من پیشنهاد دهید و دلیل آن را توضیح دهید.
-
-پاسخ را در قالب JSON به شکل زیر ارائه دهید:
-{{
-    "activity": "نام فعالیت",
-    "reason": "دلیل پیشنهاد این فعالیت"
-}}
-"""
+            prompt = self._activity_prompt(time_of_day, energy_level, available_time, user_data)
             
-            # Add user context if available
-            if user_data:
-                user_context = self._format_user_data(user_data)
-                prompt += f"\n\nاطلاعات بیشتر در مورد کاربر:\n{user_context}"
-                
             # Call Hugging Face API
             response = self.query_model(
                 self.default_model,
@@ -180,45 +323,117 @@ class AIChatServiceHF:
                 parameters={"max_new_tokens": 400, "temperature": 0.7}
             )
             
-            # Parse the response
-            if isinstance(response, list) and len(response) > 0:
-                result_text = response[0].get("generated_text", str(response[0]))
-            elif isinstance(response, dict):
-                if "error" in response:
-                    return {"error": response["error"]}
-                result_text = response.get("generated_text", str(response))
-            else:
-                result_text = str(response)
+            return self._activity_result(response)
+                
+        except Exception as e:
+            logger.error(f"Error in suggest_activity method: {str(e)}")
+            return {
+                "error": f"متأسفانه خطایی رخ داد: {str(e)}"
+            }
+    
+    async def asuggest_activity(self, time_of_day, energy_level, available_time, user_data=None):
+        """Suggest an activity without blocking the event loop
+        
+        Args:
+            time_of_day (str): Time of day (morning, afternoon, evening)
+            energy_level (str): Energy level (low, medium, high)
+            available_time (int): Available time in minutes
+            user_data (dict, optional): User data to provide context
             
-            # Extract the JSON from the response
-            try:
-                # Try to extract JSON from response
-                import re
-                json_match = re.search(r'\{.*\}', result_text, re.DOTALL)
-                if json_match:
-                    json_str = json_match.group(0)
-                    result = json.loads(json_str)
-                    return {
-                        "activity": result.get("activity", "پیاده‌روی"),
-                        "reason": result.get("reason", "دلیل نامشخص")
-                    }
-                else:
-                    # Fallback
-                    return {
-                        "activity": "پیاده‌روی",
-                        "reason": "پیاده‌روی یک فعالیت سالم و مناسب برای اکثر زمان‌ها و سطوح انرژی است."
-                    }
-            except json.JSONDecodeError:
-                # If JSON parsing fails, return a default response
+        Returns:
+            dict: Suggested activity with reason
+        """
+        if not self.api_key:
+            return {
+                "error": "سرویس هوش مصنوعی در دسترس نیست. لطفاً بعداً دوباره تلاش کنید."
+            }
+        
+        try:
+            prompt = self._activity_prompt(time_of_day, energy_level, available_time, user_data)
+            
+            response = await self.aquery_model(
+                self.default_model,
+                prompt,
+                parameters={"max_new_tokens": 400, "temperature": 0.7}
+            )
+            
+            return self._activity_result(response)
+                
+        except Exception as e:
+            logger.error(f"Error in asuggest_activity method: {str(e)}")
+            return {
+                "error": f"متأسفانه خطایی رخ داد: {str(e)}"
+            }
+    
+    def _activity_prompt(self, time_of_day, energy_level, available_time, user_data):
+        """Build the activity suggestion prompt
+        
+        Args:
+            time_of_day (str): Time of day (morning, afternoon, evening)
+            energy_level (str): Energy level (low, medium, high)
+            available_time (int): Available time in minutes
+            user_data (dict): User data to provide context, or None
+            
+        Returns:
+            str: The prompt
+        """
+        # Fixed instructions first, then the user context and last the
+        # situation, so the backend can reuse the cached prefix
+        prompt = _ACTIVITY_INSTRUCTIONS
+        
+        # Add user context if available
+        if user_data:
+            user_context = self._format_user_data(user_data)
+            prompt += f"\nاطلاعات بیشتر در مورد کاربر:\n{user_context}\n"
+        
+        prompt += _ACTIVITY_SITUATION.substitute(
+            time=_TIME_FA.get(time_of_day, time_of_day),
+            energy=_ENERGY_FA.get(energy_level, energy_level),
+            minutes=available_time
+        )
+        
+        return prompt
+    
+    def _activity_result(self, response):
+        """Turn an activity suggestion response into the result dict
+        
+        Args:
+            response: API response from query_model
+            
+        Returns:
+            dict: Suggested activity with reason
+        """
+        # Parse the response
+        if isinstance(response, list) and len(response) > 0:
+            result_text = response[0].get("generated_text", str(response[0]))
+        elif isinstance(response, dict):
+            if "error" in response:
+                return {"error": response["error"]}
+            result_text = response.get("generated_text", str(response))
+        else:
+            result_text = str(response)
+        
+        # Extract the JSON from the response
+        try:
+            # Try to extract JSON from response
+            json_str = _extract_json_object(result_text)
+            if json_str:
+                result = _loads(json_str)
+                return {
+                    "activity": result.get("activity", "پیاده‌روی"),
+                    "reason": result.get("reason", "دلیل نامشخص")
+                }
+            else:
+                # Fallback
                 return {
                     "activity": "پیاده‌روی",
                     "reason": "پیاده‌روی یک فعالیت سالم و مناسب برای اکثر زمان‌ها و سطوح انرژی است."
                 }
-                
-        except Exception as e:
-            logger.error(f"Error in suggest_activity method: {str(e)}")
+        except json.JSONDecodeError:
+            # If JSON parsing fails, return a default response
             return {
-                "error": f"متأسفانه خطایی رخ داد: {str(e)}"
+                "activity": "پیاده‌روی",
+                "reason": "پیاده‌روی یک فعالیت سالم و مناسب برای اکثر زمان‌ها و سطوح انرژی است."
             }
     
     def analyze_schedule(self, events, tasks, goals=None):
@@ -299,11 +514,9 @@ class AIChatServiceHF:
             
             # Extract the JSON from the response
             try:
-                import re
-                json_match = re.search(r'\{.*\}', result_text, re.DOTALL)
-                if json_match:
-                    json_str = json_match.group(0)
-                    result = json.loads(json_str)
+                json_str = _extract_json_object(result_text)
+                if json_str:
+                    result = _loads(json_str)
                     return {
                         "analysis": result.get("analysis", "تحلیل کلی برنامه"),
                         "issues": result.get("issues", []),
@@ -399,19 +612,9 @@ class AIChatServiceHF:
         """
         current_date = datetime.now().strftime("%Y-%m-%d")
         
-        system_prompt = f"""شما دستیار هوشمند Persian Life Manager هستید که به کاربران در مدیریت زندگی، سلامت، امور مالی و برنامه‌ریزی کمک می‌کنید.
-
-امروز {current_date} است.
-
-دستورالعمل‌های مهم:
-1. همیشه به فارسی پاسخ دهید (مگر اینکه کاربر به زبان دیگری سؤال کند).
-2. پاسخ‌هایتان باید دقیق، مفید و مرتبط با درخواست کاربر باشد.
-3. پاسخ‌های خود را کوتاه و مختصر نگه دارید (حداکثر 3-4 پاراگراف).
-4. همیشه صادق باشید. اگر اطلاعات کافی ندارید، این را اعلام کنید.
-5. محتوای نامناسب، غیراخلاقی یا تبلیغاتی ارائه ندهید.
-6. در مورد مسائل مالی و سلامت احتیاط کنید و تأکید کنید که توصیه‌های شما جایگزین مشاوره تخصصی نیست.
-
-"""
+        # Fixed instructions first and the date and user data after them, so
+        # the backend can reuse the cached prefix across users and days
+        system_prompt = _SYSTEM_PROMPT.substitute(date=current_date)
         
         # Add user context if available
         if user_data:
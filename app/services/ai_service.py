@@ -29,6 +29,101 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Static advice HTML, built once at import time
+_FINANCIAL_BUDGET_HEADER_HTML = """
+            <h4>توصیه‌های بودجه‌بندی:</h4>
+            <ul>
+            """
+
+_FINANCIAL_HIGH_EXPENSE_HTML = """
+                <li>هزینه‌های شما نسبت به درآمد بالاست. بررسی دقیق طبقه‌بندی هزینه‌ها و شناسایی موارد قابل کاهش توصیه می‌شود.</li>
+                <li>اولویت‌بندی هزینه‌ها به ضروری (مسکن، خوراک، حمل‌ونقل) و غیرضروری</li>
+                <li>هدف: کاهش نسبت هزینه به درآمد به زیر ۷۰٪</li>
+                """
+
+_FINANCIAL_NORMAL_EXPENSE_HTML = """
+                <li>نسبت هزینه به درآمد شما در محدوده مناسبی است. ادامه مدیریت خوب هزینه‌ها را توصیه می‌کنیم.</li>
+                <li>بررسی دوره‌ای هزینه‌ها برای جلوگیری از افزایش تدریجی</li>
+                """
+
+_FINANCIAL_LOW_SAVINGS_HTML = """
+                <li>پس‌انداز شما کمتر از ۱۰٪ درآمد است. توصیه می‌شود حداقل ۱۰-۲۰٪ درآمد را به پس‌انداز اختصاص دهید.</li>
+                <li>استفاده از روش پس‌انداز خودکار: انتقال اتوماتیک بخشی از درآمد به حساب پس‌انداز در ابتدای ماه</li>
+                """
+
+_FINANCIAL_NEGATIVE_BALANCE_HTML = """
+                <li>مانده ماهانه شما منفی یا صفر است. کاهش هزینه‌ها یا افزایش درآمد ضروری است.</li>
+                <li>شناسایی و حذف هزینه‌های غیرضروری</li>
+                <li>بررسی امکان‌های افزایش درآمد</li>
+                """
+
+_FINANCIAL_GOOD_SAVINGS_HTML = """
+                <li>نسبت پس‌انداز شما مناسب است. ادامه این روند به ساخت ثروت و امنیت مالی کمک می‌کند.</li>
+                <li>بررسی گزینه‌های سرمایه‌گذاری برای بخشی از پس‌انداز</li>
+                """
+
+_FINANCIAL_STRATEGIES_HTML = """
+            </ul>
+            
+            <h4>استراتژی‌های پیشنهادی:</h4>
+            <ul>
+                <li>ایجاد صندوق اضطراری معادل ۳-۶ ماه هزینه‌ها</li>
+                <li>تنظیم بودجه ماهانه و پایبندی به آن</li>
+                <li>حذف یا کاهش بدهی‌های پرهزینه (مانند بدهی کارت اعتباری)</li>
+                <li>بررسی و بهینه‌سازی هزینه‌های ثابت (بیمه، اشتراک‌ها، قبوض)</li>
+                <li>استفاده از روش‌های کاهش هزینه در خرید روزانه (خرید اقلام فصلی، تخفیف‌ها)</li>
+            </ul>
+            
+            <p><b>توجه:</b> این توصیه‌ها بر اساس اطلاعات کلی ارائه شده‌اند. برای مشاوره دقیق‌تر، با متخصصان مالی مشورت کنید.</p>
+            </div>
+            """
+
+_FINANCIAL_FALLBACK_HTML = """<div dir="rtl">
+            <h3>توصیه‌های عمومی مالی</h3>
+            <ul>
+                <li>تنظیم بودجه ماهانه و پایبندی به آن</li>
+                <li>ایجاد صندوق اضطراری معادل ۳-۶ ماه هزینه‌ها</li>
+                <li>پس‌انداز حداقل ۱۰-۲۰٪ از درآمد ماهانه</li>
+                <li>اولویت‌بندی و کاهش بدهی‌ها</li>
+                <li>سرمایه‌گذاری هوشمندانه برای آینده</li>
+            </ul>
+            </div>"""
+
+_TIME_MANAGEMENT_ADVICE_HTML = """<div dir="rtl" style="line-height: 1.6;">
+            <h3>توصیه‌های مدیریت زمان</h3>
+            
+            <h4>اصول کلیدی مدیریت زمان:</h4>
+            <ul>
+                <li><b>اولویت‌بندی:</b> از ماتریس فوری-مهم استفاده کنید. وظایف مهم و فوری را اول انجام دهید.</li>
+                <li><b>تکنیک پومودورو:</b> کار در بازه‌های ۲۵ دقیقه‌ای با استراحت‌های ۵ دقیقه‌ای</li>
+                <li><b>قانون ۲ دقیقه:</b> اگر انجام کاری کمتر از ۲ دقیقه طول می‌کشد، همان موقع انجامش دهید</li>
+                <li><b>دسته‌بندی مشابه:</b> وظایف مشابه را در یک بازه زمانی انجام دهید تا از تغییر مداوم تمرکز جلوگیری شود</li>
+                <li><b>برنامه‌ریزی شب قبل:</b> هر شب ۱۰ دقیقه برای برنامه‌ریزی روز بعد اختصاص دهید</li>
+            </ul>
+            
+            <h4>توصیه‌های عملی:</h4>
+            <ul>
+                <li>زمان‌های اوج انرژی خود را شناسایی کرده و وظایف مهم‌تر را در آن زمان‌ها انجام دهید</li>
+                <li>از تقویم برای تعیین زمان‌های مشخص برای وظایف مهم استفاده کنید، نه فقط برای جلسات</li>
+                <li>حداقل ۳۰ دقیقه هر روز را به برنامه‌ریزی و مرور وظایف اختصاص دهید</li>
+                <li>حواس‌پرتی‌ها را شناسایی و مدیریت کنید (اعلان‌های موبایل، شبکه‌های اجتماعی)</li>
+                <li>برای هر وظیفه، زمان تخمینی را ۲۵٪ افزایش دهید تا استرس کمتری داشته باشید</li>
+                <li>برای استراحت‌های کوتاه بین وظایف برنامه‌ریزی کنید</li>
+                <li>مهارت "نه" گفتن را تقویت کنید تا از افزایش بیش از حد تعهدات جلوگیری شود</li>
+            </ul>
+            
+            <h4>ابزارهای پیشنهادی:</h4>
+            <ul>
+                <li>استفاده از تقویم دیجیتال همراه با یادآوری‌ها</li>
+                <li>استفاده از ابزارهای مدیریت وظایف (مانند تودویست، ترلو)</li>
+                <li>یادداشت‌برداری منظم ایده‌ها و وظایف جدید</li>
+                <li>استفاده از تایمرهای پومودورو برای تمرکز بهتر</li>
+            </ul>
+            
+            <p><b>به یاد داشته باشید:</b> هدف مدیریت زمان، افزایش بهره‌وری همراه با کاهش استرس است، نه فقط انجام کارهای بیشتر در زمان کمتر.</p>
+            </div>
+            """
+
 class AIService:
     """Service for AI-powered recommendations and insights"""
     
@@ -721,69 +816,26 @@ class AIService:
             """
             
             # Budget recommendations
-            advice += """
-            <h4>توصیه‌های بودجه‌بندی:</h4>
-            <ul>
-            """
+            advice += _FINANCIAL_BUDGET_HEADER_HTML
             
             if expenses_to_income > 0.7:
-                advice += """
-                <li>هزینه‌های شما نسبت به درآمد بالاست. بررسی دقیق طبقه‌بندی هزینه‌ها و شناسایی موارد قابل کاهش توصیه می‌شود.</li>
-                <li>اولویت‌بندی هزینه‌ها به ضروری (مسکن، خوراک، حمل‌ونقل) و غیرضروری</li>
-                <li>هدف: کاهش نسبت هزینه به درآمد به زیر ۷۰٪</li>
-                """
+                advice += _FINANCIAL_HIGH_EXPENSE_HTML
             else:
-                advice += """
-                <li>نسبت هزینه به درآمد شما در محدوده مناسبی است. ادامه مدیریت خوب هزینه‌ها را توصیه می‌کنیم.</li>
-                <li>بررسی دوره‌ای هزینه‌ها برای جلوگیری از افزایش تدریجی</li>
-                """
+                advice += _FINANCIAL_NORMAL_EXPENSE_HTML
             
             if savings_ratio < 0.1 and monthly_balance > 0:
-                advice += """
-                <li>پس‌انداز شما کمتر از ۱۰٪ درآمد است. توصیه می‌شود حداقل ۱۰-۲۰٪ درآمد را به پس‌انداز اختصاص دهید.</li>
-                <li>استفاده از روش پس‌انداز خودکار: انتقال اتوماتیک بخشی از درآمد به حساب پس‌انداز در ابتدای ماه</li>
-                """
+                advice += _FINANCIAL_LOW_SAVINGS_HTML
             elif monthly_balance <= 0:
-                advice += """
-                <li>مانده ماهانه شما منفی یا صفر است. کاهش هزینه‌ها یا افزایش درآمد ضروری است.</li>
-                <li>شناسایی و حذف هزینه‌های غیرضروری</li>
-                <li>بررسی امکان‌های افزایش درآمد</li>
-                """
+                advice += _FINANCIAL_NEGATIVE_BALANCE_HTML
             else:
-                advice += """
-                <li>نسبت پس‌انداز شما مناسب است. ادامه این روند به ساخت ثروت و امنیت مالی کمک می‌کند.</li>
-                <li>بررسی گزینه‌های سرمایه‌گذاری برای بخشی از پس‌انداز</li>
-                """
-            
-            advice += """
-            </ul>
-            
-            <h4>استراتژی‌های پیشنهادی:</h4>
-            <ul>
-                <li>ایجاد صندوق اضطراری معادل ۳-۶ ماه هزینه‌ها</li>
-                <li>تنظیم بودجه ماهانه و پایبندی به آن</li>
-                <li>حذف یا کاهش بدهی‌های پرهزینه (مانند بدهی کارت اعتباری)</li>
-                <li>بررسی و بهینه‌سازی هزینه‌های ثابت (بیمه، اشتراک‌ها، قبوض)</li>
-                <li>استفاده از روش‌های کاهش هزینه در خرید روزانه (خرید اقلام فصلی، تخفیف‌ها)</li>
-            </ul>
+                advice += _FINANCIAL_GOOD_SAVINGS_HTML
             
-            <p><b>توجه:</b> این توصیه‌ها بر اساس اطلاعات کلی ارائه شده‌اند. برای مشاوره دقیق‌تر، با متخصصان مالی مشورت کنید.</p>
-            </div>
-            """
+            advice += _FINANCIAL_STRATEGIES_HTML
             
             return advice
         except Exception as e:
             logger.error(f"Error generating financial advice: {str(e)}")
-            return """<div dir="rtl">
-            <h3>توصیه‌های عمومی مالی</h3>
-            <ul>
-                <li>تنظیم بودجه ماهانه و پایبندی به آن</li>
-                <li>ایجاد صندوق اضطراری معادل ۳-۶ ماه هزینه‌ها</li>
-                <li>پس‌انداز حداقل ۱۰-۲۰٪ از درآمد ماهانه</li>
-                <li>اولویت‌بندی و کاهش بدهی‌ها</li>
-                <li>سرمایه‌گذاری هوشمندانه برای آینده</li>
-            </ul>
-            </div>"""
+            return _FINANCIAL_FALLBACK_HTML
     
     def get_time_management_advice(self, tasks, schedule, productivity_preferences):
         """Get personalized time management advice
@@ -796,53 +848,4 @@ class AIService:
         Returns:
             str: Personalized time management advice
         """
-        try:
-            # Generate advice
-            advice = """<div dir="rtl" style="line-height: 1.6;">
-            <h3>توصیه‌های مدیریت زمان</h3>
-            
-            <h4>اصول کلیدی مدیریت زمان:</h4>
-            <ul>
-                <li><b>اولویت‌بندی:</b> از ماتریس فوری-مهم استفاده کنید. وظایف مهم و فوری را اول انجام دهید.</li>
-                <li><b>تکنیک پومودورو:</b> کار در بازه‌های ۲۵ دقیقه‌ای با استراحت‌های ۵ دقیقه‌ای</li>
-                <li><b>قانون ۲ دقیقه:</b> اگر انجام کاری کمتر از ۲ دقیقه طول می‌کشد، همان موقع انجامش دهید</li>
-                <li><b>دسته‌بندی مشابه:</b> وظایف مشابه را در یک بازه زمانی انجام دهید تا از تغییر مداوم تمرکز جلوگیری شود</li>
-                <li><b>برنامه‌ریزی شب قبل:</b> هر شب ۱۰ دقیقه برای برنامه‌ریزی روز بعد اختصاص دهید</li>
-            </ul>
-            
-            <h4>توصیه‌های عملی:</h4>
-            <ul>
-                <li>زمان‌های اوج انرژی خود را شناسایی کرده و وظایف مهم‌تر را در آن زمان‌ها انجام دهید</li>
-                <li>از تقویم برای تعیین زمان‌های مشخص برای وظایف مهم استفاده کنید، نه فقط برای جلسات</li>
-                <li>حداقل ۳۰ دقیقه هر روز را به برنامه‌ریزی و مرور وظایف اختصاص دهید</li>
-                <li>حواس‌پرتی‌ها را شناسایی و مدیریت کنید (اعلان‌های موبایل، شبکه‌های اجتماعی)</li>
-                <li>برای هر وظیفه، زمان تخمینی را ۲۵٪ افزایش دهید تا استرس کمتری داشته باشید</li>
-                <li>برای استراحت‌های کوتاه بین وظایف برنامه‌ریزی کنید</li>
-                <li>مهارت "نه" گفتن را تقویت کنید تا از افزایش بیش از حد تعهدات جلوگیری شود</li>
-            </ul>
-            
-            <h4>ابزارهای پیشنهادی:</h4>
-            <ul>
-                <li>استفاده از تقویم دیجیتال همراه با یادآوری‌ها</li>
-                <li>استفاده از ابزارهای مدیریت وظایف (مانند تودویست، ترلو)</li>
-                <li>یادداشت‌برداری منظم ایده‌ها و وظایف جدید</li>
-                <li>استفاده از تایمرهای پومودورو برای تمرکز بهتر</li>
-            </ul>
-            
-            <p><b>به یاد داشته باشید:</b> هدف مدیریت زمان، افزایش بهره‌وری همراه با کاهش استرس است، نه فقط انجام کارهای بیشتر در زمان کمتر.</p>
-            </div>
-            """
-            
-            return advice
-        except Exception as e:
-            logger.error(f"Error generating time management advice: {str(e)}")
-            return """<div dir="rtl">
-            <h3>توصیه‌های عمومی مدیریت زمان</h3>
-            <ul>
-                <li>اولویت‌بندی وظایف با استفاده از ماتریس فوری-مهم</li>
-                <li>استفاده از تکنیک پومودورو (۲۵ دقیقه کار، ۵ دقیقه استراحت)</li>
-                <li>برنامه‌ریزی روزانه و هفتگی</li>
-                <li>مدیریت حواس‌پرتی‌ها</li>
-                <li>تعیین اهداف واضح و قابل اندازه‌گیری</li>
-            </ul>
-            </div>"""
+        return _TIME_MANAGEMENT_ADVICE_HTML
\ No newline at end of file
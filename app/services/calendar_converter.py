@@ -3,11 +3,48 @@ Calendar Converter Service for Persian Life Manager Application
 Provides conversion between Persian (Jalali) and Gregorian calendars
 """
 import logging
-import jdatetime
-from datetime import datetime, timedelta
+import time
+import numpy as np
+from datetime import date
+from functools import lru_cache
+
+from app.services import _jalali
 
 logger = logging.getLogger(__name__)
 
+_PERSIAN_MONTHS = (
+    "فروردین", "اردیبهشت", "خرداد",
+    "تیر", "مرداد", "شهریور",
+    "مهر", "آبان", "آذر",
+    "دی", "بهمن", "اسفند"
+)
+
+_PERSIAN_WEEKDAYS = ("دوشنبه", "سه‌شنبه", "چهارشنبه", "پنجشنبه", "جمعه", "شنبه", "یکشنبه")
+
+# Fixed Persian holidays, stored column-wise so date batches can be matched in one vector op
+_HOL_MONTHS = np.array([1, 1, 1, 1, 1, 1, 3, 3, 11, 12], dtype=np.int16)
+_HOL_DAYS = np.array([1, 2, 3, 4, 12, 13, 14, 15, 22, 29], dtype=np.int16)
+_HOL_DESCRIPTIONS = (
+    "عید نوروز", "عید نوروز", "عید نوروز", "عید نوروز",
+    "روز جمهوری اسلامی", "روز طبیعت",
+    "رحلت امام خمینی", "قیام ۱۵ خرداد",
+    "پیروزی انقلاب اسلامی", "ملی شدن صنعت نفت"
+)
+
+@lru_cache(maxsize=256)
+def _persian_month_range(year, month):
+    """Gregorian (start, end) strings for a Persian month; pure, so memoized"""
+    first_day = _jalali.j2d(year, month, 1)
+    last_day = first_day + _jalali.days_in_month(year, month) - 1
+    return ("%04d-%02d-%02d" % _jalali.d2g(first_day),
+            "%04d-%02d-%02d" % _jalali.d2g(last_day))
+
+@lru_cache(maxsize=2)
+def _persian_today(epoch_sec):
+    """Current Persian date string, cached per wall-clock second"""
+    today = date.fromtimestamp(epoch_sec)
+    return "%04d/%02d/%02d" % _jalali.g2j(today.year, today.month, today.day)
+
 class CalendarConverter:
     """Service for calendar date conversion and management"""
     
@@ -28,16 +65,15 @@ class CalendarConverter:
             if isinstance(date_str, str):
                 # Parse the Gregorian date
                 year, month, day = map(int, date_str.split('-'))
-                gregorian_date = datetime(year, month, day)
             else:
-                gregorian_date = date_str
+                year, month, day = date_str.year, date_str.month, date_str.day
                 
             # Convert to Persian date
-            persian_date = jdatetime.date.fromgregorian(date=gregorian_date)
+            jy, jm, jd = _jalali.g2j(year, month, day)
             
             # Format as string YYYY/MM/DD
-            return persian_date.strftime("%Y/%m/%d")
-        except Exception as e:
+            return f"{jy:04d}/{jm:02d}/{jd:02d}"
+        except (ValueError, TypeError) as e:
             logger.error(f"Error converting to Persian date: {str(e)}")
             return None
     
@@ -54,16 +90,15 @@ class CalendarConverter:
             if isinstance(date_str, str):
                 # Parse the Persian date
                 year, month, day = map(int, date_str.split('/'))
-                persian_date = jdatetime.date(year, month, day)
             else:
-                persian_date = date_str
+                year, month, day = date_str.year, date_str.month, date_str.day
                 
             # Convert to Gregorian date
-            gregorian_date = persian_date.togregorian()
+            gy, gm, gd = _jalali.j2g(year, month, day)
             
             # Format as string YYYY-MM-DD
-            return gregorian_date.strftime("%Y-%m-%d")
-        except Exception as e:
+            return f"{gy:04d}-{gm:02d}-{gd:02d}"
+        except (ValueError, TypeError) as e:
             logger.error(f"Error converting to Gregorian date: {str(e)}")
             return None
     
@@ -77,16 +112,15 @@ class CalendarConverter:
         Returns:
             int: Number of days in the month
         """
+        if month <= 6:
+            return 31
+        if month < 12:
+            return 30
+        
         try:
-            if month == 12:
-                # Check if it's a leap year
-                last_day = 29 if jdatetime.date(year, 12, 29).togregorian() < jdatetime.date(year, 12, 30).togregorian() else 30
-                return last_day
-            elif month <= 6:
-                return 31
-            else:
-                return 30
-        except Exception as e:
+            # Esfand has 30 days only in leap years
+            return 30 if _jalali.is_leap(year) else 29
+        except (ValueError, TypeError) as e:
             logger.error(f"Error getting Persian month days: {str(e)}")
             return 30  # Default to 30 days
     
@@ -104,17 +138,15 @@ class CalendarConverter:
             if '/' in date_str:
                 # Persian format
                 year, month, day = map(int, date_str.split('/'))
-                date_obj = jdatetime.date(year, month, day)
+                jdn = _jalali.j2d(year, month, day)
             else:
                 # Gregorian format
                 year, month, day = map(int, date_str.split('-'))
-                gregorian = datetime(year, month, day)
-                date_obj = jdatetime.date.fromgregorian(date=gregorian)
+                jdn = _jalali.g2d(year, month, day)
             
             # Get weekday name in Persian
-            weekday_names = ["دوشنبه", "سه‌شنبه", "چهارشنبه", "پنجشنبه", "جمعه", "شنبه", "یکشنبه"]
-            return weekday_names[date_obj.weekday()]
-        except Exception as e:
+            return _PERSIAN_WEEKDAYS[_jalali.weekday(jdn)]
+        except (ValueError, TypeError) as e:
             logger.error(f"Error getting Persian weekday: {str(e)}")
             return None
     
@@ -127,17 +159,7 @@ class CalendarConverter:
         Returns:
             str: Persian month name
         """
-        try:
-            month_names = [
-                "فروردین", "اردیبهشت", "خرداد",
-                "تیر", "مرداد", "شهریور",
-                "مهر", "آبان", "آذر", 
-                "دی", "بهمن", "اسفند"
-            ]
-            return month_names[month - 1]
-        except Exception as e:
-            logger.error(f"Error getting Persian month name: {str(e)}")
-            return None
+        return _PERSIAN_MONTHS[month - 1] if 1 <= month <= 12 else None
     
     def get_persian_month_range(self, year, month):
         """Get start and end dates of a Persian month in Gregorian calendar
@@ -150,16 +172,8 @@ class CalendarConverter:
             tuple: (start_date, end_date) as Gregorian dates in YYYY-MM-DD format
         """
         try:
-            # Create Persian dates for first and last day of month
-            first_day = jdatetime.date(year, month, 1)
-            last_day = jdatetime.date(year, month, self.get_persian_month_days(year, month))
-            
-            # Convert to Gregorian
-            start_date = first_day.togregorian().strftime("%Y-%m-%d")
-            end_date = last_day.togregorian().strftime("%Y-%m-%d")
-            
-            return (start_date, end_date)
-        except Exception as e:
+            return _persian_month_range(year, month)
+        except (ValueError, TypeError) as e:
             logger.error(f"Error getting Persian month range: {str(e)}")
             return None
     
@@ -169,12 +183,7 @@ class CalendarConverter:
         Returns:
             str: Current date in Persian calendar format YYYY/MM/DD
         """
-        try:
-            today = jdatetime.date.today()
-            return today.strftime("%Y/%m/%d")
-        except Exception as e:
-            logger.error(f"Error getting current Persian date: {str(e)}")
-            return None
+        return _persian_today(int(time.time()))
     
     def get_persian_holidays(self, year, month=None):
         """Get Persian holidays for a year or month
@@ -191,36 +200,37 @@ class CalendarConverter:
         # 2. Have both fixed (e.g., Nowruz) and lunar-based holidays (e.g., Eid al-Fitr)
         # 3. Calculate the exact dates for each year
 
-        # Some fixed Persian holidays
-        fixed_holidays = [
-            {"month": 1, "day": 1, "description": "عید نوروز"},
-            {"month": 1, "day": 2, "description": "عید نوروز"},
-            {"month": 1, "day": 3, "description": "عید نوروز"},
-            {"month": 1, "day": 4, "description": "عید نوروز"},
-            {"month": 1, "day": 12, "description": "روز جمهوری اسلامی"},
-            {"month": 1, "day": 13, "description": "روز طبیعت"},
-            {"month": 3, "day": 14, "description": "رحلت امام خمینی"},
-            {"month": 3, "day": 15, "description": "قیام ۱۵ خرداد"},
-            {"month": 11, "day": 22, "description": "پیروزی انقلاب اسلامی"},
-            {"month": 12, "day": 29, "description": "ملی شدن صنعت نفت"}
-        ]
-        
         # Filter by month if specified
         if month:
-            holidays = [h for h in fixed_holidays if h["month"] == month]
+            indices = np.flatnonzero(_HOL_MONTHS == month)
         else:
-            holidays = fixed_holidays
+            indices = range(len(_HOL_DESCRIPTIONS))
         
         # Format the dates as YYYY/MM/DD
         result = []
-        for holiday in holidays:
-            date_str = f"{year}/{holiday['month']:02d}/{holiday['day']:02d}"
+        for i in indices:
+            date_str = f"{year}/{int(_HOL_MONTHS[i]):02d}/{int(_HOL_DAYS[i]):02d}"
             result.append({
                 "date": date_str,
-                "description": holiday["description"]
+                "description": _HOL_DESCRIPTIONS[i]
             })
         
         # In a complete implementation, lunar-based holidays would be calculated here
         # based on the specific year
         
-        return result
\ No newline at end of file
+        return result
+    
+    def is_holiday_mask(self, persian_months, persian_days):
+        """Check a batch of Persian dates against the fixed holidays
+        
+        Args:
+            persian_months (array-like): Persian month of each date
+            persian_days (array-like): Persian day of each date
+            
+        Returns:
+            numpy.ndarray: Boolean mask, True where the date is a fixed holiday
+        """
+        months = np.asarray(persian_months, dtype=np.int16)
+        days = np.asarray(persian_days, dtype=np.int16)
+        return ((months[:, None] == _HOL_MONTHS[None, :]) &
+                (days[:, None] == _HOL_DAYS[None, :])).any(axis=1)
@@ -6,14 +6,379 @@ Calendar service for Persian Life Manager Application
 """
 
 import os
+import sys
 import logging
-from datetime import datetime, timedelta
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from functools import lru_cache
 
 from app.core.database import DatabaseManager
 from app.models.calendar import Event, Task, Reminder
 
 logger = logging.getLogger(__name__)
 
+_EVENT_COLS = "id, user_id, title, date, start_time, end_time, location, description, all_day, has_reminder"
+_TASK_COLS = "id, user_id, title, due_date, priority, description, completed, completion_date, has_reminder"
+
+_VALID_PRIORITIES = frozenset(('low', 'medium', 'high'))
+
+# Single sort key instead of two boolean comparisons per row
+_TASK_PRIORITY_ORDER = "CASE priority WHEN 'high' THEN 0 WHEN 'medium' THEN 1 ELSE 2 END"
+
+# (name, statement) for indexes matching the WHERE/ORDER BY shapes used below,
+# so SQLite can walk rows in order instead of sorting them in a temp B-tree.
+# The task index uses the same CASE expression as _TASK_PRIORITY_ORDER so it
+# can serve that sort. Reminder reads do not filter on status, so the
+# reminder time index covers every row rather than only pending ones.
+_CALENDAR_INDEXES = (
+    ("idx_events_user_date",
+     "CREATE INDEX IF NOT EXISTS idx_events_user_date "
+     "ON calendar_events(user_id, date DESC, start_time, id DESC)"),
+    ("idx_tasks_user_due",
+     "CREATE INDEX IF NOT EXISTS idx_tasks_user_due "
+     f"ON tasks(user_id, due_date, ({_TASK_PRIORITY_ORDER}), id)"),
+    ("idx_tasks_user_complete",
+     "CREATE INDEX IF NOT EXISTS idx_tasks_user_complete "
+     "ON tasks(user_id, completed, completion_date DESC, id DESC)"),
+    ("idx_reminders_user_time",
+     "CREATE INDEX IF NOT EXISTS idx_reminders_user_time "
+     "ON reminders(user_id, reminder_time)"),
+    ("idx_reminders_source",
+     "CREATE INDEX IF NOT EXISTS idx_reminders_source "
+     "ON reminders(user_id, source_type, source_id)"),
+    ("idx_user_settings_key",
+     "CREATE UNIQUE INDEX IF NOT EXISTS idx_user_settings_key "
+     "ON user_settings(user_id, setting_key)"),
+)
+
+# Reminder offset units as offered in the UI, mapped to timedelta factories
+_REMINDER_DELTAS = {
+    'دقیقه': lambda value: timedelta(minutes=value),
+    'ساعت': lambda value: timedelta(hours=value),
+    'روز': lambda value: timedelta(days=value),
+}
+_DEFAULT_REMINDER_DELTA = timedelta(minutes=15)
+
+# Rows kept in the event/task caches, and seconds a cached row is trusted
+# (bounds how long writes made outside CalendarService go unseen)
+_MODEL_CACHE_SIZE = 128
+_MODEL_CACHE_TTL = 60.0
+
+# Seconds a service instance trusts its copy of the reminder preferences
+_PREFS_CACHE_TTL = 60.0
+
+
+# Fixed statements, interned once so every call hands sqlite3's statement
+# cache the very same string object
+_SQL_INSERT_EVENT = sys.intern(
+    "INSERT INTO calendar_events (user_id, title, date, start_time, end_time, location, "
+    "description, all_day, has_reminder, created_at) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)"
+)
+_SQL_UPDATE_EVENT = sys.intern(
+    "UPDATE calendar_events SET title = ?, date = ?, start_time = ?, end_time = ?, "
+    "location = ?, description = ?, all_day = ?, has_reminder = ? "
+    "WHERE id = ? AND user_id = ?"
+)
+_SQL_DELETE_EVENT = sys.intern(
+    "DELETE FROM calendar_events WHERE id = ? AND user_id = ? RETURNING has_reminder"
+)
+_SQL_EVENT_SCHEDULE = sys.intern(
+    "SELECT date, start_time, all_day FROM calendar_events WHERE id = ? AND user_id = ?"
+)
+_SQL_INSERT_TASK = sys.intern(
+    "INSERT INTO tasks (user_id, title, due_date, priority, description, completed, "
+    "completion_date, has_reminder, created_at) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)"
+)
+_SQL_UPDATE_TASK = sys.intern(
+    "UPDATE tasks SET title = ?, due_date = ?, priority = ?, description = ?, "
+    "completed = ?, completion_date = ?, has_reminder = ? "
+    "WHERE id = ? AND user_id = ?"
+)
+_SQL_DELETE_TASK = sys.intern(
+    "DELETE FROM tasks WHERE id = ? AND user_id = ? RETURNING has_reminder"
+)
+_SQL_COMPLETE_TASK = sys.intern(
+    "UPDATE tasks SET completed = 1, completion_date = ? "
+    "WHERE id = ? AND user_id = ? RETURNING has_reminder"
+)
+_SQL_RESTORE_TASK = sys.intern(
+    "UPDATE tasks SET completed = 0, completion_date = NULL "
+    "WHERE id = ? AND user_id = ? RETURNING due_date, has_reminder, title"
+)
+_SQL_INSERT_REMINDER = sys.intern(
+    "INSERT INTO reminders (user_id, source_type, source_id, reminder_time, status, created_at) "
+    "VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)"
+)
+# Inserts nothing (and returns no row) unless the task belongs to the user
+_SQL_INSERT_TASK_REMINDER_CHECKED = sys.intern(
+    "INSERT INTO reminders (user_id, source_type, source_id, reminder_time, status, created_at) "
+    "SELECT ?, 'task', ?, ?, ?, CURRENT_TIMESTAMP "
+    "WHERE EXISTS (SELECT 1 FROM tasks WHERE id = ? AND user_id = ?) RETURNING id"
+)
+# Flag a parent row so deleting or completing it also removes its reminders
+_SQL_FLAG_EVENT_REMINDER = sys.intern(
+    "UPDATE calendar_events SET has_reminder = 1 "
+    "WHERE id = ? AND user_id = ? AND IFNULL(has_reminder, 0) = 0"
+)
+_SQL_FLAG_TASK_REMINDER = sys.intern(
+    "UPDATE tasks SET has_reminder = 1 "
+    "WHERE id = ? AND user_id = ? AND IFNULL(has_reminder, 0) = 0"
+)
+_SQL_DELETE_REMINDER = sys.intern("DELETE FROM reminders WHERE id = ? AND user_id = ?")
+_SQL_DELETE_SOURCE_REMINDERS = sys.intern(
+    "DELETE FROM reminders WHERE user_id = ? AND source_type = ? AND source_id = ?"
+)
+_SQL_REMINDER_SETTINGS = sys.intern(
+    "SELECT setting_key, setting_value FROM user_settings "
+    "WHERE user_id = ? AND setting_key IN ('enable_notifications', 'default_reminder_time')"
+)
+# Keeps only the newest row of each (user_id, setting_key); older versions
+# saved with INSERT OR REPLACE and no unique key, which let duplicates pile up
+_SQL_DEDUPE_SETTINGS = (
+    "DELETE FROM user_settings WHERE rowid IN ("
+    "SELECT rowid FROM (SELECT rowid, ROW_NUMBER() OVER ("
+    "PARTITION BY user_id, setting_key ORDER BY created_at DESC, rowid DESC) AS rank "
+    "FROM user_settings) WHERE rank > 1)"
+)
+# Both reminder settings in one upsert; relies on idx_user_settings_key
+_SQL_SAVE_REMINDER_SETTINGS = sys.intern(
+    "INSERT INTO user_settings (user_id, setting_key, setting_value, created_at) "
+    "VALUES (?, ?, ?, ?), (?, ?, ?, ?) "
+    "ON CONFLICT(user_id, setting_key) DO UPDATE SET "
+    "setting_value = excluded.setting_value, created_at = excluded.created_at"
+)
+
+
+@lru_cache(maxsize=None)
+def _select_sql(table, columns, where, order, limited):
+    """Compose a per-user SELECT once per distinct shape
+    
+    Args:
+        table (str): Table name
+        columns (str): Column list
+        where (str): Extra filter ANDed with the user filter, or None
+        order (str): ORDER BY clause body, or None
+        limited (bool): Whether a LIMIT placeholder is appended
+        
+    Returns:
+        str: Interned SQL text
+    """
+    query = f"SELECT {columns} FROM {table} WHERE user_id = ?"
+    if where:
+        query += f" AND {where}"
+    if order:
+        query += f" ORDER BY {order}"
+    if limited:
+        query += " LIMIT ?"
+    return sys.intern(query)
+
+
+# (monotonic timestamp, ISO date) of the last _today_iso() lookup
+_today_cache = (0.0, "")
+
+
+def _today_iso():
+    """Get today's date in YYYY-MM-DD format, recomputed at most once a second
+    
+    A dashboard refresh asks for today's date several times within a few
+    milliseconds; this keeps those calls from each formatting a new datetime.
+    The cache is a single tuple, so concurrent readers never see a torn value.
+    
+    Returns:
+        str: Today's date
+    """
+    global _today_cache
+    now = time.monotonic()
+    cached_at, today = _today_cache
+    if now - cached_at < 1.0:
+        return today
+    today = datetime.now().date().isoformat()
+    _today_cache = (now, today)
+    return today
+
+
+# reminder_time is always written with isoformat(), so the reminders query cuts the
+# date and HH:MM out at fixed offsets; make sure that layout still holds
+assert datetime(2000, 1, 2, 3, 4).isoformat()[:16] == "2000-01-02T03:04"
+
+
+@lru_cache(maxsize=None)
+def _reminder_sql(where, limited):
+    """Compose the per-user reminders query once per distinct shape
+    
+    Event and task reminders are read in two UNION ALL branches, each joining
+    only the table its rows point at, instead of joining both tables for
+    every reminder and picking the title with a CASE. Columns come out in
+    Reminder constructor order, plus the raw reminder_time for sorting.
+    Parameters for the user filter and `where` have to be passed once per branch.
+    
+    Args:
+        where (str): Extra filter on the reminders alias `r`, or None
+        limited (bool): Whether a LIMIT placeholder is appended
+        
+    Returns:
+        str: Interned SQL text
+    """
+    branches = []
+    for source_type, table in (('event', 'calendar_events'), ('task', 'tasks')):
+        branch = (
+            "SELECT r.id, r.user_id, s.title, substr(r.reminder_time, 1, 10), "
+            "substr(r.reminder_time, 12, 5), r.source_type, r.source_id, r.reminder_time "
+            f"FROM reminders r LEFT JOIN {table} s ON s.id = r.source_id "
+            f"WHERE r.user_id = ? AND r.source_type = '{source_type}'"
+        )
+        if where:
+            branch += f" AND {where}"
+        branches.append(branch)
+    
+    query = " UNION ALL ".join(branches) + " ORDER BY reminder_time"
+    if limited:
+        query += " LIMIT ?"
+    return sys.intern(query)
+
+
+def _parse_ymd_hm(d, hm):
+    """Build a datetime from 'YYYY-MM-DD' and 'HH:MM' by slicing
+    
+    Much cheaper than datetime.strptime, which takes a module lock and
+    interprets the format on every call.
+    
+    Args:
+        d (str): Date in YYYY-MM-DD format
+        hm (str): Time in HH:MM format
+        
+    Returns:
+        datetime: The combined date and time
+    """
+    return datetime(int(d[0:4]), int(d[5:7]), int(d[8:10]), int(hm[0:2]), int(hm[3:5]))
+
+
+def _compute_reminder_time(base_datetime, reminder_data):
+    """Apply a reminder offset to the time it is relative to
+    
+    Args:
+        base_datetime (datetime): Event start (or 09:00 on the due date)
+        reminder_data (dict): Dictionary with 'value' and 'unit' keys
+        
+    Returns:
+        datetime: When the reminder should fire; unknown units fall back to 15 minutes before
+    """
+    value = int(reminder_data['value'])
+    delta = _REMINDER_DELTAS.get(reminder_data['unit'])
+    if delta is None:
+        return base_datetime - _DEFAULT_REMINDER_DELTA
+    return base_datetime - delta(value)
+
+
+def _event_meta(event):
+    """Schedule fields of an event as add_reminder_for_event expects them"""
+    return {'date': event.date, 'start_time': event.start_time, 'all_day': event.all_day}
+
+
+def _parse_reminder_preferences(settings):
+    """Turn stored setting strings into reminder preferences
+    
+    Args:
+        settings (dict): setting_key -> setting_value for the reminder settings found
+        
+    Returns:
+        dict: Reminder preferences, with defaults for missing or invalid values
+    """
+    # Default values
+    enable_notifications = True
+    default_reminder_time = 15
+    
+    if 'enable_notifications' in settings:
+        enable_notifications = settings['enable_notifications'].lower() == 'true'
+    
+    if 'default_reminder_time' in settings:
+        try:
+            default_reminder_time = int(settings['default_reminder_time'])
+        except (ValueError, TypeError):
+            default_reminder_time = 15
+    
+    return {
+        'enable_notifications': enable_notifications,
+        'default_reminder_time': default_reminder_time
+    }
+
+
+_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+_TIME_RE = re.compile(r"^(?:[01]\d|2[0-3]):[0-5]\d$")
+
+
+def _validate_event_times(event):
+    """Check start/end times of a timed event
+    
+    Dates and times are fixed-width and zero-padded, so plain string
+    comparison orders them the same way as datetimes.
+    
+    Args:
+        event (Event): Event that is not all-day
+        
+    Raises:
+        ValueError: If a time is missing, malformed or not increasing
+    """
+    if not event.start_time or not event.end_time:
+        raise ValueError("Start time and end time are required for non-all-day events.")
+    
+    if not (_DATE_RE.match(event.date) and _TIME_RE.match(event.start_time)
+            and _TIME_RE.match(event.end_time)):
+        raise ValueError("Invalid date or time format. Expected YYYY-MM-DD and HH:MM.")
+    
+    # The pattern only checks the shape; reject impossible days like 2024-13-45
+    try:
+        date.fromisoformat(event.date)
+    except ValueError:
+        raise ValueError("Invalid date or time format. Expected YYYY-MM-DD and HH:MM.") from None
+    
+    if event.start_time >= event.end_time:
+        raise ValueError("End time must be after start time.")
+
+
+class _LRUCache(OrderedDict):
+    """Small thread-safe least-recently-used cache of rows with a time-to-live"""
+    
+    def __init__(self):
+        super().__init__()
+        self._lock = threading.Lock()
+    
+    def get(self, key, default=None):
+        with self._lock:
+            entry = super().get(key)
+            if entry is None:
+                return default
+            if time.monotonic() - entry[0] >= _MODEL_CACHE_TTL:
+                del self[key]
+                return default
+            self.move_to_end(key)
+            return entry[1]
+    
+    def put(self, key, value):
+        with self._lock:
+            self[key] = (time.monotonic(), value)
+            self.move_to_end(key)
+            if len(self) > _MODEL_CACHE_SIZE:
+                self.popitem(last=False)
+    
+    def pop(self, key, default=None):
+        with self._lock:
+            return super().pop(key, default)
+
+
+# Recently read event/task rows keyed by (database, user ID, row ID). They
+# are shared by every CalendarService, so a write through any instance drops
+# the entry for all of them.
+_event_rows = _LRUCache()
+_task_rows = _LRUCache()
+
+
 class CalendarService:
     """Service for managing calendar data and time planning"""
     
@@ -27,52 +392,144 @@ class CalendarService:
         if not db_path:
             db_path = os.path.join(os.path.expanduser("~"), '.persian_life_manager', 'database.db')
         
-        self.db_manager = DatabaseManager(db_path)
+        # One connection per thread for every CalendarService on this database
+        self.db_manager = DatabaseManager.shared(db_path)
         self.user_id = user_id
+        
+        # Prefix of this user's keys in the shared event/task row caches
+        self._cache_key = (os.path.abspath(db_path), user_id)
+        
+        # Parsed reminder preferences and when they were read (monotonic clock)
+        self._prefs_cache = None
+        self._prefs_cache_ts = 0.0
+        
+        self._ensure_indexes()
     
-    def get_events(self, limit=None):
-        """Get calendar events for the user
+    def _ensure_indexes(self):
+        """Create the calendar indexes if they do not exist yet
+        
+        Each index is created on its own so a missing table only skips that
+        index. Duplicate settings rows left by older versions are removed,
+        keeping the newest, in the same transaction that builds the unique
+        settings index. Statistics are refreshed with ANALYZE whenever an
+        index was added, so the planner knows to use it.
+        """
+        conn = self.db_manager.get_persistent_connection()
+        existing = {row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index'")}
+        
+        created = False
+        for name, statement in _CALENDAR_INDEXES:
+            if name in existing:
+                continue
+            try:
+                with self.db_manager.transaction("IMMEDIATE"):
+                    if name == "idx_user_settings_key":
+                        removed = conn.execute(_SQL_DEDUPE_SETTINGS).rowcount
+                        if removed:
+                            logger.warning(f"Removed {removed} duplicate user settings rows")
+                    conn.execute(statement)
+                created = True
+            except sqlite3.Error as e:
+                logger.warning(f"Could not create calendar index {name}: {str(e)}")
+        
+        if created:
+            conn.execute("ANALYZE")
+    
+    def _tuple_rows(self, query, params):
+        """Run a SELECT returning plain tuples instead of sqlite3.Row objects
+        
+        Positional access skips Row's name lookup for every column, which
+        dominates the cost of turning large result sets into model objects.
         
         Args:
-            limit (int, optional): Maximum number of events to return
+            query (str): SQL query
+            params (tuple): Query parameters
+            
+        Returns:
+            sqlite3.Cursor: Cursor iterating over the result tuples
+        """
+        cursor = self.db_manager.get_persistent_connection().cursor()
+        cursor.row_factory = None
+        return cursor.execute(query, params)
+    
+    def _iter_events(self, where, params, order, limit=None):
+        """Run a calendar_events SELECT for the user and lazily build Event objects
+        
+        The query runs immediately; each Event is only created as the
+        returned iterator is advanced.
+        
+        Args:
+            where (str): Extra filter clause, or None
+            params (tuple): Parameters for the filter clause
+            order (str): ORDER BY clause body, or None
+            limit (int, optional): Maximum number of rows
+            
+        Returns:
+            iterator: Iterator of Event objects
+        """
+        query = _select_sql('calendar_events', _EVENT_COLS, where, order, bool(limit))
+        params = (self.user_id,) + params + ((limit,) if limit else ())
+        return map(Event._from_row, self._tuple_rows(query, params))
+    
+    def _fetch_events(self, where, params, order, limit=None):
+        """Run a calendar_events SELECT for the user and build Event objects
+        
+        Args:
+            where (str): Extra filter clause, or None
+            params (tuple): Parameters for the filter clause
+            order (str): ORDER BY clause body, or None
+            limit (int, optional): Maximum number of rows
             
         Returns:
             list: List of Event objects
         """
-        try:
-            query = """
-                SELECT id, user_id, title, date, start_time, end_time, location, description, all_day, has_reminder
-                FROM calendar_events
-                WHERE user_id = ?
-                ORDER BY date DESC, start_time, id DESC
-            """
-            
-            if limit:
-                query += " LIMIT ?"
-                results = self.db_manager.execute_query(query, (self.user_id, limit))
-            else:
-                results = self.db_manager.execute_query(query, (self.user_id,))
-            
-            events = []
-            for row in results:
-                event = Event(
-                    id=row['id'],
-                    user_id=row['user_id'],
-                    title=row['title'],
-                    date=row['date'],
-                    start_time=row['start_time'],
-                    end_time=row['end_time'],
-                    location=row['location'],
-                    description=row['description'],
-                    all_day=bool(row['all_day']),
-                    has_reminder=bool(row['has_reminder'])
-                )
-                events.append(event)
+        return list(self._iter_events(where, params, order, limit))
+    
+    def _fetch_tasks(self, where, params, order, limit=None):
+        """Run a tasks SELECT for the user and build Task objects
+        
+        Args:
+            where (str): Extra filter clause, or None
+            params (tuple): Parameters for the filter clause
+            order (str): ORDER BY clause body, or None
+            limit (int, optional): Maximum number of rows
+            
+        Returns:
+            list: List of Task objects
+        """
+        query = _select_sql('tasks', _TASK_COLS, where, order, bool(limit))
+        params = (self.user_id,) + params + ((limit,) if limit else ())
+        return list(map(Task._from_row, self._tuple_rows(query, params)))
+    
+    def iter_events(self, limit=None):
+        """Iterate over calendar events for the user without building a list
+        
+        Events come in the same order as get_events(); use this when the
+        caller may stop early or only needs one event at a time.
+        
+        Args:
+            limit (int, optional): Maximum number of events to return
             
-            return events
+        Returns:
+            iterator: Iterator of Event objects
+        """
+        try:
+            return self._iter_events(None, (), "date DESC, start_time, id DESC", limit)
         except Exception as e:
             logger.error(f"Error getting events: {str(e)}")
-            return []
+            return iter(())
+    
+    def get_events(self, limit=None):
+        """Get calendar events for the user
+        
+        Args:
+            limit (int, optional): Maximum number of events to return
+            
+        Returns:
+            list: List of Event objects
+        """
+        return list(self.iter_events(limit))
     
     def get_event(self, event_id):
         """Get a specific event by ID
@@ -84,33 +541,17 @@ class CalendarService:
             Event: The event object, or None if not found
         """
         try:
-            query = """
-                SELECT id, user_id, title, date, start_time, end_time, location, description, all_day, has_reminder
-                FROM calendar_events
-                WHERE id = ? AND user_id = ?
-            """
-            
-            results = self.db_manager.execute_query(query, (event_id, self.user_id))
-            
-            if not results:
-                return None
-            
-            row = results[0]
-            
-            event = Event(
-                id=row['id'],
-                user_id=row['user_id'],
-                title=row['title'],
-                date=row['date'],
-                start_time=row['start_time'],
-                end_time=row['end_time'],
-                location=row['location'],
-                description=row['description'],
-                all_day=bool(row['all_day']),
-                has_reminder=bool(row['has_reminder'])
-            )
-            
-            return event
+            key = self._cache_key + (event_id,)
+            row = _event_rows.get(key)
+            if row is None:
+                query = _select_sql('calendar_events', _EVENT_COLS, "id = ?", None, False)
+                row = self._tuple_rows(query, (self.user_id, event_id)).fetchone()
+                if row is None:
+                    return None
+                _event_rows.put(key, row)
+            
+            # A fresh object every call, so callers can edit it freely
+            return Event._from_row(row)
         except Exception as e:
             logger.error(f"Error getting event: {str(e)}")
             return None
@@ -125,32 +566,7 @@ class CalendarService:
             list: List of Event objects for the specified date
         """
         try:
-            query = """
-                SELECT id, user_id, title, date, start_time, end_time, location, description, all_day, has_reminder
-                FROM calendar_events
-                WHERE user_id = ? AND date = ?
-                ORDER BY all_day DESC, start_time, id
-            """
-            
-            results = self.db_manager.execute_query(query, (self.user_id, date_str))
-            
-            events = []
-            for row in results:
-                event = Event(
-                    id=row['id'],
-                    user_id=row['user_id'],
-                    title=row['title'],
-                    date=row['date'],
-                    start_time=row['start_time'],
-                    end_time=row['end_time'],
-                    location=row['location'],
-                    description=row['description'],
-                    all_day=bool(row['all_day']),
-                    has_reminder=bool(row['has_reminder'])
-                )
-                events.append(event)
-            
-            return events
+            return self._fetch_events("date = ?", (date_str,), "all_day DESC, start_time, id")
         except Exception as e:
             logger.error(f"Error getting events for date: {str(e)}")
             return []
@@ -165,39 +581,26 @@ class CalendarService:
             list: List of Event objects for upcoming events
         """
         try:
-            today = datetime.now().date().isoformat()
-            
-            query = """
-                SELECT id, user_id, title, date, start_time, end_time, location, description, all_day, has_reminder
-                FROM calendar_events
-                WHERE user_id = ? AND date >= ?
-                ORDER BY date, start_time, id
-                LIMIT ?
-            """
-            
-            results = self.db_manager.execute_query(query, (self.user_id, today, limit))
-            
-            events = []
-            for row in results:
-                event = Event(
-                    id=row['id'],
-                    user_id=row['user_id'],
-                    title=row['title'],
-                    date=row['date'],
-                    start_time=row['start_time'],
-                    end_time=row['end_time'],
-                    location=row['location'],
-                    description=row['description'],
-                    all_day=bool(row['all_day']),
-                    has_reminder=bool(row['has_reminder'])
-                )
-                events.append(event)
-            
-            return events
+            today = _today_iso()
+            return self._fetch_events("date >= ?", (today,), "date, start_time, id", limit)
         except Exception as e:
             logger.error(f"Error getting upcoming events: {str(e)}")
             return []
     
+    def get_dashboard_bundle(self):
+        """Get everything the dashboard shows in one read transaction
+        
+        Returns:
+            dict: Dictionary with 'events' (upcoming), 'tasks' (due today)
+                and 'pending_tasks'
+        """
+        with self.db_manager.transaction():
+            return {
+                'events': self.get_upcoming_events(limit=5),
+                'tasks': self.get_today_tasks(),
+                'pending_tasks': self.get_pending_tasks(limit=5)
+            }
+    
     def add_event(self, event, reminder_data=None):
         """Add a new event
         
@@ -213,37 +616,23 @@ class CalendarService:
         try:
             # Validate time if not all-day event
             if not event.all_day:
-                if not event.start_time or not event.end_time:
-                    raise ValueError("Start time and end time are required for non-all-day events.")
-                
-                # Convert times to datetime for comparison
-                start_datetime = datetime.strptime(f"{event.date} {event.start_time}", "%Y-%m-%d %H:%M")
-                end_datetime = datetime.strptime(f"{event.date} {event.end_time}", "%Y-%m-%d %H:%M")
-                
-                if start_datetime >= end_datetime:
-                    raise ValueError("End time must be after start time.")
-            
-            # Add the event
-            query = """
-                INSERT INTO calendar_events (
-                    user_id, title, date, start_time, end_time, location, description, 
-                    all_day, has_reminder, created_at
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """
-            
-            now = datetime.now().isoformat()
-            event_id = self.db_manager.execute_insert(
-                query, (
-                    self.user_id, event.title, event.date, event.start_time, event.end_time,
-                    event.location, event.description, int(event.all_day), 
-                    int(event.has_reminder), now
+                _validate_event_times(event)
+            
+            # Add the event; the event and its reminder commit together
+            with self.db_manager.transaction("IMMEDIATE"):
+                event_id = self.db_manager.execute_insert(
+                    _SQL_INSERT_EVENT, (
+                        self.user_id, event.title, event.date, event.start_time, event.end_time,
+                        event.location, event.description, int(event.all_day), 
+                        int(event.has_reminder)
+                    )
                 )
-            )
-            
-            # Add reminder if needed
-            if event.has_reminder and reminder_data:
-                self.add_reminder_for_event(event_id, event.date, event.title, reminder_data)
+                
+                # Add reminder if needed
+                if event.has_reminder and reminder_data:
+                    self.add_reminder_for_event(
+                        event_id, event.date, event.title, reminder_data, _event_meta(event)
+                    )
             
             event.id = event_id
             return event_id
@@ -262,52 +651,32 @@ class CalendarService:
             bool: True if update was successful
         """
         try:
-            # Check if event exists
-            query = "SELECT id FROM calendar_events WHERE id = ? AND user_id = ?"
-            results = self.db_manager.execute_query(query, (event.id, self.user_id))
-            
-            if not results:
-                raise ValueError(f"Event with ID {event.id} not found.")
+            _event_rows.pop(self._cache_key + (event.id,), None)
             
             # Validate time if not all-day event
             if not event.all_day:
-                if not event.start_time or not event.end_time:
-                    raise ValueError("Start time and end time are required for non-all-day events.")
-                
-                # Convert times to datetime for comparison
-                start_datetime = datetime.strptime(f"{event.date} {event.start_time}", "%Y-%m-%d %H:%M")
-                end_datetime = datetime.strptime(f"{event.date} {event.end_time}", "%Y-%m-%d %H:%M")
-                
-                if start_datetime >= end_datetime:
-                    raise ValueError("End time must be after start time.")
-            
-            # Update the event
-            query = """
-                UPDATE calendar_events
-                SET title = ?, date = ?, start_time = ?, end_time = ?, location = ?, 
-                    description = ?, all_day = ?, has_reminder = ?
-                WHERE id = ? AND user_id = ?
-            """
-            
-            result = self.db_manager.execute_update(
-                query, (
-                    event.title, event.date, event.start_time, event.end_time,
-                    event.location, event.description, int(event.all_day),
-                    int(event.has_reminder), event.id, self.user_id
+                _validate_event_times(event)
+            
+            # Update the event; the update and the reminder replacement commit together
+            with self.db_manager.transaction("IMMEDIATE"):
+                result = self.db_manager.execute_update(
+                    _SQL_UPDATE_EVENT, (
+                        event.title, event.date, event.start_time, event.end_time,
+                        event.location, event.description, int(event.all_day),
+                        int(event.has_reminder), event.id, self.user_id
+                    )
                 )
-            )
-            
-            # Update reminder if needed
-            if event.has_reminder:
-                # First delete existing reminders
-                self.delete_reminder_for_source('event', event.id)
                 
-                # Then add new reminder
-                if reminder_data:
-                    self.add_reminder_for_event(event.id, event.date, event.title, reminder_data)
-            else:
-                # Delete any existing reminders
+                # The user filter in the UPDATE doubles as the ownership check
+                if result == 0:
+                    raise ValueError(f"Event with ID {event.id} not found.")
+                
+                # Replace any existing reminder
                 self.delete_reminder_for_source('event', event.id)
+                if event.has_reminder and reminder_data:
+                    self.add_reminder_for_event(
+                        event.id, event.date, event.title, reminder_data, _event_meta(event)
+                    )
             
             return result > 0
         except Exception as e:
@@ -324,21 +693,19 @@ class CalendarService:
             bool: True if deletion was successful
         """
         try:
-            # Check if event exists
-            query = "SELECT id FROM calendar_events WHERE id = ? AND user_id = ?"
-            results = self.db_manager.execute_query(query, (event_id, self.user_id))
+            _event_rows.pop(self._cache_key + (event_id,), None)
+            
+            # Delete the event
+            results = self.db_manager.execute_query(_SQL_DELETE_EVENT, (event_id, self.user_id))
             
             if not results:
                 raise ValueError(f"Event with ID {event_id} not found.")
             
-            # Delete associated reminders
-            self.delete_reminder_for_source('event', event_id)
-            
-            # Delete the event
-            query = "DELETE FROM calendar_events WHERE id = ? AND user_id = ?"
-            result = self.db_manager.execute_update(query, (event_id, self.user_id))
+            # Delete associated reminders; only rows flagged has_reminder can have any
+            if results[0]['has_reminder']:
+                self.delete_reminder_for_source('event', event_id)
             
-            return result > 0
+            return True
         except Exception as e:
             logger.error(f"Error deleting event: {str(e)}")
             raise
@@ -354,49 +721,18 @@ class CalendarService:
             list: List of Task objects
         """
         try:
-            query_parts = [
-                """
-                SELECT id, user_id, title, due_date, priority, description, completed, 
-                       completion_date, has_reminder
-                FROM tasks
-                WHERE user_id = ?
-                """
-            ]
-            params = [self.user_id]
-            
-            if completed is not None:
-                query_parts.append("AND completed = ?")
-                params.append(int(completed))
+            if completed is None:
+                where, params = None, ()
+            else:
+                where, params = "completed = ?", (int(completed),)
             
             # Add ordering based on completion status
             if completed:
-                query_parts.append("ORDER BY completion_date DESC, id DESC")
+                order = "completion_date DESC, id DESC"
             else:
-                query_parts.append("ORDER BY due_date, priority = 'high' DESC, priority = 'medium' DESC, id")
-            
-            if limit:
-                query_parts.append("LIMIT ?")
-                params.append(limit)
-            
-            query = " ".join(query_parts)
-            results = self.db_manager.execute_query(query, tuple(params))
-            
-            tasks = []
-            for row in results:
-                task = Task(
-                    id=row['id'],
-                    user_id=row['user_id'],
-                    title=row['title'],
-                    due_date=row['due_date'],
-                    priority=row['priority'],
-                    description=row['description'],
-                    completed=bool(row['completed']),
-                    completion_date=row['completion_date'],
-                    has_reminder=bool(row['has_reminder'])
-                )
-                tasks.append(task)
+                order = f"due_date, {_TASK_PRIORITY_ORDER}, id"
             
-            return tasks
+            return self._fetch_tasks(where, params, order, limit)
         except Exception as e:
             logger.error(f"Error getting tasks: {str(e)}")
             return []
@@ -411,33 +747,17 @@ class CalendarService:
             Task: The task object, or None if not found
         """
         try:
-            query = """
-                SELECT id, user_id, title, due_date, priority, description, completed, 
-                       completion_date, has_reminder
-                FROM tasks
-                WHERE id = ? AND user_id = ?
-            """
-            
-            results = self.db_manager.execute_query(query, (task_id, self.user_id))
-            
-            if not results:
-                return None
-            
-            row = results[0]
-            
-            task = Task(
-                id=row['id'],
-                user_id=row['user_id'],
-                title=row['title'],
-                due_date=row['due_date'],
-                priority=row['priority'],
-                description=row['description'],
-                completed=bool(row['completed']),
-                completion_date=row['completion_date'],
-                has_reminder=bool(row['has_reminder'])
-            )
-            
-            return task
+            key = self._cache_key + (task_id,)
+            row = _task_rows.get(key)
+            if row is None:
+                query = _select_sql('tasks', _TASK_COLS, "id = ?", None, False)
+                row = self._tuple_rows(query, (self.user_id, task_id)).fetchone()
+                if row is None:
+                    return None
+                _task_rows.put(key, row)
+            
+            # A fresh object every call, so callers can edit it freely
+            return Task._from_row(row)
         except Exception as e:
             logger.error(f"Error getting task: {str(e)}")
             return None
@@ -471,34 +791,8 @@ class CalendarService:
             list: List of Task objects due today
         """
         try:
-            today = datetime.now().date().isoformat()
-            
-            query = """
-                SELECT id, user_id, title, due_date, priority, description, completed, 
-                       completion_date, has_reminder
-                FROM tasks
-                WHERE user_id = ? AND due_date = ?
-                ORDER BY priority = 'high' DESC, priority = 'medium' DESC, id
-            """
-            
-            results = self.db_manager.execute_query(query, (self.user_id, today))
-            
-            tasks = []
-            for row in results:
-                task = Task(
-                    id=row['id'],
-                    user_id=row['user_id'],
-                    title=row['title'],
-                    due_date=row['due_date'],
-                    priority=row['priority'],
-                    description=row['description'],
-                    completed=bool(row['completed']),
-                    completion_date=row['completion_date'],
-                    has_reminder=bool(row['has_reminder'])
-                )
-                tasks.append(task)
-            
-            return tasks
+            today = _today_iso()
+            return self._fetch_tasks("due_date = ?", (today,), f"{_TASK_PRIORITY_ORDER}, id")
         except Exception as e:
             logger.error(f"Error getting today's tasks: {str(e)}")
             return []
@@ -517,29 +811,23 @@ class CalendarService:
         """
         try:
             # Validate priority
-            if task.priority not in ['low', 'medium', 'high']:
+            if task.priority not in _VALID_PRIORITIES:
                 raise ValueError("Invalid priority. Must be 'low', 'medium', or 'high'.")
             
-            # Add the task
-            query = """
-                INSERT INTO tasks (
-                    user_id, title, due_date, priority, description, completed, 
-                    completion_date, has_reminder, created_at
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """
-            
-            now = datetime.now().isoformat()
-            task_id = self.db_manager.execute_insert(
-                query, (
-                    self.user_id, task.title, task.due_date, task.priority, task.description,
-                    int(task.completed), task.completion_date, int(task.has_reminder), now
+            # Add the task; the task and its reminder commit together
+            with self.db_manager.transaction("IMMEDIATE"):
+                task_id = self.db_manager.execute_insert(
+                    _SQL_INSERT_TASK, (
+                        self.user_id, task.title, task.due_date, task.priority, task.description,
+                        int(task.completed), task.completion_date, int(task.has_reminder)
+                    )
                 )
-            )
-            
-            # Add reminder if needed
-            if task.has_reminder and reminder_data:
-                self.add_reminder_for_task(task_id, task.due_date, task.title, reminder_data)
+                
+                # Add reminder if needed
+                if task.has_reminder and reminder_data:
+                    self.add_reminder_for_task(
+                        task_id, task.due_date, task.title, reminder_data, check_exists=False
+                    )
             
             task.id = task_id
             return task_id
@@ -558,44 +846,32 @@ class CalendarService:
             bool: True if update was successful
         """
         try:
-            # Check if task exists
-            query = "SELECT id FROM tasks WHERE id = ? AND user_id = ?"
-            results = self.db_manager.execute_query(query, (task.id, self.user_id))
-            
-            if not results:
-                raise ValueError(f"Task with ID {task.id} not found.")
+            _task_rows.pop(self._cache_key + (task.id,), None)
             
             # Validate priority
-            if task.priority not in ['low', 'medium', 'high']:
+            if task.priority not in _VALID_PRIORITIES:
                 raise ValueError("Invalid priority. Must be 'low', 'medium', or 'high'.")
             
-            # Update the task
-            query = """
-                UPDATE tasks
-                SET title = ?, due_date = ?, priority = ?, description = ?, 
-                    completed = ?, completion_date = ?, has_reminder = ?
-                WHERE id = ? AND user_id = ?
-            """
-            
-            result = self.db_manager.execute_update(
-                query, (
-                    task.title, task.due_date, task.priority, task.description,
-                    int(task.completed), task.completion_date, int(task.has_reminder),
-                    task.id, self.user_id
+            # Update the task; the update and the reminder replacement commit together
+            with self.db_manager.transaction("IMMEDIATE"):
+                result = self.db_manager.execute_update(
+                    _SQL_UPDATE_TASK, (
+                        task.title, task.due_date, task.priority, task.description,
+                        int(task.completed), task.completion_date, int(task.has_reminder),
+                        task.id, self.user_id
+                    )
                 )
-            )
-            
-            # Update reminder if needed
-            if task.has_reminder:
-                # First delete existing reminders
-                self.delete_reminder_for_source('task', task.id)
                 
-                # Then add new reminder
-                if reminder_data:
-                    self.add_reminder_for_task(task.id, task.due_date, task.title, reminder_data)
-            else:
-                # Delete any existing reminders
+                # The user filter in the UPDATE doubles as the ownership check
+                if result == 0:
+                    raise ValueError(f"Task with ID {task.id} not found.")
+                
+                # Replace any existing reminder
                 self.delete_reminder_for_source('task', task.id)
+                if task.has_reminder and reminder_data:
+                    self.add_reminder_for_task(
+                        task.id, task.due_date, task.title, reminder_data, check_exists=False
+                    )
             
             return result > 0
         except Exception as e:
@@ -612,21 +888,19 @@ class CalendarService:
             bool: True if deletion was successful
         """
         try:
-            # Check if task exists
-            query = "SELECT id FROM tasks WHERE id = ? AND user_id = ?"
-            results = self.db_manager.execute_query(query, (task_id, self.user_id))
+            _task_rows.pop(self._cache_key + (task_id,), None)
+            
+            # Delete the task
+            results = self.db_manager.execute_query(_SQL_DELETE_TASK, (task_id, self.user_id))
             
             if not results:
                 raise ValueError(f"Task with ID {task_id} not found.")
             
-            # Delete associated reminders
-            self.delete_reminder_for_source('task', task_id)
+            # Delete associated reminders; only rows flagged has_reminder can have any
+            if results[0]['has_reminder']:
+                self.delete_reminder_for_source('task', task_id)
             
-            # Delete the task
-            query = "DELETE FROM tasks WHERE id = ? AND user_id = ?"
-            result = self.db_manager.execute_update(query, (task_id, self.user_id))
-            
-            return result > 0
+            return True
         except Exception as e:
             logger.error(f"Error deleting task: {str(e)}")
             raise
@@ -641,27 +915,20 @@ class CalendarService:
             bool: True if update was successful
         """
         try:
-            # Check if task exists
-            query = "SELECT id FROM tasks WHERE id = ? AND user_id = ?"
-            results = self.db_manager.execute_query(query, (task_id, self.user_id))
-            
-            if not results:
-                raise ValueError(f"Task with ID {task_id} not found.")
+            _task_rows.pop(self._cache_key + (task_id,), None)
             
             # Mark the task as completed
-            now = datetime.now().date().isoformat()
-            query = """
-                UPDATE tasks
-                SET completed = 1, completion_date = ?
-                WHERE id = ? AND user_id = ?
-            """
+            now = _today_iso()
+            results = self.db_manager.execute_query(_SQL_COMPLETE_TASK, (now, task_id, self.user_id))
             
-            result = self.db_manager.execute_update(query, (now, task_id, self.user_id))
+            if not results:
+                raise ValueError(f"Task with ID {task_id} not found.")
             
             # Delete associated reminders (no need for reminders for completed tasks)
-            self.delete_reminder_for_source('task', task_id)
+            if results[0]['has_reminder']:
+                self.delete_reminder_for_source('task', task_id)
             
-            return result > 0
+            return True
         except Exception as e:
             logger.error(f"Error completing task: {str(e)}")
             raise
@@ -676,39 +943,43 @@ class CalendarService:
             bool: True if update was successful
         """
         try:
-            # Check if task exists
-            query = "SELECT id, due_date, has_reminder FROM tasks WHERE id = ? AND user_id = ?"
-            results = self.db_manager.execute_query(query, (task_id, self.user_id))
+            _task_rows.pop(self._cache_key + (task_id,), None)
+            
+            # Restore the task, reading back what the reminder needs in the same statement
+            results = self.db_manager.execute_query(_SQL_RESTORE_TASK, (task_id, self.user_id))
             
             if not results:
                 raise ValueError(f"Task with ID {task_id} not found.")
             
-            # Restore the task
-            query = """
-                UPDATE tasks
-                SET completed = 0, completion_date = NULL
-                WHERE id = ? AND user_id = ?
-            """
-            
-            result = self.db_manager.execute_update(query, (task_id, self.user_id))
-            
             # Re-add reminder if the task had one
-            if bool(results[0]['has_reminder']):
-                due_date = results[0]['due_date']
-                # We need the task title
-                task_query = "SELECT title FROM tasks WHERE id = ?"
-                task_result = self.db_manager.execute_query(task_query, (task_id,))
-                
-                if task_result:
-                    task_title = task_result[0]['title']
-                    reminder_data = {'value': 15, 'unit': 'دقیقه'}  # Default reminder (15 minutes before)
-                    self.add_reminder_for_task(task_id, due_date, task_title, reminder_data)
+            row = results[0]
+            if bool(row['has_reminder']):
+                reminder_data = {'value': 15, 'unit': 'دقیقه'}  # Default reminder (15 minutes before)
+                self.add_reminder_for_task(
+                    task_id, row['due_date'], row['title'], reminder_data, check_exists=False
+                )
             
-            return result > 0
+            return True
         except Exception as e:
             logger.error(f"Error restoring task: {str(e)}")
             raise
     
+    def _fetch_reminders(self, where, params, limit=None):
+        """Run the reminders query for the user and build Reminder objects
+        
+        Args:
+            where (str): Extra filter clause on r.*, or None
+            params (tuple): Parameters for the filter clause
+            limit (int, optional): Maximum number of rows
+            
+        Returns:
+            list: List of Reminder objects ordered by reminder time
+        """
+        query = _reminder_sql(where, bool(limit))
+        branch_params = (self.user_id,) + params
+        params = branch_params + branch_params + ((limit,) if limit else ())
+        return list(map(Reminder._from_row, self._tuple_rows(query, params)))
+    
     def get_reminders(self):
         """Get all reminders for the user
         
@@ -716,37 +987,7 @@ class CalendarService:
             list: List of Reminder objects
         """
         try:
-            query = """
-                SELECT r.id, r.user_id, r.source_type, r.source_id, r.reminder_time, r.status,
-                       CASE
-                           WHEN r.source_type = 'event' THEN e.title
-                           WHEN r.source_type = 'task' THEN t.title
-                           ELSE NULL
-                       END as title
-                FROM reminders r
-                LEFT JOIN calendar_events e ON r.source_type = 'event' AND r.source_id = e.id
-                LEFT JOIN tasks t ON r.source_type = 'task' AND r.source_id = t.id
-                WHERE r.user_id = ?
-                ORDER BY r.reminder_time
-            """
-            
-            results = self.db_manager.execute_query(query, (self.user_id,))
-            
-            reminders = []
-            for row in results:
-                reminder_time = datetime.fromisoformat(row['reminder_time'])
-                reminder = Reminder(
-                    id=row['id'],
-                    user_id=row['user_id'],
-                    title=row['title'],
-                    date=reminder_time.date().isoformat(),
-                    time=reminder_time.strftime("%H:%M"),
-                    source_type=row['source_type'],
-                    source_id=row['source_id']
-                )
-                reminders.append(reminder)
-            
-            return reminders
+            return self._fetch_reminders(None, ())
         except Exception as e:
             logger.error(f"Error getting reminders: {str(e)}")
             return []
@@ -758,87 +999,42 @@ class CalendarService:
             list: List of Reminder objects for today
         """
         try:
-            today = datetime.now().date().isoformat()
-            
-            query = """
-                SELECT r.id, r.user_id, r.source_type, r.source_id, r.reminder_time, r.status,
-                       CASE
-                           WHEN r.source_type = 'event' THEN e.title
-                           WHEN r.source_type = 'task' THEN t.title
-                           ELSE NULL
-                       END as title
-                FROM reminders r
-                LEFT JOIN calendar_events e ON r.source_type = 'event' AND r.source_id = e.id
-                LEFT JOIN tasks t ON r.source_type = 'task' AND r.source_id = t.id
-                WHERE r.user_id = ? AND date(r.reminder_time) = ?
-                ORDER BY r.reminder_time
-            """
-            
-            results = self.db_manager.execute_query(query, (self.user_id, today))
-            
-            reminders = []
-            for row in results:
-                reminder_time = datetime.fromisoformat(row['reminder_time'])
-                reminder = Reminder(
-                    id=row['id'],
-                    user_id=row['user_id'],
-                    title=row['title'],
-                    date=reminder_time.date().isoformat(),
-                    time=reminder_time.strftime("%H:%M"),
-                    source_type=row['source_type'],
-                    source_id=row['source_id']
-                )
-                reminders.append(reminder)
+            today = _today_iso()
             
-            return reminders
+            # A range on the raw column (rather than date(...)) can use idx_reminders_user_time;
+            # SQLite works out the next day itself, so no datetime round-trip is needed here
+            return self._fetch_reminders(
+                "r.reminder_time >= ? AND r.reminder_time < date(?, '+1 day')", (today, today))
         except Exception as e:
             logger.error(f"Error getting today's reminders: {str(e)}")
             return []
     
-    def get_upcoming_reminders(self, limit=5):
+    def get_upcoming_reminders(self, limit=5, until=None, since=None):
         """Get upcoming reminders
         
+        The window is bounded on both sides so the reminder_time index is read
+        as a short range instead of everything from now on.
+        
         Args:
             limit (int, optional): Maximum number of reminders to return
+            until (str, optional): Latest reminder time to include (ISO format);
+                defaults to 7 days from now
+            since (str, optional): Only return reminders strictly after this time
+                (ISO format), e.g. the last reminder_time a poller has seen;
+                defaults to now
             
         Returns:
             list: List of Reminder objects for upcoming reminders
         """
         try:
-            now = datetime.now().isoformat()
-            
-            query = """
-                SELECT r.id, r.user_id, r.source_type, r.source_id, r.reminder_time, r.status,
-                       CASE
-                           WHEN r.source_type = 'event' THEN e.title
-                           WHEN r.source_type = 'task' THEN t.title
-                           ELSE NULL
-                       END as title
-                FROM reminders r
-                LEFT JOIN calendar_events e ON r.source_type = 'event' AND r.source_id = e.id
-                LEFT JOIN tasks t ON r.source_type = 'task' AND r.source_id = t.id
-                WHERE r.user_id = ? AND r.reminder_time > ?
-                ORDER BY r.reminder_time
-                LIMIT ?
-            """
-            
-            results = self.db_manager.execute_query(query, (self.user_id, now, limit))
-            
-            reminders = []
-            for row in results:
-                reminder_time = datetime.fromisoformat(row['reminder_time'])
-                reminder = Reminder(
-                    id=row['id'],
-                    user_id=row['user_id'],
-                    title=row['title'],
-                    date=reminder_time.date().isoformat(),
-                    time=reminder_time.strftime("%H:%M"),
-                    source_type=row['source_type'],
-                    source_id=row['source_id']
-                )
-                reminders.append(reminder)
-            
-            return reminders
+            now = datetime.now()
+            if since is None:
+                since = now.isoformat()
+            if until is None:
+                until = (now + timedelta(days=7)).isoformat()
+            return self._fetch_reminders(
+                "r.reminder_time > ? AND r.reminder_time <= ?", (since, until), limit
+            )
         except Exception as e:
             logger.error(f"Error getting upcoming reminders: {str(e)}")
             return []
@@ -853,18 +1049,13 @@ class CalendarService:
             bool: True if deletion was successful
         """
         try:
-            # Check if reminder exists
-            query = "SELECT id FROM reminders WHERE id = ? AND user_id = ?"
-            results = self.db_manager.execute_query(query, (reminder_id, self.user_id))
+            # Delete the reminder; the user filter doubles as the ownership check
+            result = self.db_manager.execute_update(_SQL_DELETE_REMINDER, (reminder_id, self.user_id))
             
-            if not results:
+            if result == 0:
                 raise ValueError(f"Reminder with ID {reminder_id} not found.")
             
-            # Delete the reminder
-            query = "DELETE FROM reminders WHERE id = ? AND user_id = ?"
-            result = self.db_manager.execute_update(query, (reminder_id, self.user_id))
-            
-            return result > 0
+            return True
         except Exception as e:
             logger.error(f"Error deleting reminder: {str(e)}")
             raise
@@ -881,19 +1072,96 @@ class CalendarService:
         """
         try:
             # Delete the reminders
-            query = """
-                DELETE FROM reminders
-                WHERE user_id = ? AND source_type = ? AND source_id = ?
-            """
-            
-            result = self.db_manager.execute_update(query, (self.user_id, source_type, source_id))
+            result = self.db_manager.execute_update(
+                _SQL_DELETE_SOURCE_REMINDERS, (self.user_id, source_type, source_id)
+            )
             
             return result > 0
         except Exception as e:
             logger.error(f"Error deleting reminders for source: {str(e)}")
             raise
     
-    def add_reminder_for_event(self, event_id, event_date, event_title, reminder_data):
+    def add_reminders_bulk(self, event_items=(), task_items=()):
+        """Add reminders for many events and tasks at once
+        
+        All referenced rows are read with one query per table and every
+        reminder is inserted with a single executemany in one transaction.
+        
+        Args:
+            event_items (iterable): (event_id, reminder_data) pairs
+            task_items (iterable): (task_id, reminder_data) pairs
+            
+        Returns:
+            int: Number of reminders added
+        """
+        try:
+            event_items = list(event_items)
+            task_items = list(task_items)
+            rows = []
+            
+            with self.db_manager.transaction("IMMEDIATE"):
+                if event_items:
+                    ids = {event_id for event_id, _ in event_items}
+                    placeholders = ", ".join("?" * len(ids))
+                    events = {
+                        row['id']: row for row in self.db_manager.execute_fetchall(
+                            "SELECT id, date, start_time, all_day FROM calendar_events "
+                            f"WHERE user_id = ? AND id IN ({placeholders})",
+                            (self.user_id, *ids)
+                        )
+                    }
+                    missing = ids - events.keys()
+                    if missing:
+                        raise ValueError(f"Events with IDs {sorted(missing)} not found.")
+                    
+                    for event_id, reminder_data in event_items:
+                        row = events[event_id]
+                        base = _parse_ymd_hm(row['date'], "09:00" if row['all_day'] else row['start_time'])
+                        reminder_time = _compute_reminder_time(base, reminder_data)
+                        rows.append((self.user_id, 'event', event_id, reminder_time.isoformat(), 'pending'))
+                
+                if task_items:
+                    ids = {task_id for task_id, _ in task_items}
+                    placeholders = ", ".join("?" * len(ids))
+                    due_dates = {
+                        row['id']: row['due_date'] for row in self.db_manager.execute_fetchall(
+                            f"SELECT id, due_date FROM tasks WHERE user_id = ? AND id IN ({placeholders})",
+                            (self.user_id, *ids)
+                        )
+                    }
+                    missing = ids - due_dates.keys()
+                    if missing:
+                        raise ValueError(f"Tasks with IDs {sorted(missing)} not found.")
+                    
+                    for task_id, reminder_data in task_items:
+                        base = _parse_ymd_hm(due_dates[task_id], "09:00")
+                        reminder_time = _compute_reminder_time(base, reminder_data)
+                        rows.append((self.user_id, 'task', task_id, reminder_time.isoformat(), 'pending'))
+                
+                if rows:
+                    self.db_manager.execute_batch(_SQL_INSERT_REMINDER, rows)
+                
+                # Flag the parents, as add_event/add_task do, so deleting or
+                # completing them also removes these reminders
+                for table, items in (("calendar_events", event_items), ("tasks", task_items)):
+                    if items:
+                        ids = {source_id for source_id, _ in items}
+                        placeholders = ", ".join("?" * len(ids))
+                        self.db_manager.execute_update(
+                            f"UPDATE {table} SET has_reminder = 1 "
+                            f"WHERE user_id = ? AND id IN ({placeholders}) AND IFNULL(has_reminder, 0) = 0",
+                            (self.user_id, *ids)
+                        )
+                        cache = _event_rows if table == "calendar_events" else _task_rows
+                        for source_id in ids:
+                            cache.pop(self._cache_key + (source_id,), None)
+            
+            return len(rows)
+        except Exception as e:
+            logger.error(f"Error adding reminders in bulk: {str(e)}")
+            raise
+    
+    def add_reminder_for_event(self, event_id, event_date, event_title, reminder_data, event_meta=None):
         """Add a reminder for an event
         
         Args:
@@ -903,65 +1171,59 @@ class CalendarService:
             reminder_data (dict): Dictionary with reminder data
                 - value: Reminder value (e.g., 15)
                 - unit: Reminder unit (e.g., 'دقیقه', 'ساعت', 'روز')
+            event_meta (dict, optional): The stored event's 'date', 'start_time' and
+                'all_day'. Callers that have just written the event pass it to skip
+                reading the row back; otherwise it is loaded (and ownership checked)
+                and the event is flagged has_reminder.
             
         Returns:
             int: The ID of the new reminder, or None if adding failed
         """
         try:
-            # Get the event details
-            query = "SELECT date, start_time, all_day FROM calendar_events WHERE id = ? AND user_id = ?"
-            results = self.db_manager.execute_query(query, (event_id, self.user_id))
-            
-            if not results:
-                raise ValueError(f"Event with ID {event_id} not found.")
-            
-            row = results[0]
-            event_date = row['date']
-            
-            # Calculate reminder time
-            if row['all_day']:
-                # For all-day events, set reminder at 9:00 AM
-                event_datetime = datetime.strptime(f"{event_date} 09:00", "%Y-%m-%d %H:%M")
-            else:
-                # For regular events, use the start time
-                event_datetime = datetime.strptime(f"{event_date} {row['start_time']}", "%Y-%m-%d %H:%M")
-            
-            # Calculate reminder time based on unit
-            value = int(reminder_data['value'])
-            unit = reminder_data['unit']
-            
-            if unit == 'دقیقه':
-                reminder_time = event_datetime - timedelta(minutes=value)
-            elif unit == 'ساعت':
-                reminder_time = event_datetime - timedelta(hours=value)
-            elif unit == 'روز':
-                reminder_time = event_datetime - timedelta(days=value)
-            else:
-                # Default to 15 minutes before
-                reminder_time = event_datetime - timedelta(minutes=15)
-            
-            # Add the reminder
-            query = """
-                INSERT INTO reminders (
-                    user_id, source_type, source_id, reminder_time, status, created_at
-                )
-                VALUES (?, ?, ?, ?, ?, ?)
-            """
-            
-            now = datetime.now().isoformat()
-            reminder_id = self.db_manager.execute_insert(
-                query, (
-                    self.user_id, 'event', event_id, reminder_time.isoformat(),
-                    'pending', now
+            # Unflagged callers get the read, insert and flag in one transaction
+            flag_parent = event_meta is None
+            with self.db_manager.transaction("IMMEDIATE"):
+                if flag_parent:
+                    # Get the event details
+                    results = self.db_manager.execute_fetchall(_SQL_EVENT_SCHEDULE, (event_id, self.user_id))
+                    
+                    if not results:
+                        raise ValueError(f"Event with ID {event_id} not found.")
+                    
+                    event_meta = results[0]
+                
+                row = event_meta
+                event_date = row['date']
+                
+                # Calculate reminder time
+                if row['all_day']:
+                    # For all-day events, set reminder at 9:00 AM
+                    event_datetime = _parse_ymd_hm(event_date, "09:00")
+                else:
+                    # For regular events, use the start time
+                    event_datetime = _parse_ymd_hm(event_date, row['start_time'])
+                
+                # Calculate reminder time based on unit
+                reminder_time = _compute_reminder_time(event_datetime, reminder_data)
+                
+                # Add the reminder
+                reminder_id = self.db_manager.execute_insert(
+                    _SQL_INSERT_REMINDER, (
+                        self.user_id, 'event', event_id, reminder_time.isoformat(), 'pending'
+                    )
                 )
-            )
+                
+                if flag_parent:
+                    self.db_manager.execute_update(_SQL_FLAG_EVENT_REMINDER, (event_id, self.user_id))
             
+            if flag_parent:
+                _event_rows.pop(self._cache_key + (event_id,), None)
             return reminder_id
         except Exception as e:
             logger.error(f"Error adding reminder for event: {str(e)}")
             raise
     
-    def add_reminder_for_task(self, task_id, task_due_date, task_title, reminder_data):
+    def add_reminder_for_task(self, task_id, task_due_date, task_title, reminder_data, check_exists=True):
         """Add a reminder for a task
         
         Args:
@@ -971,53 +1233,45 @@ class CalendarService:
             reminder_data (dict): Dictionary with reminder data
                 - value: Reminder value (e.g., 15)
                 - unit: Reminder unit (e.g., 'دقیقه', 'ساعت', 'روز')
+            check_exists (bool, optional): Whether to verify the task belongs to the user
+                and flag it has_reminder. Callers that have just written the task row
+                already know it does and have set the flag.
             
         Returns:
             int: The ID of the new reminder, or None if adding failed
         """
         try:
-            # Check if task exists
-            query = "SELECT id FROM tasks WHERE id = ? AND user_id = ?"
-            results = self.db_manager.execute_query(query, (task_id, self.user_id))
-            
-            if not results:
-                raise ValueError(f"Task with ID {task_id} not found.")
-            
             # Calculate reminder time
             # For tasks, set reminder at 9:00 AM on the due date by default
-            task_datetime = datetime.strptime(f"{task_due_date} 09:00", "%Y-%m-%d %H:%M")
+            task_datetime = _parse_ymd_hm(task_due_date, "09:00")
             
             # Calculate reminder time based on unit
-            value = int(reminder_data['value'])
-            unit = reminder_data['unit']
-            
-            if unit == 'دقیقه':
-                reminder_time = task_datetime - timedelta(minutes=value)
-            elif unit == 'ساعت':
-                reminder_time = task_datetime - timedelta(hours=value)
-            elif unit == 'روز':
-                reminder_time = task_datetime - timedelta(days=value)
-            else:
-                # Default to 15 minutes before
-                reminder_time = task_datetime - timedelta(minutes=15)
+            reminder_time = _compute_reminder_time(task_datetime, reminder_data)
             
             # Add the reminder
-            query = """
-                INSERT INTO reminders (
-                    user_id, source_type, source_id, reminder_time, status, created_at
+            if not check_exists:
+                return self.db_manager.execute_insert(
+                    _SQL_INSERT_REMINDER, (
+                        self.user_id, 'task', task_id, reminder_time.isoformat(), 'pending'
+                    )
                 )
-                VALUES (?, ?, ?, ?, ?, ?)
-            """
             
-            now = datetime.now().isoformat()
-            reminder_id = self.db_manager.execute_insert(
-                query, (
-                    self.user_id, 'task', task_id, reminder_time.isoformat(),
-                    'pending', now
+            with self.db_manager.transaction("IMMEDIATE"):
+                # The ownership check rides along in the INSERT itself
+                results = self.db_manager.execute_query(
+                    _SQL_INSERT_TASK_REMINDER_CHECKED, (
+                        self.user_id, task_id, reminder_time.isoformat(), 'pending',
+                        task_id, self.user_id
+                    )
                 )
-            )
+                
+                if not results:
+                    raise ValueError(f"Task with ID {task_id} not found.")
+                
+                self.db_manager.execute_update(_SQL_FLAG_TASK_REMINDER, (task_id, self.user_id))
             
-            return reminder_id
+            _task_rows.pop(self._cache_key + (task_id,), None)
+            return results[0]['id']
         except Exception as e:
             logger.error(f"Error adding reminder for task: {str(e)}")
             raise
@@ -1029,42 +1283,17 @@ class CalendarService:
             dict: Dictionary with reminder preferences
         """
         try:
-            # Get enable_notifications setting
-            enable_query = """
-                SELECT setting_value
-                FROM user_settings
-                WHERE user_id = ? AND setting_key = 'enable_notifications'
-            """
-            
-            enable_result = self.db_manager.execute_query(enable_query, (self.user_id,))
-            
-            # Get default_reminder_time setting
-            time_query = """
-                SELECT setting_value
-                FROM user_settings
-                WHERE user_id = ? AND setting_key = 'default_reminder_time'
-            """
-            
-            time_result = self.db_manager.execute_query(time_query, (self.user_id,))
-            
-            # Default values
-            enable_notifications = True
-            default_reminder_time = 15
+            if (self._prefs_cache is not None
+                    and time.monotonic() - self._prefs_cache_ts < _PREFS_CACHE_TTL):
+                return dict(self._prefs_cache)
             
-            # Parse results
-            if enable_result:
-                enable_notifications = enable_result[0]['setting_value'].lower() == 'true'
+            # Both settings in one query
+            results = self.db_manager.execute_fetchall(_SQL_REMINDER_SETTINGS, (self.user_id,))
+            settings = {row['setting_key']: row['setting_value'] for row in results}
             
-            if time_result:
-                try:
-                    default_reminder_time = int(time_result[0]['setting_value'])
-                except (ValueError, TypeError):
-                    default_reminder_time = 15
-            
-            return {
-                'enable_notifications': enable_notifications,
-                'default_reminder_time': default_reminder_time
-            }
+            self._prefs_cache = _parse_reminder_preferences(settings)
+            self._prefs_cache_ts = time.monotonic()
+            return dict(self._prefs_cache)
         except Exception as e:
             logger.error(f"Error getting reminder preferences: {str(e)}")
             return {
@@ -1091,21 +1320,18 @@ class CalendarService:
             # Current timestamp
             now = datetime.now().isoformat()
             
-            # Save enable_notifications setting
-            enable_query = """
-                INSERT OR REPLACE INTO user_settings (user_id, setting_key, setting_value, created_at)
-                VALUES (?, 'enable_notifications', ?, ?)
-            """
-            
-            self.db_manager.execute_update(enable_query, (self.user_id, enable_value, now))
-            
-            # Save default_reminder_time setting
-            time_query = """
-                INSERT OR REPLACE INTO user_settings (user_id, setting_key, setting_value, created_at)
-                VALUES (?, 'default_reminder_time', ?, ?)
-            """
-            
-            self.db_manager.execute_update(time_query, (self.user_id, time_value, now))
+            # Save both settings in a single statement and commit
+            self.db_manager.execute_update(_SQL_SAVE_REMINDER_SETTINGS, (
+                self.user_id, 'enable_notifications', enable_value, now,
+                self.user_id, 'default_reminder_time', time_value, now,
+            ))
+            
+            # Keep the cached copy in step with what was just stored
+            self._prefs_cache = _parse_reminder_preferences({
+                'enable_notifications': enable_value,
+                'default_reminder_time': time_value
+            })
+            self._prefs_cache_ts = time.monotonic()
             
             return True
         except Exception as e:
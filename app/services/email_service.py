@@ -2,13 +2,229 @@
 Email service for Persian Life Manager Application using SMTP
 """
 import os
+import html
+import queue
+import atexit
 import smtplib
 import logging
+import threading
 from email.mime.text import MIMEText
+from concurrent.futures import ThreadPoolExecutor
+from email import policy
+from email.charset import Charset
+from email.header import Header
 from email.mime.multipart import MIMEMultipart
+from email.utils import formataddr
+from functools import lru_cache
+from string import Template
+from typing import Iterable, List, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Idle SMTP connections kept open for reuse (also the bulk-send concurrency),
+# and the socket timeout for each
+SMTP_POOL_SIZE = 4
+SMTP_TIMEOUT = 10
+
+# Logged-in connections waiting to be reused, most recently used first, one
+# pool per (server, port, username). Shared by every EmailService, since the
+# web handler creates a new service for each email it sends.
+_pools = {}
+_pools_lock = threading.Lock()
+
+_VERIFICATION_SUBJECT = "تأیید ایمیل - Persian Life Manager"
+_PASSWORD_RESET_SUBJECT = "بازنشانی رمز عبور - Persian Life Manager"
+
+# Email bodies are built once at import; only $name and $link change per send
+_VERIFICATION_TEMPLATE = Template("""\
+<!DOCTYPE html>
+<html dir="rtl" lang="fa">
+<head>
+    <meta charset="UTF-8">
+    <style>
+        body {
+            font-family: Arial, Tahoma, sans-serif;
+            line-height: 1.6;
+            color: #333;
+            padding: 20px;
+        }
+        .container {
+            max-width: 600px;
+            margin: 0 auto;
+            background: #fff;
+            border-radius: 5px;
+            padding: 20px;
+            box-shadow: 0 2px 5px rgba(0,0,0,0.1);
+        }
+        .button {
+            display: inline-block;
+            padding: 10px 20px;
+            background-color: #00ffaa;
+            color: #000;
+            text-decoration: none;
+            border-radius: 5px;
+            margin: 20px 0;
+        }
+        .footer {
+            margin-top: 30px;
+            font-size: 0.9em;
+            color: #666;
+        }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <h2>به Persian Life Manager خوش آمدید</h2>
+        <p>سلام $name،</p>
+        <p>از ثبت‌نام شما در Persian Life Manager متشکریم. برای تکمیل ثبت‌نام و فعال‌سازی حساب کاربری خود، لطفاً روی دکمه زیر کلیک کنید:</p>
+
+        <a href="$link" class="button">تأیید ایمیل</a>
+
+        <p>اگر دکمه بالا کار نمی‌کند، می‌توانید لینک زیر را در مرورگر خود کپی و جایگذاری کنید:</p>
+        <p>$link</p>
+
+        <p>این لینک تا 24 ساعت معتبر است.</p>
+
+        <div class="footer">
+            <p>با تشکر،<br>تیم Persian Life Manager</p>
+            <p>اگر شما درخواست ایجاد حساب کاربری نداده‌اید، لطفاً این ایمیل را نادیده بگیرید.</p>
+        </div>
+    </div>
+</body>
+</html>
+""")
+
+_PASSWORD_RESET_TEMPLATE = Template("""\
+<!DOCTYPE html>
+<html dir="rtl" lang="fa">
+<head>
+    <meta charset="UTF-8">
+    <style>
+        body {
+            font-family: Arial, Tahoma, sans-serif;
+            line-height: 1.6;
+            color: #333;
+            padding: 20px;
+        }
+        .container {
+            max-width: 600px;
+            margin: 0 auto;
+            background: #fff;
+            border-radius: 5px;
+            padding: 20px;
+            box-shadow: 0 2px 5px rgba(0,0,0,0.1);
+        }
+        .button {
+            display: inline-block;
+            padding: 10px 20px;
+            background-color: #00ffaa;
+            color: #000;
+            text-decoration: none;
+            border-radius: 5px;
+            margin: 20px 0;
+        }
+        .footer {
+            margin-top: 30px;
+            font-size: 0.9em;
+            color: #666;
+        }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <h2>درخواست بازنشانی رمز عبور</h2>
+        <p>سلام $name،</p>
+        <p>شما درخواست بازنشانی رمز عبور خود را در Persian Life Manager داده‌اید. برای تنظیم رمز عبور جدید، لطفاً روی دکمه زیر کلیک کنید:</p>
+
+        <a href="$link" class="button">بازنشانی رمز عبور</a>
+
+        <p>اگر دکمه بالا کار نمی‌کند، می‌توانید لینک زیر را در مرورگر خود کپی و جایگذاری کنید:</p>
+        <p>$link</p>
+
+        <p>این لینک تا 1 ساعت معتبر است.</p>
+
+        <div class="footer">
+            <p>با تشکر،<br>تیم Persian Life Manager</p>
+            <p>اگر شما درخواست بازنشانی رمز عبور نداده‌اید، لطفاً این ایمیل را نادیده بگیرید و به ما اطلاع دهید.</p>
+        </div>
+    </div>
+</body>
+</html>
+""")
+
+# Placeholders left in pre-serialized bulk bodies and replaced per recipient
+_NAME_TOKEN = "__PLM_NAME__"
+_LINK_TOKEN = "__PLM_LINK__"
+
+
+def _get_pool(key: Tuple[str, int, str]) -> queue.LifoQueue:
+    """Get the connection pool of an SMTP account, creating it on first use
+    
+    Args:
+        key (tuple): (smtp_server, smtp_port, smtp_username)
+        
+    Returns:
+        queue.LifoQueue: The account's pool of idle connections
+    """
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = queue.LifoQueue(maxsize=SMTP_POOL_SIZE)
+            _pools[key] = pool
+        return pool
+
+
+def _drain_pool(pool: queue.LifoQueue) -> None:
+    """Log out of and close every idle connection in a pool"""
+    while True:
+        try:
+            server = pool.get_nowait()
+        except queue.Empty:
+            return
+        EmailService._discard(server)
+
+
+@atexit.register
+def _close_all_pools() -> None:
+    """Log out of every pooled SMTP connection when the process exits"""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        _drain_pool(pool)
+
+
+def _check_address(address: str) -> None:
+    """Reject an email address that would break out of its header line
+    
+    Args:
+        address (str): Email address
+        
+    Raises:
+        ValueError: If the address contains a CR or LF
+    """
+    if '\r' in address or '\n' in address:
+        raise ValueError(f"Invalid email address: {address!r}")
+
+
+@lru_cache(maxsize=None)
+def _template_body_bytes(template: Template) -> bytes:
+    """Serialize a template's MIME part once, keeping name/link placeholders
+    
+    The body is sent as 8bit UTF-8 (not base64) so the placeholders stay
+    visible in the bytes and can be replaced without re-encoding.
+    
+    Args:
+        template (Template): Email body template with $name and $link
+        
+    Returns:
+        bytes: Content headers and body with CRLF line endings
+    """
+    charset = Charset('utf-8')
+    charset.body_encoding = None
+    part = MIMEText(template.substitute(name=_NAME_TOKEN, link=_LINK_TOKEN), 'html', charset)
+    return part.as_bytes(policy=policy.SMTP)
+
+
 class EmailService:
     """Service for sending emails"""
     
@@ -29,6 +245,89 @@ class EmailService:
         ]):
             logger.error("Missing required SMTP configuration")
             raise ValueError("Missing required SMTP configuration")
+        
+        # Logged-in connections shared with other instances for this account
+        self._pool = _get_pool((self.smtp_server, self.smtp_port, self.smtp_username))
+    
+    def _connect(self) -> smtplib.SMTP:
+        """Open a new SMTP connection and log in
+        
+        Returns:
+            smtplib.SMTP: Connected and authenticated SMTP client
+        """
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=SMTP_TIMEOUT)
+        try:
+            server.starttls()
+            server.login(self.smtp_username, self.smtp_password)
+        except Exception:
+            server.close()
+            raise
+        return server
+    
+    def _acquire(self) -> smtplib.SMTP:
+        """Take a live connection from the pool, or open a new one
+        
+        Returns:
+            smtplib.SMTP: Connected and authenticated SMTP client
+        """
+        try:
+            server = self._pool.get_nowait()
+        except queue.Empty:
+            return self._connect()
+        
+        # The server may have dropped an idle connection
+        try:
+            server.noop()
+            return server
+        except (smtplib.SMTPException, OSError):
+            self._discard(server)
+            return self._connect()
+    
+    def _release(self, server: smtplib.SMTP) -> None:
+        """Return a healthy connection to the pool, closing it if the pool is full"""
+        try:
+            self._pool.put_nowait(server)
+        except queue.Full:
+            self._discard(server)
+    
+    @staticmethod
+    def _discard(server: smtplib.SMTP) -> None:
+        """Close a connection that will not be reused"""
+        try:
+            server.quit()
+        except (smtplib.SMTPException, OSError):
+            server.close()
+    
+    def close(self) -> None:
+        """Log out of and close the idle pooled connections of this account
+        
+        Connections still in use by other threads are returned to the pool
+        as usual; the rest are closed when the process exits.
+        """
+        _drain_pool(self._pool)
+    
+    def _deliver(self, send) -> None:
+        """Run a send on a pooled connection
+        
+        A connection the server closed in the meantime is replaced once.
+        
+        Args:
+            send (callable): Called with the smtplib.SMTP connection to use
+        """
+        for attempt in range(2):
+            server = self._acquire()
+            try:
+                send(server)
+            except (smtplib.SMTPServerDisconnected, ConnectionError):
+                server.close()
+                if attempt:
+                    raise
+                continue
+            except Exception:
+                self._discard(server)
+                raise
+            self._release(server)
+            return
     
     def send_email(self, to_email: str, subject: str, html_content: str) -> bool:
         """Send email with HTML content
@@ -42,21 +341,9 @@ class EmailService:
             bool: True if email was sent successfully, False otherwise
         """
         try:
-            # Create message
-            message = MIMEMultipart('alternative')
-            message['Subject'] = subject
-            message['From'] = self.sender_email
-            message['To'] = to_email
+            message = self._build_message(to_email, subject, html_content)
             
-            # Add HTML content
-            html_part = MIMEText(html_content, 'html', 'utf-8')
-            message.attach(html_part)
-            
-            # Connect to SMTP server
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.smtp_username, self.smtp_password)
-                server.send_message(message)
+            self._deliver(lambda server: server.send_message(message))
                 
             logger.info(f"Email sent successfully to {to_email}")
             return True
@@ -65,6 +352,138 @@ class EmailService:
             logger.error(f"Failed to send email to {to_email}: {str(e)}")
             return False
     
+    def _build_message(self, to_email: str, subject: str, html_content: str) -> MIMEMultipart:
+        """Build an HTML email message
+        
+        Args:
+            to_email (str): Recipient email address
+            subject (str): Email subject
+            html_content (str): Email content in HTML format
+            
+        Returns:
+            MIMEMultipart: The message, ready for send_message
+        """
+        _check_address(self.sender_email)
+        _check_address(to_email)
+        
+        # Create message
+        message = MIMEMultipart('alternative')
+        message['Subject'] = subject
+        message['From'] = self.sender_email
+        message['To'] = to_email
+        
+        # Add HTML content
+        html_part = MIMEText(html_content, 'html', 'utf-8')
+        message.attach(html_part)
+        return message
+    
+    def send_emails_bulk(self, items: Iterable[Tuple[str, str, str]]) -> List[bool]:
+        """Send several emails concurrently over the pooled SMTP connections
+        
+        Args:
+            items (iterable): (to_email, subject, html_content) tuples
+            
+        Returns:
+            list: Send result for each item, in input order
+        """
+        items = list(items)
+        if not items:
+            return []
+        
+        # No more workers than pooled connections, so every send reuses one
+        workers = min(SMTP_POOL_SIZE, len(items))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(lambda item: self.send_email(*item), items))
+    
+    def _send_template_bulk(self, template: Template, subject: str,
+                            recipients: Iterable[Tuple[str, str, str]]) -> List[bool]:
+        """Send one template to many recipients from a pre-serialized body
+        
+        The MIME body is built once per template; each message only
+        prepends its own headers and fills in the name and link. Messages
+        that cannot go out as raw 8bit bytes (non-ASCII addresses, or a
+        server without 8BITMIME) are built and sent like send_email's.
+        
+        Args:
+            template (Template): Email body template with $name and $link
+            subject (str): Email subject
+            recipients (iterable): (to_email, name, link) tuples
+            
+        Returns:
+            list: Send result for each recipient, in input order
+        """
+        recipients = list(recipients)
+        if not recipients:
+            return []
+        
+        body = _template_body_bytes(template)
+        head = (
+            f"Subject: {Header(subject, 'utf-8').encode()}\r\n"
+            f"From: {formataddr((None, self.sender_email))}\r\n"
+        )
+        
+        def send_one(recipient):
+            to_email, name, link = recipient
+            try:
+                _check_address(self.sender_email)
+                _check_address(to_email)
+                
+                def build_message():
+                    return self._build_message(to_email, subject, template.substitute(
+                        name=html.escape(name), link=html.escape(link)
+                    ))
+                
+                # Raw header lines can only carry ASCII addresses
+                if not (head.isascii() and to_email.isascii()):
+                    message = build_message()
+                    self._deliver(lambda server: server.send_message(message))
+                else:
+                    raw = (
+                        f"{head}To: {formataddr((None, to_email))}\r\n".encode('ascii')
+                        + body.replace(_NAME_TOKEN.encode(), html.escape(name).encode('utf-8'))
+                              .replace(_LINK_TOKEN.encode(), html.escape(link).encode('utf-8'))
+                    )
+                    
+                    def send(server):
+                        if server.has_extn('8bitmime'):
+                            server.sendmail(self.sender_email, [to_email], raw,
+                                            mail_options=['BODY=8BITMIME'])
+                        else:
+                            server.send_message(build_message())
+                    
+                    self._deliver(send)
+                logger.info(f"Email sent successfully to {to_email}")
+                return True
+            except Exception as e:
+                logger.error(f"Failed to send email to {to_email}: {str(e)}")
+                return False
+        
+        workers = min(SMTP_POOL_SIZE, len(recipients))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(send_one, recipients))
+    
+    def send_verification_emails_bulk(self, recipients: Iterable[Tuple[str, str, str]]) -> List[bool]:
+        """Send verification emails to many users
+        
+        Args:
+            recipients (iterable): (to_email, name, verification_link) tuples
+            
+        Returns:
+            list: Send result for each recipient, in input order
+        """
+        return self._send_template_bulk(_VERIFICATION_TEMPLATE, _VERIFICATION_SUBJECT, recipients)
+    
+    def send_password_reset_emails_bulk(self, recipients: Iterable[Tuple[str, str, str]]) -> List[bool]:
+        """Send password reset emails to many users
+        
+        Args:
+            recipients (iterable): (to_email, name, reset_link) tuples
+            
+        Returns:
+            list: Send result for each recipient, in input order
+        """
+        return self._send_template_bulk(_PASSWORD_RESET_TEMPLATE, _PASSWORD_RESET_SUBJECT, recipients)
+    
     def send_verification_email(self, to_email: str, name: str, verification_link: str) -> bool:
         """Send verification email with verification link
         
@@ -76,65 +495,11 @@ class EmailService:
         Returns:
             bool: True if email was sent successfully, False otherwise
         """
-        subject = "تأیید ایمیل - Persian Life Manager"
-        
-        html_content = f'''
-        <!DOCTYPE html>
-        <html dir="rtl" lang="fa">
-        <head>
-            <meta charset="UTF-8">
-            <style>
-                body {{
-                    font-family: Arial, Tahoma, sans-serif;
-                    line-height: 1.6;
-                    color: #333;
-                    padding: 20px;
-                }}
-                .container {{
-                    max-width: 600px;
-                    margin: 0 auto;
-                    background: #fff;
-                    border-radius: 5px;
-                    padding: 20px;
-                    box-shadow: 0 2px 5px rgba(0,0,0,0.1);
-                }}
-                .button {{
-                    display: inline-block;
-                    padding: 10px 20px;
-                    background-color: #00ffaa;
-                    color: #000;
-                    text-decoration: none;
-                    border-radius: 5px;
-                    margin: 20px 0;
-                }}
-                .footer {{
-                    margin-top: 30px;
-                    font-size: 0.9em;
-                    color: #666;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <h2>به Persian Life Manager خوش آمدید</h2>
-                <p>سلام {name}،</p>
-                <p>از ثبت‌نام شما در Persian Life Manager متشکریم. برای تکمیل ثبت‌نام و فعال‌سازی حساب کاربری خود، لطفاً روی دکمه زیر کلیک کنید:</p>
-                
-                <a href="{verification_link}" class="button">تأیید ایمیل</a>
-                
-                <p>اگر دکمه بالا کار نمی‌کند، می‌توانید لینک زیر را در مرورگر خود کپی و جایگذاری کنید:</p>
-                <p>{verification_link}</p>
-                
-                <p>این لینک تا 24 ساعت معتبر است.</p>
-                
-                <div class="footer">
-                    <p>با تشکر،<br>تیم Persian Life Manager</p>
-                    <p>اگر شما درخواست ایجاد حساب کاربری نداده‌اید، لطفاً این ایمیل را نادیده بگیرید.</p>
-                </div>
-            </div>
-        </body>
-        </html>
-        '''
+        subject = _VERIFICATION_SUBJECT
+        
+        html_content = _VERIFICATION_TEMPLATE.substitute(
+            name=html.escape(name), link=html.escape(verification_link)
+        )
         
         return self.send_email(to_email, subject, html_content)
     
@@ -149,64 +514,10 @@ class EmailService:
         Returns:
             bool: True if email was sent successfully, False otherwise
         """
-        subject = "بازنشانی رمز عبور - Persian Life Manager"
-        
-        html_content = f'''
-        <!DOCTYPE html>
-        <html dir="rtl" lang="fa">
-        <head>
-            <meta charset="UTF-8">
-            <style>
-                body {{
-                    font-family: Arial, Tahoma, sans-serif;
-                    line-height: 1.6;
-                    color: #333;
-                    padding: 20px;
-                }}
-                .container {{
-                    max-width: 600px;
-                    margin: 0 auto;
-                    background: #fff;
-                    border-radius: 5px;
-                    padding: 20px;
-                    box-shadow: 0 2px 5px rgba(0,0,0,0.1);
-                }}
-                .button {{
-                    display: inline-block;
-                    padding: 10px 20px;
-                    background-color: #00ffaa;
-                    color: #000;
-                    text-decoration: none;
-                    border-radius: 5px;
-                    margin: 20px 0;
-                }}
-                .footer {{
-                    margin-top: 30px;
-                    font-size: 0.9em;
-                    color: #666;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <h2>درخواست بازنشانی رمز عبور</h2>
-                <p>سلام {name}،</p>
-                <p>شما درخواست بازنشانی رمز عبور خود را در Persian Life Manager داده‌اید. برای تنظیم رمز عبور جدید، لطفاً روی دکمه زیر کلیک کنید:</p>
-                
-                <a href="{reset_link}" class="button">بازنشانی رمز عبور</a>
-                
-                <p>اگر دکمه بالا کار نمی‌کند، می‌توانید لینک زیر را در مرورگر خود کپی و جایگذاری کنید:</p>
-                <p>{reset_link}</p>
-                
-                <p>این لینک تا 1 ساعت معتبر است.</p>
-                
-                <div class="footer">
-                    <p>با تشکر،<br>تیم Persian Life Manager</p>
-                    <p>اگر شما درخواست بازنشانی رمز عبور نداده‌اید، لطفاً این ایمیل را نادیده بگیرید و به ما اطلاع دهید.</p>
-                </div>
-            </div>
-        </body>
-        </html>
-        '''
+        subject = _PASSWORD_RESET_SUBJECT
+        
+        html_content = _PASSWORD_RESET_TEMPLATE.substitute(
+            name=html.escape(name), link=html.escape(reset_link)
+        )
         
         return self.send_email(to_email, subject, html_content)
\ No newline at end of file
@@ -6,8 +6,11 @@ Finance service for Persian Life Manager Application
 """
 
 import os
+import sys
 import logging
-from datetime import datetime, timedelta
+import sqlite3
+import time
+from datetime import datetime
 import calendar
 
 from app.core.database import DatabaseManager
@@ -15,6 +18,213 @@ from app.models.finance import Category, Transaction, Budget, FinancialReport
 
 logger = logging.getLogger(__name__)
 
+# (name, statement) pairs created on service start-up if missing
+_FINANCE_INDEXES = (
+    ("idx_finance_categories_user_name",
+     "CREATE UNIQUE INDEX IF NOT EXISTS idx_finance_categories_user_name "
+     "ON finance_categories(user_id, name)"),
+    ("idx_tx_user_date_id",
+     "CREATE INDEX IF NOT EXISTS idx_tx_user_date_id "
+     "ON finance_transactions(user_id, date DESC, id DESC)"),
+    # Covering indexes: the totals and trend queries are answered from the
+    # index alone, amount included, without touching the table rows
+    ("idx_tx_user_type_date",
+     "CREATE INDEX IF NOT EXISTS idx_tx_user_type_date "
+     "ON finance_transactions(user_id, type, date, amount)"),
+    ("idx_tx_user_cat_date",
+     "CREATE INDEX IF NOT EXISTS idx_tx_user_cat_date "
+     "ON finance_transactions(user_id, category_id, date, amount)"),
+)
+
+# Seconds a service instance trusts its copy of the category list
+_CATEGORY_CACHE_TTL = 60.0
+
+# Current-month totals shared by every FinanceService in the process (the
+# dashboard and the finance page each have their own instance), keyed by
+# (db_path, user_id, 'YYYY-MM') and holding (monotonic time, summary).
+# Writes through any instance drop the entries they affect; the TTL bounds
+# how long writes made outside FinanceService can go unseen.
+_summary_cache = {}
+_SUMMARY_CACHE_TTL = 60.0
+
+
+def _filter_variants(head, filters, tail):
+    """Build every combination of optional filters as ready-made SQL
+    
+    Args:
+        head (str): SELECT ... WHERE part, always present
+        filters (tuple): Optional "AND ..." clauses; bit i of the key is set
+            when filters[i] is included
+        tail (str): GROUP BY / ORDER BY part
+        
+    Returns:
+        dict: Interned SQL text for each filter bitmask
+    """
+    variants = {}
+    for mask in range(1 << len(filters)):
+        clauses = [clause for i, clause in enumerate(filters) if mask & (1 << i)]
+        variants[mask] = sys.intern(" ".join([head, *clauses, tail]))
+    return variants
+
+
+def _filter_mask(values):
+    """Bitmask of the optional filter values that are set, matching _filter_variants"""
+    mask = 0
+    for i, value in enumerate(values):
+        if value:
+            mask |= 1 << i
+    return mask
+
+
+# Fixed statements, interned once so every call hands sqlite3's statement
+# cache the very same string object
+_SQL_CATEGORIES = sys.intern(
+    "SELECT id, user_id, name, type FROM finance_categories "
+    "WHERE user_id = ? ORDER BY name"
+)
+_SQL_CATEGORIES_TYPED = sys.intern(
+    "SELECT id, user_id, name, type FROM finance_categories "
+    "WHERE user_id = ? AND (type = ? OR type = 'both') ORDER BY name"
+)
+# Inserts nothing (and returns no row) if the user already has the name.
+# The check is in the statement itself, so it holds even on a database
+# where the unique (user_id, name) index could not be built.
+_SQL_INSERT_CATEGORY = sys.intern(
+    "INSERT INTO finance_categories (user_id, name, type, created_at) "
+    "SELECT ?1, ?2, ?3, ?4 "
+    "WHERE NOT EXISTS (SELECT 1 FROM finance_categories WHERE user_id = ?1 AND name = ?2) "
+    "RETURNING id"
+)
+# Updates nothing if another category of the user already has the new name
+_SQL_UPDATE_CATEGORY = sys.intern(
+    "UPDATE finance_categories SET name = ?1, type = ?2 WHERE id = ?3 AND user_id = ?4 "
+    "AND NOT EXISTS (SELECT 1 FROM finance_categories "
+    "WHERE user_id = ?4 AND name = ?1 AND id <> ?3)"
+)
+_SQL_CATEGORY_EXISTS = sys.intern("SELECT 1 FROM finance_categories WHERE id = ? AND user_id = ?")
+_SQL_CATEGORY_TYPE = sys.intern("SELECT type FROM finance_categories WHERE id = ? AND user_id = ?")
+# Columns in Transaction constructor order, for Transaction._from_row
+_SQL_TRANSACTIONS = sys.intern(
+    "SELECT t.id, t.user_id, t.title, t.amount, t.date, t.type, "
+    "t.category_id, c.name as category_name, t.description "
+    "FROM finance_transactions t JOIN finance_categories c ON t.category_id = c.id "
+    "WHERE t.user_id = ? ORDER BY t.date DESC, t.id DESC"
+)
+_SQL_TRANSACTIONS_PAGE = sys.intern(_SQL_TRANSACTIONS + " LIMIT ? OFFSET ?")
+# Keyset page: rows strictly after the (date, id) of the previous page's last row
+_SQL_TRANSACTIONS_AFTER = sys.intern(
+    "SELECT t.id, t.user_id, t.title, t.amount, t.date, t.type, "
+    "t.category_id, c.name as category_name, t.description "
+    "FROM finance_transactions t JOIN finance_categories c ON t.category_id = c.id "
+    "WHERE t.user_id = ? AND (t.date, t.id) < (?, ?) ORDER BY t.date DESC, t.id DESC LIMIT ?"
+)
+# Inserts nothing (and returns no row) unless the category belongs to the
+# user and accepts the transaction type
+_SQL_INSERT_TRANSACTION = sys.intern(
+    "INSERT INTO finance_transactions (user_id, category_id, title, amount, type, date, "
+    "description, created_at) "
+    "SELECT ?, ?, ?, ?, ?, ?, ?, ? "
+    "WHERE EXISTS (SELECT 1 FROM finance_categories "
+    "WHERE id = ? AND user_id = ? AND (type = 'both' OR type = ?)) RETURNING id"
+)
+# Unchecked insert for add_transactions, which validates categories up front
+_SQL_INSERT_TRANSACTION_ROW = sys.intern(
+    "INSERT INTO finance_transactions (user_id, category_id, title, amount, type, date, "
+    "description, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+_SQL_UPDATE_TRANSACTION = sys.intern(
+    "UPDATE finance_transactions "
+    "SET category_id = ?, title = ?, amount = ?, type = ?, date = ?, description = ? "
+    "WHERE id = ? AND user_id = ? AND EXISTS (SELECT 1 FROM finance_categories "
+    "WHERE id = ? AND user_id = ? AND (type = 'both' OR type = ?))"
+)
+_SQL_TRANSACTION_EXISTS = sys.intern(
+    "SELECT 1 FROM finance_transactions WHERE id = ? AND user_id = ? LIMIT 1"
+)
+_SQL_DELETE_TRANSACTION = sys.intern(
+    "DELETE FROM finance_transactions WHERE id = ? AND user_id = ?"
+)
+_SQL_BALANCE = sys.intern(
+    "SELECT SUM(CASE WHEN type = 'income' THEN amount ELSE 0 END) as income, "
+    "SUM(CASE WHEN type = 'expense' THEN amount ELSE 0 END) as expense "
+    "FROM finance_transactions WHERE user_id = ?"
+)
+# Current-period bounds are computed by SQLite in local time, so the
+# statement text and parameters stay the same from one day to the next
+_SQL_CURRENT_MONTH_TOTALS = sys.intern(
+    _SQL_BALANCE + " AND date >= date('now', 'localtime', 'start of month') "
+    "AND date < date('now', 'localtime', 'start of month', '+1 month')"
+)
+_SQL_MONTH_TOTALS = sys.intern(
+    "SELECT substr(date, 1, 7) as ym, "
+    "SUM(CASE WHEN type = 'income' THEN amount ELSE 0 END) as income, "
+    "SUM(CASE WHEN type = 'expense' THEN amount ELSE 0 END) as expense "
+    "FROM finance_transactions WHERE user_id = ? AND date BETWEEN ? AND ? GROUP BY ym"
+)
+# Aggregated per category first (from idx_tx_user_type_date), so only one
+# row per category is joined to finance_categories
+_PERIOD_STARTS = {
+    # Monday of the current week
+    'week': "date('now', 'localtime', '-6 days', 'weekday 1')",
+    'month': "date('now', 'localtime', 'start of month')",
+    'year': "date('now', 'localtime', 'start of year')",
+}
+_SQL_EXPENSE_BY_CATEGORY = {
+    period: sys.intern(
+        "SELECT c.name as category, s.amount as amount FROM ("
+        "SELECT category_id, SUM(amount) as amount FROM finance_transactions "
+        "WHERE user_id = ? AND type = 'expense' "
+        f"AND date BETWEEN {start} AND date('now', 'localtime') "
+        "GROUP BY category_id) s "
+        "JOIN finance_categories c ON c.id = s.category_id ORDER BY s.amount DESC"
+    )
+    for period, start in _PERIOD_STARTS.items()
+}
+
+# Filtered queries, one variant per combination of optional filters, keyed
+# by the bitmask _filter_mask computes from the filter values
+_SQL_FILTERED_TRANSACTIONS = _filter_variants(
+    "SELECT t.id, t.user_id, t.title, t.amount, t.date, t.type, "
+    "t.category_id, c.name as category_name, t.description "
+    "FROM finance_transactions t JOIN finance_categories c ON t.category_id = c.id "
+    "WHERE t.user_id = ?",
+    ("AND t.date >= ?", "AND t.date <= ?", "AND t.category_id = ?", "AND t.type = ?"),
+    "ORDER BY t.date DESC, t.id DESC"
+)
+_SQL_DAILY_TREND = _filter_variants(
+    "SELECT date, SUM(amount) as amount FROM finance_transactions "
+    "WHERE user_id = ? AND date BETWEEN ? AND ?",
+    ("AND category_id = ?", "AND type = ?"),
+    "GROUP BY date ORDER BY date"
+)
+_SQL_MONTHLY_TREND = _filter_variants(
+    "SELECT substr(date, 1, 7) as ym, "
+    "SUM(CASE WHEN type = 'income' THEN amount ELSE 0 END) as income, "
+    "SUM(CASE WHEN type = 'expense' THEN amount ELSE 0 END) as expense "
+    "FROM finance_transactions WHERE user_id = ? AND date BETWEEN ? AND ?",
+    ("AND category_id = ?", "AND type = ?"),
+    "GROUP BY ym"
+)
+
+def _month_span(start_year, start_month, end_year, end_month):
+    """List the (year, month) pairs from one month to another, inclusive
+    
+    Months are counted as year * 12 + month - 1, so rolling over any number
+    of year boundaries needs no special cases.
+    
+    Args:
+        start_year (int): Year of the first month
+        start_month (int): First month (1-12)
+        end_year (int): Year of the last month
+        end_month (int): Last month (1-12)
+        
+    Returns:
+        list: (year, month) tuples in chronological order
+    """
+    start = start_year * 12 + start_month - 1
+    end = end_year * 12 + end_month - 1
+    return [(index // 12, index % 12 + 1) for index in range(start, end + 1)]
+
 class FinanceService:
     """Service for managing financial data"""
     
@@ -28,8 +238,42 @@ class FinanceService:
         if not db_path:
             db_path = os.path.join(os.path.expanduser("~"), '.persian_life_manager', 'database.db')
         
-        self.db_manager = DatabaseManager(db_path)
+        # One connection per thread for every FinanceService on this database
+        self.db_manager = DatabaseManager.shared(db_path)
         self.user_id = user_id
+        
+        self._summary_key = (db_path, user_id)
+        
+        # Category rows per (user_id, category_type) with the time they were
+        # read (monotonic clock); cleared whenever a category is changed
+        self._category_cache = {}
+        
+        self._ensure_indexes()
+    
+    def _ensure_indexes(self):
+        """Create the finance indexes if they do not exist yet
+        
+        Each index is created on its own so a failure only skips that index.
+        Duplicate category names left by older versions are merged by
+        DatabaseManager's schema migration before the unique index is built.
+        Statistics are refreshed with ANALYZE whenever an index was added.
+        """
+        conn = self.db_manager.get_persistent_connection()
+        existing = {row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index'")}
+        
+        created = False
+        for name, statement in _FINANCE_INDEXES:
+            if name in existing:
+                continue
+            try:
+                conn.execute(statement)
+                created = True
+            except sqlite3.Error as e:
+                logger.warning(f"Could not create finance index {name}: {str(e)}")
+        
+        if created:
+            conn.execute("ANALYZE")
     
     def get_categories(self, category_type=None):
         """Get categories for the user
@@ -41,23 +285,21 @@ class FinanceService:
             list: List of Category objects
         """
         try:
-            if category_type:
-                query = """
-                    SELECT id, user_id, name, type
-                    FROM finance_categories
-                    WHERE user_id = ? AND (type = ? OR type = 'both')
-                    ORDER BY name
-                """
-                results = self.db_manager.execute_query(query, (self.user_id, category_type))
+            key = (self.user_id, category_type)
+            cached = self._category_cache.get(key)
+            if cached is not None and time.monotonic() - cached[0] < _CATEGORY_CACHE_TTL:
+                results = cached[1]
             else:
-                query = """
-                    SELECT id, user_id, name, type
-                    FROM finance_categories
-                    WHERE user_id = ?
-                    ORDER BY name
-                """
-                results = self.db_manager.execute_query(query, (self.user_id,))
+                if category_type:
+                    results = self.db_manager.execute_query(
+                        _SQL_CATEGORIES_TYPED, (self.user_id, category_type)
+                    )
+                else:
+                    results = self.db_manager.execute_query(_SQL_CATEGORIES, (self.user_id,))
+                
+                self._category_cache[key] = (time.monotonic(), results)
             
+            # Fresh objects every call, so callers can edit them freely
             categories = []
             for row in results:
                 category = Category(
@@ -87,25 +329,19 @@ class FinanceService:
             if category.type not in ['expense', 'income', 'both']:
                 raise ValueError("Invalid category type. Must be 'expense', 'income', or 'both'.")
             
-            # Check if category with same name already exists
-            query = "SELECT id FROM finance_categories WHERE user_id = ? AND name = ?"
-            results = self.db_manager.execute_query(query, (self.user_id, category.name))
-            
-            if results:
-                raise ValueError(f"Category '{category.name}' already exists.")
-            
-            # Add the category
-            query = """
-                INSERT INTO finance_categories (user_id, name, type, created_at)
-                VALUES (?, ?, ?, ?)
-            """
-            
+            # Add the category; a name the user already has is skipped and
+            # comes back without a row
             now = datetime.now().isoformat()
-            category_id = self.db_manager.execute_insert(
-                query, (self.user_id, category.name, category.type, now)
+            results = self.db_manager.execute_query(
+                _SQL_INSERT_CATEGORY, (self.user_id, category.name, category.type, now)
             )
             
+            if not results:
+                raise ValueError(f"Category '{category.name}' already exists.")
+            
+            category_id = results[0]['id']
             category.id = category_id
+            self._category_cache.clear()
             return category_id
         except Exception as e:
             logger.error(f"Error adding category: {str(e)}")
@@ -125,25 +361,23 @@ class FinanceService:
             if category.type not in ['expense', 'income', 'both']:
                 raise ValueError("Invalid category type. Must be 'expense', 'income', or 'both'.")
             
-            # Check if category exists
-            query = "SELECT id FROM finance_categories WHERE id = ? AND user_id = ?"
-            results = self.db_manager.execute_query(query, (category.id, self.user_id))
+            # Update the category; nothing changes if it is not the user's or
+            # the new name is taken, and only then is it looked up again to
+            # tell the two apart
+            try:
+                result = self.db_manager.execute_update(
+                    _SQL_UPDATE_CATEGORY, (category.name, category.type, category.id, self.user_id)
+                )
+            except sqlite3.IntegrityError:
+                raise ValueError(f"Category '{category.name}' already exists.")
             
-            if not results:
+            if result == 0:
+                if self.db_manager.execute_query(_SQL_CATEGORY_EXISTS, (category.id, self.user_id)):
+                    raise ValueError(f"Category '{category.name}' already exists.")
                 raise ValueError(f"Category with ID {category.id} not found.")
             
-            # Update the category
-            query = """
-                UPDATE finance_categories
-                SET name = ?, type = ?
-                WHERE id = ? AND user_id = ?
-            """
-            
-            result = self.db_manager.execute_update(
-                query, (category.name, category.type, category.id, self.user_id)
-            )
-            
-            return result > 0
+            self._category_cache.clear()
+            return True
         except Exception as e:
             logger.error(f"Error updating category: {str(e)}")
             raise
@@ -157,69 +391,147 @@ class FinanceService:
         Returns:
             bool: True if deletion was successful
         """
-        try:
-            # Check if category exists
-            query = "SELECT id FROM finance_categories WHERE id = ? AND user_id = ?"
-            results = self.db_manager.execute_query(query, (category_id, self.user_id))
-            
-            if not results:
-                raise ValueError(f"Category with ID {category_id} not found.")
-            
-            # Delete associated transactions
-            query = "DELETE FROM finance_transactions WHERE category_id = ? AND user_id = ?"
-            self.db_manager.execute_update(query, (category_id, self.user_id))
-            
-            # Delete the category
-            query = "DELETE FROM finance_categories WHERE id = ? AND user_id = ?"
-            result = self.db_manager.execute_update(query, (category_id, self.user_id))
+        return self.delete_categories([category_id])
+    
+    def delete_categories(self, category_ids):
+        """Delete several categories and their associated transactions
+        
+        Each table is cleared with a single DELETE, all in one transaction.
+        If any of the categories does not exist nothing is deleted.
+        
+        Args:
+            category_ids (list): IDs of the categories to delete
             
-            return result > 0
+        Returns:
+            bool: True if deletion was successful
+        """
+        try:
+            ids = list(dict.fromkeys(category_ids))
+            if not ids:
+                return True
+            
+            placeholders = ", ".join("?" * len(ids))
+            params = (self.user_id, *ids)
+            
+            # The cascade commits (or rolls back) as a whole
+            with self.db_manager.transaction("IMMEDIATE"):
+                # Delete associated transactions
+                self.db_manager.execute_update(
+                    "DELETE FROM finance_transactions "
+                    f"WHERE user_id = ? AND category_id IN ({placeholders})", params
+                )
+                
+                # Delete the categories; if any does not exist the rollback
+                # leaves everything else alone as well
+                deleted = self.db_manager.execute_query(
+                    "DELETE FROM finance_categories "
+                    f"WHERE user_id = ? AND id IN ({placeholders}) RETURNING id", params
+                )
+                
+                if len(deleted) != len(ids):
+                    found = {row['id'] for row in deleted}
+                    missing = next(i for i in ids if i not in found)
+                    raise ValueError(f"Category with ID {missing} not found.")
+            
+            self._category_cache.clear()
+            self._invalidate_summary()
+            return True
         except Exception as e:
             logger.error(f"Error deleting category: {str(e)}")
             raise
     
-    def get_transactions(self, limit=None, offset=0):
+    def _invalidate_summary(self, date=None):
+        """Drop cached monthly summaries after transactions changed
+        
+        Args:
+            date (str, optional): Date (YYYY-MM-DD) of the only transaction
+                affected; if None every month of this user is dropped
+        """
+        if date:
+            _summary_cache.pop(self._summary_key + (date[:7],), None)
+            return
+        for key in list(_summary_cache):
+            if key[:2] == self._summary_key:
+                _summary_cache.pop(key, None)
+    
+    def _category_error(self, category_id, transaction_type):
+        """Explain why a category was rejected for a transaction
+        
+        Only called after a guarded write matched nothing, to keep the
+        error messages specific.
+        
+        Args:
+            category_id (int): Category ID the transaction referred to
+            transaction_type (str): Transaction type (expense or income)
+            
+        Returns:
+            ValueError: The error to raise
+        """
+        results = self.db_manager.execute_query(_SQL_CATEGORY_TYPE, (category_id, self.user_id))
+        
+        if not results:
+            return ValueError(f"Category with ID {category_id} not found.")
+        
+        category_type = results[0]['type']
+        return ValueError(f"Category type '{category_type}' does not match transaction type '{transaction_type}'.")
+    
+    def _transactions_query(self, limit, offset, after_date, after_id):
+        """Pick the transaction listing query and its parameters
+        
+        Returns:
+            tuple: (query, params)
+        """
+        if limit and after_date is not None and after_id is not None:
+            return _SQL_TRANSACTIONS_AFTER, (self.user_id, after_date, after_id, limit)
+        if limit:
+            return _SQL_TRANSACTIONS_PAGE, (self.user_id, limit, offset)
+        return _SQL_TRANSACTIONS, (self.user_id,)
+    
+    def get_transactions(self, limit=None, offset=0, after_date=None, after_id=None):
         """Get transactions for the user
         
+        For paging through long histories pass the date and id of the last
+        transaction of the previous page as after_date/after_id; each page is
+        then a direct index seek instead of skipping `offset` rows.
+        
         Args:
             limit (int, optional): Maximum number of transactions to return
             offset (int, optional): Offset for pagination
+            after_date (str, optional): Date of the last transaction already seen
+            after_id (int, optional): ID of the last transaction already seen
             
         Returns:
             list: List of Transaction objects
         """
         try:
-            query = """
-                SELECT t.id, t.user_id, t.category_id, t.title, t.amount, t.type, 
-                       t.date, t.description, c.name as category_name
-                FROM finance_transactions t
-                JOIN finance_categories c ON t.category_id = c.id
-                WHERE t.user_id = ?
-                ORDER BY t.date DESC, t.id DESC
-            """
-            
-            if limit:
-                query += " LIMIT ? OFFSET ?"
-                results = self.db_manager.execute_query(query, (self.user_id, limit, offset))
-            else:
-                results = self.db_manager.execute_query(query, (self.user_id,))
+            query, params = self._transactions_query(limit, offset, after_date, after_id)
             
-            transactions = []
-            for row in results:
-                transaction = Transaction(
-                    id=row['id'],
-                    user_id=row['user_id'],
-                    title=row['title'],
-                    amount=row['amount'],
-                    date=row['date'],
-                    type=row['type'],
-                    category_id=row['category_id'],
-                    category_name=row['category_name'],
-                    description=row['description']
-                )
-                transactions.append(transaction)
+            # Objects are built while rows stream in, never holding both at once
+            return list(map(Transaction._from_row, self.db_manager.execute_query_iter(query, params)))
+        except Exception as e:
+            logger.error(f"Error getting transactions: {str(e)}")
+            return []
+    
+    def get_transactions_fast(self, limit=None, offset=0, after_date=None, after_id=None):
+        """Get transactions for the user as plain tuples
+        
+        Same rows as get_transactions, but no Transaction objects are built.
+        Meant for read-only callers such as table views that only display
+        the values.
+        
+        Args:
+            limit (int, optional): Maximum number of transactions to return
+            offset (int, optional): Offset for pagination
+            after_date (str, optional): Date of the last transaction already seen
+            after_id (int, optional): ID of the last transaction already seen
             
-            return transactions
+        Returns:
+            list: Tuples of (id, user_id, title, amount, date, type,
+                category_id, category_name, description)
+        """
+        try:
+            query, params = self._transactions_query(limit, offset, after_date, after_id)
+            return list(self.db_manager.execute_query_iter(query, params))
         except Exception as e:
             logger.error(f"Error getting transactions: {str(e)}")
             return []
@@ -242,39 +554,95 @@ class FinanceService:
             if transaction.amount <= 0:
                 raise ValueError("Transaction amount must be positive.")
             
-            # Check if category exists
-            query = "SELECT id, type FROM finance_categories WHERE id = ? AND user_id = ?"
-            results = self.db_manager.execute_query(query, (transaction.category_id, self.user_id))
+            # Add the transaction; the insert only happens if the category
+            # belongs to the user and accepts this transaction type
+            now = datetime.now().isoformat()
+            results = self.db_manager.execute_query(
+                _SQL_INSERT_TRANSACTION, (
+                    self.user_id, transaction.category_id, transaction.title,
+                    transaction.amount, transaction.type, transaction.date,
+                    transaction.description, now,
+                    transaction.category_id, self.user_id, transaction.type
+                )
+            )
             
             if not results:
-                raise ValueError(f"Category with ID {transaction.category_id} not found.")
+                raise self._category_error(transaction.category_id, transaction.type)
             
-            # Check if category type matches transaction type
-            category_type = results[0]['type']
-            if category_type != 'both' and category_type != transaction.type:
-                raise ValueError(f"Category type '{category_type}' does not match transaction type '{transaction.type}'.")
+            transaction_id = results[0]['id']
+            transaction.id = transaction_id
+            self._invalidate_summary(transaction.date)
+            return transaction_id
+        except Exception as e:
+            logger.error(f"Error adding transaction: {str(e)}")
+            raise
+    
+    def add_transactions(self, transactions, return_ids=False):
+        """Add many transactions at once, e.g. for an import
+        
+        Everything is validated first (categories with a single query), then
+        all rows are inserted in one transaction, so either all are added or
+        none are.
+        
+        Args:
+            transactions (iterable): Transaction objects to add
+            return_ids (bool, optional): Whether to collect the new IDs and set
+                them on the objects; skipping this allows a single executemany
             
-            # Add the transaction
-            query = """
-                INSERT INTO finance_transactions (
-                    user_id, category_id, title, amount, type, date, description, created_at
+        Returns:
+            int or list: Number of transactions added, or their IDs if return_ids is set
+        """
+        try:
+            transactions = list(transactions)
+            if not transactions:
+                return [] if return_ids else 0
+            
+            for transaction in transactions:
+                if transaction.type not in ['expense', 'income']:
+                    raise ValueError("Invalid transaction type. Must be 'expense' or 'income'.")
+                if transaction.amount <= 0:
+                    raise ValueError("Transaction amount must be positive.")
+            
+            # Check every referenced category in one query
+            ids = {transaction.category_id for transaction in transactions}
+            placeholders = ", ".join("?" * len(ids))
+            category_types = {
+                row['id']: row['type'] for row in self.db_manager.execute_fetchall(
+                    f"SELECT id, type FROM finance_categories WHERE user_id = ? AND id IN ({placeholders})",
+                    (self.user_id, *ids)
                 )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """
+            }
+            
+            for transaction in transactions:
+                category_type = category_types.get(transaction.category_id)
+                if category_type is None:
+                    raise ValueError(f"Category with ID {transaction.category_id} not found.")
+                if category_type != 'both' and category_type != transaction.type:
+                    raise ValueError(f"Category type '{category_type}' does not match transaction type '{transaction.type}'.")
             
             now = datetime.now().isoformat()
-            transaction_id = self.db_manager.execute_insert(
-                query, (
+            rows = [
+                (
                     self.user_id, transaction.category_id, transaction.title,
                     transaction.amount, transaction.type, transaction.date,
                     transaction.description, now
                 )
-            )
+                for transaction in transactions
+            ]
             
-            transaction.id = transaction_id
-            return transaction_id
+            transaction_ids = []
+            with self.db_manager.transaction("IMMEDIATE"):
+                if not return_ids:
+                    self.db_manager.execute_batch(_SQL_INSERT_TRANSACTION_ROW, rows)
+                else:
+                    for transaction, row in zip(transactions, rows):
+                        transaction.id = self.db_manager.execute_insert(_SQL_INSERT_TRANSACTION_ROW, row)
+                        transaction_ids.append(transaction.id)
+            
+            self._invalidate_summary()
+            return transaction_ids if return_ids else len(rows)
         except Exception as e:
-            logger.error(f"Error adding transaction: {str(e)}")
+            logger.error(f"Error adding transactions: {str(e)}")
             raise
     
     def update_transaction(self, transaction):
@@ -295,41 +663,26 @@ class FinanceService:
             if transaction.amount <= 0:
                 raise ValueError("Transaction amount must be positive.")
             
-            # Check if transaction exists
-            query = "SELECT id FROM finance_transactions WHERE id = ? AND user_id = ?"
-            results = self.db_manager.execute_query(query, (transaction.id, self.user_id))
-            
-            if not results:
-                raise ValueError(f"Transaction with ID {transaction.id} not found.")
-            
-            # Check if category exists
-            query = "SELECT id, type FROM finance_categories WHERE id = ? AND user_id = ?"
-            results = self.db_manager.execute_query(query, (transaction.category_id, self.user_id))
-            
-            if not results:
-                raise ValueError(f"Category with ID {transaction.category_id} not found.")
-            
-            # Check if category type matches transaction type
-            category_type = results[0]['type']
-            if category_type != 'both' and category_type != transaction.type:
-                raise ValueError(f"Category type '{category_type}' does not match transaction type '{transaction.type}'.")
-            
-            # Update the transaction
-            query = """
-                UPDATE finance_transactions
-                SET category_id = ?, title = ?, amount = ?, type = ?, date = ?, description = ?
-                WHERE id = ? AND user_id = ?
-            """
-            
+            # Update the transaction; nothing changes unless it belongs to the
+            # user and the category belongs to the user and accepts this type
             result = self.db_manager.execute_update(
-                query, (
+                _SQL_UPDATE_TRANSACTION, (
                     transaction.category_id, transaction.title, transaction.amount,
                     transaction.type, transaction.date, transaction.description,
-                    transaction.id, self.user_id
+                    transaction.id, self.user_id,
+                    transaction.category_id, self.user_id, transaction.type
                 )
             )
             
-            return result > 0
+            if result == 0:
+                # Work out which condition failed only on the error path
+                if not self.db_manager.execute_exists(_SQL_TRANSACTION_EXISTS, (transaction.id, self.user_id)):
+                    raise ValueError(f"Transaction with ID {transaction.id} not found.")
+                raise self._category_error(transaction.category_id, transaction.type)
+            
+            # The old date is unknown here, so every month is dropped
+            self._invalidate_summary()
+            return True
         except Exception as e:
             logger.error(f"Error updating transaction: {str(e)}")
             raise
@@ -344,22 +697,39 @@ class FinanceService:
             bool: True if deletion was successful
         """
         try:
-            # Check if transaction exists
-            query = "SELECT id FROM finance_transactions WHERE id = ? AND user_id = ?"
-            results = self.db_manager.execute_query(query, (transaction_id, self.user_id))
+            # Delete the transaction; the user filter doubles as the existence check
+            result = self.db_manager.execute_update(_SQL_DELETE_TRANSACTION, (transaction_id, self.user_id))
             
-            if not results:
+            if result == 0:
                 raise ValueError(f"Transaction with ID {transaction_id} not found.")
             
-            # Delete the transaction
-            query = "DELETE FROM finance_transactions WHERE id = ? AND user_id = ?"
-            result = self.db_manager.execute_update(query, (transaction_id, self.user_id))
-            
-            return result > 0
+            self._invalidate_summary()
+            return True
         except Exception as e:
             logger.error(f"Error deleting transaction: {str(e)}")
             raise
     
+    def iter_filtered_transactions(self, from_date=None, to_date=None, category_id=None, transaction_type=None):
+        """Iterate over filtered transactions without building a list
+        
+        Rows are streamed from the database in batches, so callers such as
+        exports can process any number of transactions in constant memory.
+        Database errors are raised while iterating.
+        
+        Args:
+            from_date (str, optional): Start date (YYYY-MM-DD)
+            to_date (str, optional): End date (YYYY-MM-DD)
+            category_id (int, optional): Filter by category ID
+            transaction_type (str, optional): Filter by transaction type (expense or income)
+            
+        Returns:
+            iterator: Iterator of Transaction objects, newest first
+        """
+        filters = (from_date, to_date, category_id, transaction_type)
+        query = _SQL_FILTERED_TRANSACTIONS[_filter_mask(filters)]
+        params = (self.user_id, *[value for value in filters if value])
+        return map(Transaction._from_row, self.db_manager.execute_query_iter(query, params))
+    
     def get_filtered_transactions(self, from_date=None, to_date=None, category_id=None, transaction_type=None):
         """Get filtered transactions
         
@@ -373,54 +743,7 @@ class FinanceService:
             list: List of Transaction objects
         """
         try:
-            query_parts = [
-                """
-                SELECT t.id, t.user_id, t.category_id, t.title, t.amount, t.type, 
-                       t.date, t.description, c.name as category_name
-                FROM finance_transactions t
-                JOIN finance_categories c ON t.category_id = c.id
-                WHERE t.user_id = ?
-                """
-            ]
-            params = [self.user_id]
-            
-            if from_date:
-                query_parts.append("AND t.date >= ?")
-                params.append(from_date)
-            
-            if to_date:
-                query_parts.append("AND t.date <= ?")
-                params.append(to_date)
-            
-            if category_id:
-                query_parts.append("AND t.category_id = ?")
-                params.append(category_id)
-            
-            if transaction_type:
-                query_parts.append("AND t.type = ?")
-                params.append(transaction_type)
-            
-            query_parts.append("ORDER BY t.date DESC, t.id DESC")
-            
-            query = " ".join(query_parts)
-            results = self.db_manager.execute_query(query, tuple(params))
-            
-            transactions = []
-            for row in results:
-                transaction = Transaction(
-                    id=row['id'],
-                    user_id=row['user_id'],
-                    title=row['title'],
-                    amount=row['amount'],
-                    date=row['date'],
-                    type=row['type'],
-                    category_id=row['category_id'],
-                    category_name=row['category_name'],
-                    description=row['description']
-                )
-                transactions.append(transaction)
-            
-            return transactions
+            return list(self.iter_filtered_transactions(from_date, to_date, category_id, transaction_type))
         except Exception as e:
             logger.error(f"Error getting filtered transactions: {str(e)}")
             return []
@@ -432,23 +755,10 @@ class FinanceService:
             dict: Dictionary with total_income, total_expenses, and balance
         """
         try:
-            # Get total income
-            query = """
-                SELECT SUM(amount) as total
-                FROM finance_transactions
-                WHERE user_id = ? AND type = 'income'
-            """
-            income_result = self.db_manager.execute_query(query, (self.user_id,))
-            total_income = income_result[0]['total'] if income_result[0]['total'] else 0
-            
-            # Get total expenses
-            query = """
-                SELECT SUM(amount) as total
-                FROM finance_transactions
-                WHERE user_id = ? AND type = 'expense'
-            """
-            expense_result = self.db_manager.execute_query(query, (self.user_id,))
-            total_expenses = expense_result[0]['total'] if expense_result[0]['total'] else 0
+            # Get total income and expenses in one pass
+            result = self.db_manager.execute_query(_SQL_BALANCE, (self.user_id,))
+            total_income = result[0]['income'] or 0
+            total_expenses = result[0]['expense'] or 0
             
             # Calculate balance
             balance = total_income - total_expenses
@@ -473,42 +783,24 @@ class FinanceService:
             dict: Dictionary with income and expense totals
         """
         try:
-            # Get current month date range
-            today = datetime.now()
-            first_day = today.replace(day=1).strftime("%Y-%m-%d")
+            key = self._summary_key + (datetime.now().strftime("%Y-%m"),)
+            cached = _summary_cache.get(key)
+            if cached is not None and time.monotonic() - cached[0] < _SUMMARY_CACHE_TTL:
+                return dict(cached[1])
             
-            # Get last day of month
-            if today.month == 12:
-                last_day = today.replace(year=today.year + 1, month=1, day=1) - timedelta(days=1)
-            else:
-                last_day = today.replace(month=today.month + 1, day=1) - timedelta(days=1)
-            
-            last_day = last_day.strftime("%Y-%m-%d")
-            
-            # Query for income
-            income_query = """
-                SELECT SUM(amount) as total
-                FROM finance_transactions
-                WHERE user_id = ? AND type = 'income' AND date BETWEEN ? AND ?
-            """
-            income_result = self.db_manager.execute_query(income_query, (self.user_id, first_day, last_day))
-            
-            # Query for expenses
-            expense_query = """
-                SELECT SUM(amount) as total
-                FROM finance_transactions
-                WHERE user_id = ? AND type = 'expense' AND date BETWEEN ? AND ?
-            """
-            expense_result = self.db_manager.execute_query(expense_query, (self.user_id, first_day, last_day))
+            # Query for income and expenses together; SQLite supplies the month bounds
+            result = self.db_manager.execute_query(_SQL_CURRENT_MONTH_TOTALS, (self.user_id,))
             
             # Get totals
-            income_total = income_result[0]['total'] if income_result[0]['total'] else 0
-            expense_total = expense_result[0]['total'] if expense_result[0]['total'] else 0
+            income_total = result[0]['income'] or 0
+            expense_total = result[0]['expense'] or 0
             
-            return {
+            summary = {
                 'income': income_total,
                 'expense': expense_total
             }
+            _summary_cache[key] = (time.monotonic(), summary)
+            return dict(summary)
         except Exception as e:
             logger.error(f"Error getting monthly summary: {str(e)}")
             return {'income': 0, 'expense': 0}
@@ -523,34 +815,13 @@ class FinanceService:
             list: List of dictionaries with category and amount
         """
         try:
-            # Determine date range based on period
-            today = datetime.now()
-            
-            if period == 'week':
-                # Start of the week (considering Monday as the first day)
-                start_date = (today - timedelta(days=today.weekday())).strftime("%Y-%m-%d")
-            elif period == 'month':
-                # Start of the month
-                start_date = today.replace(day=1).strftime("%Y-%m-%d")
-            elif period == 'year':
-                # Start of the year
-                start_date = today.replace(month=1, day=1).strftime("%Y-%m-%d")
-            else:
+            # The date range (period start through today) is part of the query
+            query = _SQL_EXPENSE_BY_CATEGORY.get(period)
+            if query is None:
                 raise ValueError(f"Invalid period: {period}")
             
-            end_date = today.strftime("%Y-%m-%d")
-            
             # Query for expenses by category
-            query = """
-                SELECT c.name as category, SUM(t.amount) as amount
-                FROM finance_transactions t
-                JOIN finance_categories c ON t.category_id = c.id
-                WHERE t.user_id = ? AND t.type = 'expense' AND t.date BETWEEN ? AND ?
-                GROUP BY t.category_id
-                ORDER BY amount DESC
-            """
-            
-            results = self.db_manager.execute_query(query, (self.user_id, start_date, end_date))
+            results = self.db_manager.execute_query(query, (self.user_id,))
             
             # Format results
             categories = []
@@ -575,55 +846,31 @@ class FinanceService:
             list: List of dictionaries with month, income, and expense
         """
         try:
-            # Generate list of months
+            # Generate list of months, ending with the current one
             today = datetime.now()
-            months_data = []
+            month_list = _month_span(today.year, today.month - months + 1, today.year, today.month)
             
-            for i in range(months - 1, -1, -1):
-                # Calculate month
-                if today.month - i <= 0:
-                    year = today.year - 1
-                    month = today.month - i + 12
-                else:
-                    year = today.year
-                    month = today.month - i
-                
-                # Get first and last day of month
-                first_day = datetime(year, month, 1).strftime("%Y-%m-%d")
-                
-                # Get last day of month
-                if month == 12:
-                    last_day = datetime(year + 1, 1, 1) - timedelta(days=1)
-                else:
-                    last_day = datetime(year, month + 1, 1) - timedelta(days=1)
-                
-                last_day = last_day.strftime("%Y-%m-%d")
-                
-                # Query for income
-                income_query = """
-                    SELECT SUM(amount) as total
-                    FROM finance_transactions
-                    WHERE user_id = ? AND type = 'income' AND date BETWEEN ? AND ?
-                """
-                income_result = self.db_manager.execute_query(income_query, (self.user_id, first_day, last_day))
-                
-                # Query for expenses
-                expense_query = """
-                    SELECT SUM(amount) as total
-                    FROM finance_transactions
-                    WHERE user_id = ? AND type = 'expense' AND date BETWEEN ? AND ?
-                """
-                expense_result = self.db_manager.execute_query(expense_query, (self.user_id, first_day, last_day))
-                
-                # Get totals
-                income_total = income_result[0]['total'] if income_result[0]['total'] else 0
-                expense_total = expense_result[0]['total'] if expense_result[0]['total'] else 0
-                
-                # Add to results
+            if not month_list:
+                return []
+            
+            # One grouped scan from the first day of the oldest month to the
+            # last day of the current one, instead of two queries per month
+            first_day = "%04d-%02d-01" % month_list[0]
+            last_day = "%04d-%02d-%02d" % (
+                today.year, today.month, calendar.monthrange(today.year, today.month)[1]
+            )
+            
+            results = self.db_manager.execute_query(_SQL_MONTH_TOTALS, (self.user_id, first_day, last_day))
+            totals = {row['ym']: row for row in results}
+            
+            # Months without transactions still appear, with zero totals
+            months_data = []
+            for year, month in month_list:
+                row = totals.get("%04d-%02d" % (year, month))
                 months_data.append({
                     'month': month,
-                    'income': income_total,
-                    'expense': expense_total
+                    'income': row['income'] if row else 0,
+                    'expense': row['expense'] if row else 0
                 })
             
             return months_data
@@ -644,27 +891,10 @@ class FinanceService:
             list: List of dictionaries with date and amount
         """
         try:
-            query_parts = [
-                """
-                SELECT date, SUM(amount) as amount
-                FROM finance_transactions
-                WHERE user_id = ? AND date BETWEEN ? AND ?
-                """
-            ]
-            params = [self.user_id, from_date, to_date]
-            
-            if category_id:
-                query_parts.append("AND category_id = ?")
-                params.append(category_id)
-            
-            if transaction_type:
-                query_parts.append("AND type = ?")
-                params.append(transaction_type)
-            
-            query_parts.append("GROUP BY date ORDER BY date")
-            
-            query = " ".join(query_parts)
-            results = self.db_manager.execute_query(query, tuple(params))
+            filters = (category_id, transaction_type)
+            query = _SQL_DAILY_TREND[_filter_mask(filters)]
+            params = (self.user_id, from_date, to_date, *[value for value in filters if value])
+            results = self.db_manager.execute_query(query, params)
             
             # Format results
             daily_data = []
@@ -696,78 +926,31 @@ class FinanceService:
             from_datetime = datetime.strptime(from_date, "%Y-%m-%d")
             to_datetime = datetime.strptime(to_date, "%Y-%m-%d")
             
+            # Sum every month in the range with one grouped query
+            filters = (category_id, transaction_type)
+            query = _SQL_MONTHLY_TREND[_filter_mask(filters)]
+            params = (
+                self.user_id, from_datetime.replace(day=1).strftime("%Y-%m-%d"), to_date,
+                *[value for value in filters if value]
+            )
+            results = self.db_manager.execute_query(query, params)
+            totals = {row['ym']: row for row in results}
+            
             # Generate list of months between dates
             months_data = []
-            current_date = from_datetime.replace(day=1)
             
-            while current_date <= to_datetime:
-                year = current_date.year
-                month = current_date.month
-                
-                # Get first and last day of month
-                first_day = current_date.strftime("%Y-%m-%d")
-                
-                # Get last day of month
-                if month == 12:
-                    last_day = datetime(year + 1, 1, 1) - timedelta(days=1)
-                else:
-                    last_day = datetime(year, month + 1, 1) - timedelta(days=1)
-                
-                last_day = min(last_day, to_datetime).strftime("%Y-%m-%d")
-                
-                # Base query parts
-                base_query_parts = [
-                    """
-                    SELECT SUM(amount) as total
-                    FROM finance_transactions
-                    WHERE user_id = ? AND date BETWEEN ? AND ?
-                    """
-                ]
-                base_params = [self.user_id, first_day, last_day]
-                
-                if category_id:
-                    base_query_parts.append("AND category_id = ?")
-                    base_params.append(category_id)
-                
-                # Query for income
-                if not transaction_type or transaction_type == 'income':
-                    income_query_parts = base_query_parts.copy()
-                    income_params = base_params.copy()
-                    
-                    income_query_parts.append("AND type = 'income'")
-                    
-                    income_query = " ".join(income_query_parts)
-                    income_result = self.db_manager.execute_query(income_query, tuple(income_params))
-                    income_total = income_result[0]['total'] if income_result[0]['total'] else 0
-                else:
-                    income_total = 0
-                
-                # Query for expenses
-                if not transaction_type or transaction_type == 'expense':
-                    expense_query_parts = base_query_parts.copy()
-                    expense_params = base_params.copy()
-                    
-                    expense_query_parts.append("AND type = 'expense'")
-                    
-                    expense_query = " ".join(expense_query_parts)
-                    expense_result = self.db_manager.execute_query(expense_query, tuple(expense_params))
-                    expense_total = expense_result[0]['total'] if expense_result[0]['total'] else 0
-                else:
-                    expense_total = 0
+            for year, month in _month_span(from_datetime.year, from_datetime.month,
+                                           to_datetime.year, to_datetime.month):
+                # Months without transactions still appear, with zero totals
+                row = totals.get("%04d-%02d" % (year, month))
                 
                 # Add to results
                 months_data.append({
                     'year': year,
                     'month': month,
-                    'income': income_total,
-                    'expense': expense_total
+                    'income': row['income'] if row else 0,
+                    'expense': row['expense'] if row else 0
                 })
-                
-                # Move to next month
-                if month == 12:
-                    current_date = current_date.replace(year=year + 1, month=1)
-                else:
-                    current_date = current_date.replace(month=month + 1)
             
             return months_data
         except Exception as e:
@@ -6,14 +6,326 @@ Health service for Persian Life Manager Application
 """
 
 import os
+import copy
 import logging
+import re
+import sqlite3
+import sys
+import time
 from datetime import datetime, timedelta
 
 from app.core.database import DatabaseManager
-from app.models.health import Exercise, HealthMetric, HealthGoal
+from app.models.health import Exercise, HealthMetric, HealthGoal, GoalType
 
 logger = logging.getLogger(__name__)
 
+# (name, statement) pairs; the listing and latest-row queries all order by
+# date DESC, id DESC, which these indexes return without a sort
+_HEALTH_INDEXES = (
+    ("idx_exercises_user_date",
+     "CREATE INDEX IF NOT EXISTS idx_exercises_user_date "
+     "ON health_exercises(user_id, date DESC, id DESC)"),
+    ("idx_metrics_user_date",
+     "CREATE INDEX IF NOT EXISTS idx_metrics_user_date "
+     "ON health_metrics(user_id, date DESC, id DESC)"),
+)
+
+# Row creation time, taken by SQLite in local time when the row is inserted
+_NOW_SQL = "strftime('%Y-%m-%dT%H:%M:%f', 'now', 'localtime')"
+
+# Fixed statements, interned once so every call hands sqlite3's statement
+# cache the very same string object. Listing queries select their columns
+# in model constructor order, for the positional _from_row classmethods.
+_SQL_EXERCISES = sys.intern(
+    "SELECT id, user_id, date, exercise_type, duration, calories_burned, notes "
+    "FROM health_exercises WHERE user_id = ? ORDER BY date DESC, id DESC"
+)
+_SQL_EXERCISES_LIMIT = sys.intern(_SQL_EXERCISES + " LIMIT ?")
+_SQL_INSERT_EXERCISE = sys.intern(
+    "INSERT INTO health_exercises "
+    "(user_id, exercise_type, duration, calories_burned, date, notes, created_at) "
+    "VALUES (?, ?, ?, ?, ?, ?, " + _NOW_SQL + ")"
+)
+_SQL_UPDATE_EXERCISE = sys.intern(
+    "UPDATE health_exercises SET exercise_type = ?, duration = ?, calories_burned = ?, "
+    "date = ?, notes = ? WHERE id = ? AND user_id = ?"
+)
+_SQL_DELETE_EXERCISE = sys.intern("DELETE FROM health_exercises WHERE id = ? AND user_id = ?")
+_SQL_WEEKLY_TOTALS = sys.intern(
+    "SELECT exercise_count, total_calories, total_duration FROM health_weekly_rollup "
+    "WHERE user_id = ? AND week_start = ?"
+)
+# One row per day from start to end inclusive, 0 on days without exercise
+_SQL_EXERCISE_TREND = sys.intern(
+    "WITH RECURSIVE days(day) AS ("
+    "SELECT ? UNION ALL SELECT date(day, '+1 day') FROM days WHERE day < ?) "
+    "SELECT days.day as date, COALESCE(SUM(e.duration), 0) as duration FROM days "
+    "LEFT JOIN health_exercises e ON e.user_id = ? AND e.date = days.day "
+    "GROUP BY days.day ORDER BY days.day"
+)
+
+_SQL_METRICS = sys.intern(
+    "SELECT id, user_id, date, weight, systolic, diastolic, heart_rate, sleep_hours, notes "
+    "FROM health_metrics WHERE user_id = ? ORDER BY date DESC, id DESC"
+)
+_SQL_METRICS_LIMIT = sys.intern(_SQL_METRICS + " LIMIT ?")
+# Read straight off idx_metrics_user_date; notes are left out since no
+# caller of the latest row shows them
+_SQL_LATEST_METRICS = sys.intern(
+    "SELECT id, user_id, date, weight, systolic, diastolic, heart_rate, sleep_hours "
+    "FROM health_metrics WHERE user_id = ? ORDER BY date DESC, id DESC LIMIT 1"
+)
+_SQL_LATEST_BLOOD_PRESSURE = sys.intern(
+    "SELECT systolic, diastolic FROM health_metrics "
+    "WHERE user_id = ? AND systolic IS NOT NULL AND diastolic IS NOT NULL "
+    "ORDER BY date DESC, id DESC LIMIT 1"
+)
+_SQL_INSERT_METRICS = sys.intern(
+    "INSERT INTO health_metrics "
+    "(user_id, date, weight, systolic, diastolic, heart_rate, sleep_hours, notes, created_at) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, " + _NOW_SQL + ")"
+)
+_SQL_UPDATE_METRICS = sys.intern(
+    "UPDATE health_metrics SET date = ?, weight = ?, systolic = ?, diastolic = ?, "
+    "heart_rate = ?, sleep_hours = ?, notes = ? WHERE id = ? AND user_id = ?"
+)
+_SQL_DELETE_METRICS = sys.intern("DELETE FROM health_metrics WHERE id = ? AND user_id = ?")
+_SQL_OLDEST_WEIGHT = sys.intern(
+    "SELECT weight FROM health_metrics WHERE user_id = ? AND weight IS NOT NULL "
+    "ORDER BY date ASC, id ASC LIMIT 1"
+)
+_SQL_LATEST_WEIGHT = sys.intern(
+    "SELECT weight FROM health_metrics WHERE user_id = ? AND weight IS NOT NULL "
+    "ORDER BY date DESC, id DESC LIMIT 1"
+)
+# Average over the 7 most recent readings
+_SQL_RECENT_SLEEP = sys.intern(
+    "SELECT AVG(sleep_hours) as avg_sleep FROM ("
+    "SELECT sleep_hours FROM health_metrics WHERE user_id = ? AND sleep_hours IS NOT NULL "
+    "ORDER BY date DESC, id DESC LIMIT 7)"
+)
+_SQL_WEIGHT_TREND = sys.intern(
+    "SELECT date, weight FROM health_metrics WHERE user_id = ? AND weight IS NOT NULL ORDER BY date"
+)
+
+_SQL_GOALS = sys.intern(
+    "SELECT id, user_id, goal_type, target_value, deadline, progress, notes "
+    "FROM health_goals WHERE user_id = ? ORDER BY deadline, id"
+)
+_SQL_INSERT_GOAL = sys.intern(
+    "INSERT INTO health_goals "
+    "(user_id, goal_type, target_value, deadline, progress, notes, created_at) "
+    "VALUES (?, ?, ?, ?, ?, ?, " + _NOW_SQL + ")"
+)
+_SQL_UPDATE_GOAL = sys.intern(
+    "UPDATE health_goals SET goal_type = ?, target_value = ?, deadline = ?, progress = ?, "
+    "notes = ? WHERE id = ? AND user_id = ?"
+)
+_SQL_DELETE_GOAL = sys.intern("DELETE FROM health_goals WHERE id = ? AND user_id = ?")
+# Progress is capped at 100 here, and rows whose stored progress is within
+# half a point are left alone so unchanged goals cost no write
+_SQL_UPDATE_GOAL_PROGRESS = sys.intern(
+    "UPDATE health_goals SET progress = MIN(100.0, ?1) WHERE id = ?2 AND user_id = ?3 "
+    "AND (progress IS NULL OR ABS(progress - MIN(100.0, ?1)) > 0.5)"
+)
+
+_SQL_TRIGGER_NAMES = sys.intern("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+
+# Latest metrics row and latest blood pressure reading, shared by every
+# HealthService in the process (the dashboard and the health page each have
+# their own instance), keyed by (db_path, user_id) and holding
+# (monotonic time, value). Metric writes through any instance drop the
+# user's entries; the TTL bounds how long outside writes can go unseen.
+_latest_metrics_cache = {}
+_latest_bp_cache = {}
+_LATEST_CACHE_TTL = 60.0
+
+# (db_path, user_id) keys whose stored goal progress is out of date. Exercise
+# and metric writes only mark the user here; progress is recomputed once on
+# the next goal read (or flush_goals), so a batch of writes costs one pass.
+_dirty_goals = set()
+
+# Monday of the week a date falls in, as SQLite computes it
+_WEEK_START_SQL = "date({0}, 'weekday 0', '-6 days')"
+
+# Per-user, per-week exercise totals, kept in step with health_exercises by
+# triggers so weekly reads are a single-row lookup instead of a range scan.
+# The final INSERT fills the table from existing exercises when it is new.
+_WEEKLY_ROLLUP_SCHEMA = """
+    BEGIN IMMEDIATE;
+    CREATE TABLE IF NOT EXISTS health_weekly_rollup (
+        user_id INTEGER NOT NULL,
+        week_start TEXT NOT NULL,
+        exercise_count INTEGER NOT NULL DEFAULT 0,
+        total_calories INTEGER NOT NULL DEFAULT 0,
+        total_duration INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (user_id, week_start)
+    );
+    CREATE TRIGGER IF NOT EXISTS trg_health_rollup_insert
+    AFTER INSERT ON health_exercises
+    WHEN {new_week} IS NOT NULL
+    BEGIN
+        INSERT INTO health_weekly_rollup (user_id, week_start, exercise_count, total_calories, total_duration)
+        VALUES (NEW.user_id, {new_week}, 1, COALESCE(NEW.calories_burned, 0), COALESCE(NEW.duration, 0))
+        ON CONFLICT (user_id, week_start) DO UPDATE SET
+            exercise_count = exercise_count + 1,
+            total_calories = total_calories + excluded.total_calories,
+            total_duration = total_duration + excluded.total_duration;
+    END;
+    CREATE TRIGGER IF NOT EXISTS trg_health_rollup_delete
+    AFTER DELETE ON health_exercises
+    BEGIN
+        UPDATE health_weekly_rollup SET
+            exercise_count = exercise_count - 1,
+            total_calories = total_calories - COALESCE(OLD.calories_burned, 0),
+            total_duration = total_duration - COALESCE(OLD.duration, 0)
+        WHERE user_id = OLD.user_id AND week_start = {old_week};
+        DELETE FROM health_weekly_rollup
+        WHERE user_id = OLD.user_id AND week_start = {old_week} AND exercise_count <= 0;
+    END;
+    CREATE TRIGGER IF NOT EXISTS trg_health_rollup_update
+    AFTER UPDATE OF user_id, date, duration, calories_burned ON health_exercises
+    BEGIN
+        UPDATE health_weekly_rollup SET
+            exercise_count = exercise_count - 1,
+            total_calories = total_calories - COALESCE(OLD.calories_burned, 0),
+            total_duration = total_duration - COALESCE(OLD.duration, 0)
+        WHERE user_id = OLD.user_id AND week_start = {old_week};
+        DELETE FROM health_weekly_rollup
+        WHERE user_id = OLD.user_id AND week_start = {old_week} AND exercise_count <= 0;
+        INSERT INTO health_weekly_rollup (user_id, week_start, exercise_count, total_calories, total_duration)
+        SELECT NEW.user_id, {new_week}, 1, COALESCE(NEW.calories_burned, 0), COALESCE(NEW.duration, 0)
+        WHERE {new_week} IS NOT NULL
+        ON CONFLICT (user_id, week_start) DO UPDATE SET
+            exercise_count = exercise_count + 1,
+            total_calories = total_calories + excluded.total_calories,
+            total_duration = total_duration + excluded.total_duration;
+    END;
+    INSERT INTO health_weekly_rollup (user_id, week_start, exercise_count, total_calories, total_duration)
+    SELECT user_id, {row_week} AS week, COUNT(*),
+           COALESCE(SUM(calories_burned), 0), COALESCE(SUM(duration), 0)
+    FROM health_exercises
+    WHERE {row_week} IS NOT NULL
+      AND NOT EXISTS (SELECT 1 FROM health_weekly_rollup)
+    GROUP BY user_id, week;
+    COMMIT;
+""".format(
+    new_week=_WEEK_START_SQL.format("NEW.date"),
+    old_week=_WEEK_START_SQL.format("OLD.date"),
+    row_week=_WEEK_START_SQL.format("date"),
+)
+
+# Validation rules per table as (condition on NEW, message), checked in
+# order before every insert and update. SQLite cannot add CHECK constraints
+# to an existing table, so they are enforced by triggers; the rejected write
+# raises sqlite3.IntegrityError carrying the message.
+_HEALTH_VALIDATIONS = (
+    ("health_exercises", (
+        ("NEW.duration <= 0", "Exercise duration must be positive."),
+        ("NEW.calories_burned < 0", "Calories burned cannot be negative."),
+    )),
+    ("health_metrics", (
+        ("NEW.weight < 0", "Weight must be positive."),
+        ("NEW.systolic AND NEW.diastolic AND NEW.systolic <= NEW.diastolic",
+         "Systolic pressure must be greater than diastolic pressure."),
+        ("NEW.heart_rate < 0", "Heart rate must be positive."),
+        ("NEW.sleep_hours < 0", "Sleep hours cannot be negative."),
+    )),
+    ("health_goals", (
+        ("NEW.target_value <= 0", "Goal target value must be positive."),
+    )),
+)
+
+
+def _validation_script():
+    """Build the script creating the BEFORE INSERT/UPDATE validation triggers"""
+    statements = ["BEGIN IMMEDIATE;"]
+    for table, rules in _HEALTH_VALIDATIONS:
+        checks = "".join(
+            f"SELECT RAISE(ABORT, '{message}') WHERE {condition}; "
+            for condition, message in rules
+        )
+        # Updates are only checked when a validated column is written, so
+        # e.g. progress updates never trip over an old row
+        columns = ", ".join(dict.fromkeys(re.findall(r"NEW\.(\w+)", checks)))
+        for event in ("INSERT", f"UPDATE OF {columns}"):
+            name = event.split()[0].lower()
+            statements.append(
+                f"CREATE TRIGGER IF NOT EXISTS trg_{table}_validate_{name} "
+                f"BEFORE {event} ON {table} BEGIN {checks}END;"
+            )
+    statements.append("COMMIT;")
+    return "\n".join(statements)
+
+
+# (trigger that marks the script as installed, script)
+_HEALTH_TRIGGER_SCRIPTS = (
+    ("trg_health_rollup_update", _WEEKLY_ROLLUP_SCHEMA),
+    ("trg_health_goals_validate_update", _validation_script()),
+)
+
+
+def _current_week():
+    """Get the bounds of the current week
+    
+    Returns:
+        tuple: (week_start, week_end), Monday and Sunday as YYYY-MM-DD
+    """
+    today = datetime.now().date()
+    week_start = today - timedelta(days=today.weekday())
+    return week_start.isoformat(), (week_start + timedelta(days=6)).isoformat()
+
+
+def _weight_progress(goal, context):
+    """Share of the way from the starting weight to the target weight"""
+    start_weight = context['start_weight']
+    current_weight = context['current_weight']
+    if start_weight is None or not current_weight:
+        return 0
+    
+    # Calculate how close we are to target
+    if start_weight > goal.target_value:  # Weight loss
+        weight_loss_needed = start_weight - goal.target_value
+        weight_loss_achieved = start_weight - current_weight
+        if weight_loss_needed > 0:
+            return (weight_loss_achieved / weight_loss_needed) * 100
+    else:  # Weight gain
+        weight_gain_needed = goal.target_value - start_weight
+        weight_gain_achieved = current_weight - start_weight
+        if weight_gain_needed > 0:
+            return (weight_gain_achieved / weight_gain_needed) * 100
+    return 0
+
+
+def _weekly_exercise_progress(goal, context):
+    """Exercise sessions this week against the target"""
+    return (context['weekly_exercises'] / goal.target_value) * 100
+
+
+def _weekly_calories_progress(goal, context):
+    """Calories burned this week against the target"""
+    if not context['weekly_calories']:
+        return 0
+    return (context['weekly_calories'] / goal.target_value) * 100
+
+
+def _daily_sleep_progress(goal, context):
+    """Recent average sleep against the target"""
+    if not context['avg_sleep']:
+        return 0
+    return (context['avg_sleep'] / goal.target_value) * 100
+
+
+# Progress calculation per goal type. Steps are not tracked, so step goals
+# (and unknown types) have no handler and keep their stored progress.
+_GOAL_PROGRESS_HANDLERS = {
+    GoalType.WEIGHT: _weight_progress,
+    GoalType.WEEKLY_EXERCISE: _weekly_exercise_progress,
+    GoalType.WEEKLY_CALORIES: _weekly_calories_progress,
+    GoalType.DAILY_SLEEP: _daily_sleep_progress,
+}
+
+
 class HealthService:
     """Service for managing health data"""
     
@@ -27,8 +339,70 @@ class HealthService:
         if not db_path:
             db_path = os.path.join(os.path.expanduser("~"), '.persian_life_manager', 'database.db')
         
-        self.db_manager = DatabaseManager(db_path)
+        # One connection per thread for every HealthService on this database
+        self.db_manager = DatabaseManager.shared(db_path)
         self.user_id = user_id
+        
+        self._cache_key = (db_path, user_id)
+        self._ensure_indexes()
+        self._ensure_triggers()
+        
+        # Writes of an earlier run may never have been followed by a recompute
+        _dirty_goals.add(self._cache_key)
+    
+    def _ensure_indexes(self):
+        """Create the health indexes if they do not exist yet
+        
+        Statistics are refreshed with ANALYZE whenever an index was added.
+        """
+        conn = self.db_manager.get_persistent_connection()
+        existing = {row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index'")}
+        
+        created = False
+        for name, statement in _HEALTH_INDEXES:
+            if name in existing:
+                continue
+            try:
+                conn.execute(statement)
+                created = True
+            except sqlite3.Error as e:
+                logger.warning(f"Could not create health index {name}: {str(e)}")
+        
+        if created:
+            conn.execute("ANALYZE")
+    
+    def _ensure_triggers(self):
+        """Create the weekly roll-up and the validation triggers if missing"""
+        existing = {row['name'] for row in self.db_manager.execute_query(_SQL_TRIGGER_NAMES)}
+        
+        for name, script in _HEALTH_TRIGGER_SCRIPTS:
+            if name in existing:
+                continue
+            try:
+                self.db_manager.execute_script(script)
+            except Exception as e:
+                # The script opens its own transaction, and the shared
+                # connection does not roll back for us; a failure part way
+                # would otherwise leave it holding the write lock
+                conn = self.db_manager.get_persistent_connection()
+                if conn.in_transaction:
+                    conn.rollback()
+                logger.warning(f"Could not create health triggers ({name}): {str(e)}")
+    
+    def _weekly_totals(self, week_start):
+        """Get the exercise totals of one week from the roll-up
+        
+        Args:
+            week_start (str): Monday of the week (YYYY-MM-DD)
+            
+        Returns:
+            tuple: (exercise_count, total_calories, total_duration)
+        """
+        result = self.db_manager.execute_query(_SQL_WEEKLY_TOTALS, (self.user_id, week_start))
+        if not result:
+            return 0, 0, 0
+        return result[0]['exercise_count'], result[0]['total_calories'], result[0]['total_duration']
     
     def get_exercises(self, limit=None):
         """Get exercises for the user
@@ -40,33 +414,12 @@ class HealthService:
             list: List of Exercise objects
         """
         try:
-            query = """
-                SELECT id, user_id, exercise_type, duration, calories_burned, date, notes
-                FROM health_exercises
-                WHERE user_id = ?
-                ORDER BY date DESC, id DESC
-            """
-            
             if limit:
-                query += " LIMIT ?"
-                results = self.db_manager.execute_query(query, (self.user_id, limit))
+                rows = self.db_manager.execute_query_iter(_SQL_EXERCISES_LIMIT, (self.user_id, limit))
             else:
-                results = self.db_manager.execute_query(query, (self.user_id,))
-            
-            exercises = []
-            for row in results:
-                exercise = Exercise(
-                    id=row['id'],
-                    user_id=row['user_id'],
-                    exercise_type=row['exercise_type'],
-                    duration=row['duration'],
-                    calories_burned=row['calories_burned'],
-                    date=row['date'],
-                    notes=row['notes']
-                )
-                exercises.append(exercise)
+                rows = self.db_manager.execute_query_iter(_SQL_EXERCISES, (self.user_id,))
             
-            return exercises
+            return list(map(Exercise._from_row, rows))
         except Exception as e:
             logger.error(f"Error getting exercises: {str(e)}")
             return []
@@ -81,38 +434,61 @@ class HealthService:
             int: The ID of the new exercise, or None if adding failed
         """
         try:
-            # Validate data
-            if exercise.duration <= 0:
-                raise ValueError("Exercise duration must be positive.")
-            
-            if exercise.calories_burned < 0:
-                raise ValueError("Calories burned cannot be negative.")
-            
-            # Add the exercise
-            query = """
-                INSERT INTO health_exercises (
-                    user_id, exercise_type, duration, calories_burned, date, notes, created_at
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """
-            
-            now = datetime.now().isoformat()
             exercise_id = self.db_manager.execute_insert(
-                query, (
+                _SQL_INSERT_EXERCISE, (
                     self.user_id, exercise.exercise_type, exercise.duration,
-                    exercise.calories_burned, exercise.date, exercise.notes, now
+                    exercise.calories_burned, exercise.date, exercise.notes
                 )
             )
             
-            # Update goals progress after adding exercise
-            self.update_goal_progress()
+            self._mark_goals_dirty()
             
             exercise.id = exercise_id
             return exercise_id
+        except sqlite3.IntegrityError as e:
+            # Rejected by a validation trigger; the message says why
+            logger.error(f"Error adding exercise: {str(e)}")
+            raise ValueError(str(e)) from e
         except Exception as e:
             logger.error(f"Error adding exercise: {str(e)}")
             raise
     
+    def add_exercises_bulk(self, exercises):
+        """Add many exercises at once, e.g. for an import
+        
+        All rows are inserted by one executemany in one transaction, so either
+        all are added or none are, and goal progress is recomputed once.
+        
+        Args:
+            exercises (iterable): Exercise objects to add
+        
+        Returns:
+            int: Number of exercises added
+        """
+        try:
+            rows = [
+                (
+                    self.user_id, exercise.exercise_type, exercise.duration,
+                    exercise.calories_burned, exercise.date, exercise.notes
+                )
+                for exercise in exercises
+            ]
+            if not rows:
+                return 0
+        
+            with self.db_manager.transaction("IMMEDIATE"):
+                self.db_manager.execute_batch(_SQL_INSERT_EXERCISE, rows)
+        
+            self._mark_goals_dirty()
+            return len(rows)
+        except sqlite3.IntegrityError as e:
+            # Rejected by a validation trigger; the message says why
+            logger.error(f"Error adding exercises: {str(e)}")
+            raise ValueError(str(e)) from e
+        except Exception as e:
+            logger.error(f"Error adding exercises: {str(e)}")
+            raise
+    
     def update_exercise(self, exercise):
         """Update an exercise
         
@@ -123,38 +499,24 @@ class HealthService:
             bool: True if update was successful
         """
         try:
-            # Validate data
-            if exercise.duration <= 0:
-                raise ValueError("Exercise duration must be positive.")
-            
-            if exercise.calories_burned < 0:
-                raise ValueError("Calories burned cannot be negative.")
-            
-            # Check if exercise exists
-            query = "SELECT id FROM health_exercises WHERE id = ? AND user_id = ?"
-            results = self.db_manager.execute_query(query, (exercise.id, self.user_id))
-            
-            if not results:
-                raise ValueError(f"Exercise with ID {exercise.id} not found.")
-            
-            # Update the exercise
-            query = """
-                UPDATE health_exercises
-                SET exercise_type = ?, duration = ?, calories_burned = ?, date = ?, notes = ?
-                WHERE id = ? AND user_id = ?
-            """
-            
             result = self.db_manager.execute_update(
-                query, (
+                _SQL_UPDATE_EXERCISE, (
                     exercise.exercise_type, exercise.duration, exercise.calories_burned,
                     exercise.date, exercise.notes, exercise.id, self.user_id
                 )
             )
             
-            # Update goals progress after updating exercise
-            self.update_goal_progress()
+            # Nothing matched: the exercise does not exist or is not the user's
+            if result == 0:
+                raise ValueError(f"Exercise with ID {exercise.id} not found.")
+            
+            self._mark_goals_dirty()
             
-            return result > 0
+            return True
+        except sqlite3.IntegrityError as e:
+            # Rejected by a validation trigger; the message says why
+            logger.error(f"Error updating exercise: {str(e)}")
+            raise ValueError(str(e)) from e
         except Exception as e:
             logger.error(f"Error updating exercise: {str(e)}")
             raise
@@ -169,21 +531,14 @@ class HealthService:
             bool: True if deletion was successful
         """
         try:
-            # Check if exercise exists
-            query = "SELECT id FROM health_exercises WHERE id = ? AND user_id = ?"
-            results = self.db_manager.execute_query(query, (exercise_id, self.user_id))
+            result = self.db_manager.execute_update(_SQL_DELETE_EXERCISE, (exercise_id, self.user_id))
             
-            if not results:
+            if result == 0:
                 raise ValueError(f"Exercise with ID {exercise_id} not found.")
             
-            # Delete the exercise
-            query = "DELETE FROM health_exercises WHERE id = ? AND user_id = ?"
-            result = self.db_manager.execute_update(query, (exercise_id, self.user_id))
+            self._mark_goals_dirty()
             
-            # Update goals progress after deleting exercise
-            self.update_goal_progress()
-            
-            return result > 0
+            return True
         except Exception as e:
             logger.error(f"Error deleting exercise: {str(e)}")
             raise
@@ -198,35 +553,12 @@ class HealthService:
             list: List of HealthMetric objects
         """
         try:
-            query = """
-                SELECT id, user_id, date, weight, systolic, diastolic, heart_rate, sleep_hours, notes
-                FROM health_metrics
-                WHERE user_id = ?
-                ORDER BY date DESC, id DESC
-            """
-            
             if limit:
-                query += " LIMIT ?"
-                results = self.db_manager.execute_query(query, (self.user_id, limit))
+                rows = self.db_manager.execute_query_iter(_SQL_METRICS_LIMIT, (self.user_id, limit))
             else:
-                results = self.db_manager.execute_query(query, (self.user_id,))
-            
-            metrics = []
-            for row in results:
-                metric = HealthMetric(
-                    id=row['id'],
-                    user_id=row['user_id'],
-                    date=row['date'],
-                    weight=row['weight'],
-                    systolic=row['systolic'],
-                    diastolic=row['diastolic'],
-                    heart_rate=row['heart_rate'],
-                    sleep_hours=row['sleep_hours'],
-                    notes=row['notes']
-                )
-                metrics.append(metric)
+                rows = self.db_manager.execute_query_iter(_SQL_METRICS, (self.user_id,))
             
-            return metrics
+            return list(map(HealthMetric._from_row, rows))
         except Exception as e:
             logger.error(f"Error getting health metrics: {str(e)}")
             return []
@@ -234,18 +566,33 @@ class HealthService:
     def get_latest_metrics(self):
         """Get the most recent health metrics for the user
         
+        The returned object carries every measurement but not the notes.
+        
         Returns:
             HealthMetric: The most recent health metric, or None if not found
         """
         try:
-            metrics = self.get_metrics(limit=1)
-            if metrics:
-                return metrics[0]
-            return None
+            cached = _latest_metrics_cache.get(self._cache_key)
+            if cached is None or time.monotonic() - cached[0] >= _LATEST_CACHE_TTL:
+                rows = list(self.db_manager.execute_query_iter(_SQL_LATEST_METRICS, (self.user_id,)))
+                
+                # Columns are in constructor order, up to the missing notes
+                latest = HealthMetric(*rows[0]) if rows else None
+                
+                cached = (time.monotonic(), latest)
+                _latest_metrics_cache[self._cache_key] = cached
+            
+            # A copy, so callers can edit it without touching the cache
+            return copy.copy(cached[1])
         except Exception as e:
             logger.error(f"Error getting latest metrics: {str(e)}")
             return None
     
+    def _invalidate_latest(self):
+        """Drop the cached latest metrics after health metrics changed"""
+        _latest_metrics_cache.pop(self._cache_key, None)
+        _latest_bp_cache.pop(self._cache_key, None)
+    
     def add_metrics(self, metrics):
         """Add new health metrics
         
@@ -256,41 +603,22 @@ class HealthService:
             int: The ID of the new metrics, or None if adding failed
         """
         try:
-            # Validate data
-            if metrics.weight and metrics.weight <= 0:
-                raise ValueError("Weight must be positive.")
-            
-            if metrics.systolic and metrics.diastolic and metrics.systolic <= metrics.diastolic:
-                raise ValueError("Systolic pressure must be greater than diastolic pressure.")
-            
-            if metrics.heart_rate and metrics.heart_rate <= 0:
-                raise ValueError("Heart rate must be positive.")
-            
-            if metrics.sleep_hours and metrics.sleep_hours < 0:
-                raise ValueError("Sleep hours cannot be negative.")
-            
-            # Add the metrics
-            query = """
-                INSERT INTO health_metrics (
-                    user_id, date, weight, systolic, diastolic, heart_rate, sleep_hours, notes, created_at
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """
-            
-            now = datetime.now().isoformat()
             metrics_id = self.db_manager.execute_insert(
-                query, (
+                _SQL_INSERT_METRICS, (
                     self.user_id, metrics.date, metrics.weight, metrics.systolic,
                     metrics.diastolic, metrics.heart_rate, metrics.sleep_hours,
-                    metrics.notes, now
+                    metrics.notes
                 )
             )
             
-            # Update goals progress after adding metrics
-            self.update_goal_progress()
-            
+            self._mark_goals_dirty()
+            self._invalidate_latest()
             metrics.id = metrics_id
             return metrics_id
+        except sqlite3.IntegrityError as e:
+            # Rejected by a validation trigger; the message says why
+            logger.error(f"Error adding health metrics: {str(e)}")
+            raise ValueError(str(e)) from e
         except Exception as e:
             logger.error(f"Error adding health metrics: {str(e)}")
             raise
@@ -305,45 +633,25 @@ class HealthService:
             bool: True if update was successful
         """
         try:
-            # Validate data
-            if metrics.weight and metrics.weight <= 0:
-                raise ValueError("Weight must be positive.")
-            
-            if metrics.systolic and metrics.diastolic and metrics.systolic <= metrics.diastolic:
-                raise ValueError("Systolic pressure must be greater than diastolic pressure.")
-            
-            if metrics.heart_rate and metrics.heart_rate <= 0:
-                raise ValueError("Heart rate must be positive.")
-            
-            if metrics.sleep_hours and metrics.sleep_hours < 0:
-                raise ValueError("Sleep hours cannot be negative.")
-            
-            # Check if metrics exists
-            query = "SELECT id FROM health_metrics WHERE id = ? AND user_id = ?"
-            results = self.db_manager.execute_query(query, (metrics.id, self.user_id))
-            
-            if not results:
-                raise ValueError(f"Health metrics with ID {metrics.id} not found.")
-            
-            # Update the metrics
-            query = """
-                UPDATE health_metrics
-                SET date = ?, weight = ?, systolic = ?, diastolic = ?, heart_rate = ?, sleep_hours = ?, notes = ?
-                WHERE id = ? AND user_id = ?
-            """
-            
             result = self.db_manager.execute_update(
-                query, (
+                _SQL_UPDATE_METRICS, (
                     metrics.date, metrics.weight, metrics.systolic, metrics.diastolic,
                     metrics.heart_rate, metrics.sleep_hours, metrics.notes,
                     metrics.id, self.user_id
                 )
             )
             
-            # Update goals progress after updating metrics
-            self.update_goal_progress()
+            # Nothing matched: the metrics do not exist or are not the user's
+            if result == 0:
+                raise ValueError(f"Health metrics with ID {metrics.id} not found.")
             
-            return result > 0
+            self._mark_goals_dirty()
+            self._invalidate_latest()
+            return True
+        except sqlite3.IntegrityError as e:
+            # Rejected by a validation trigger; the message says why
+            logger.error(f"Error updating health metrics: {str(e)}")
+            raise ValueError(str(e)) from e
         except Exception as e:
             logger.error(f"Error updating health metrics: {str(e)}")
             raise
@@ -358,55 +666,56 @@ class HealthService:
             bool: True if deletion was successful
         """
         try:
-            # Check if metrics exists
-            query = "SELECT id FROM health_metrics WHERE id = ? AND user_id = ?"
-            results = self.db_manager.execute_query(query, (metric_id, self.user_id))
+            result = self.db_manager.execute_update(_SQL_DELETE_METRICS, (metric_id, self.user_id))
             
-            if not results:
+            if result == 0:
                 raise ValueError(f"Health metrics with ID {metric_id} not found.")
             
-            # Delete the metrics
-            query = "DELETE FROM health_metrics WHERE id = ? AND user_id = ?"
-            result = self.db_manager.execute_update(query, (metric_id, self.user_id))
-            
-            # Update goals progress after deleting metrics
-            self.update_goal_progress()
-            
-            return result > 0
+            self._mark_goals_dirty()
+            self._invalidate_latest()
+            return True
         except Exception as e:
             logger.error(f"Error deleting health metrics: {str(e)}")
             raise
     
+    def _mark_goals_dirty(self):
+        """Flag the user's goal progress for recompute on the next read"""
+        _dirty_goals.add(self._cache_key)
+    
+    def goals_stale(self):
+        """Check whether exercise or metric writes left goal progress stale
+        
+        Returns:
+            bool: True if progress must be recomputed before it is read
+        """
+        return self._cache_key in _dirty_goals
+    
+    def mark_goals_current(self):
+        """Clear the stale flag of the user's goal progress"""
+        _dirty_goals.discard(self._cache_key)
+    
+    def flush_goals(self):
+        """Recompute goal progress now if exercise or metric writes are pending
+        
+        Call after a batch import when the stored progress must be current
+        without going through get_goals.
+        """
+        if self.goals_stale():
+            self.update_goal_progress()
+    
     def get_goals(self):
         """Get health goals for the user
         
+        Progress left stale by earlier writes is recomputed first.
+        
         Returns:
             list: List of HealthGoal objects
         """
         try:
-            query = """
-                SELECT id, user_id, goal_type, target_value, deadline, progress, notes
-                FROM health_goals
-                WHERE user_id = ?
-                ORDER BY deadline, id
-            """
-            
-            results = self.db_manager.execute_query(query, (self.user_id,))
-            
-            goals = []
-            for row in results:
-                goal = HealthGoal(
-                    id=row['id'],
-                    user_id=row['user_id'],
-                    goal_type=row['goal_type'],
-                    target_value=row['target_value'],
-                    deadline=row['deadline'],
-                    progress=row['progress'],
-                    notes=row['notes']
-                )
-                goals.append(goal)
+            self.flush_goals()
+            rows = self.db_manager.execute_query_iter(_SQL_GOALS, (self.user_id,))
             
-            return goals
+            return list(map(HealthGoal._from_row, rows))
         except Exception as e:
             logger.error(f"Error getting health goals: {str(e)}")
             return []
@@ -421,31 +730,24 @@ class HealthService:
             int: The ID of the new goal, or None if adding failed
         """
         try:
-            # Validate data
-            if goal.target_value <= 0:
-                raise ValueError("Goal target value must be positive.")
-            
-            # Add the goal
-            query = """
-                INSERT INTO health_goals (
-                    user_id, goal_type, target_value, deadline, progress, notes, created_at
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """
-            
-            now = datetime.now().isoformat()
-            goal_id = self.db_manager.execute_insert(
-                query, (
-                    self.user_id, goal.goal_type, goal.target_value,
-                    goal.deadline, goal.progress, goal.notes, now
+            # The write and the goal recompute commit together
+            with self.db_manager.transaction("IMMEDIATE"):
+                goal_id = self.db_manager.execute_insert(
+                    _SQL_INSERT_GOAL, (
+                        self.user_id, goal.goal_type, goal.target_value,
+                        goal.deadline, goal.progress, goal.notes
+                    )
                 )
-            )
-            
-            # Update this goal's progress based on current data
-            goal.id = goal_id
-            self.update_specific_goal_progress(goal)
+                
+                # Update this goal's progress based on current data
+                goal.id = goal_id
+                self.update_specific_goal_progress(goal)
             
             return goal_id
+        except sqlite3.IntegrityError as e:
+            # Rejected by a validation trigger; the message says why
+            logger.error(f"Error adding health goal: {str(e)}")
+            raise ValueError(str(e)) from e
         except Exception as e:
             logger.error(f"Error adding health goal: {str(e)}")
             raise
@@ -460,32 +762,23 @@ class HealthService:
             bool: True if update was successful
         """
         try:
-            # Validate data
-            if goal.target_value <= 0:
-                raise ValueError("Goal target value must be positive.")
-            
-            # Check if goal exists
-            query = "SELECT id FROM health_goals WHERE id = ? AND user_id = ?"
-            results = self.db_manager.execute_query(query, (goal.id, self.user_id))
-            
-            if not results:
-                raise ValueError(f"Health goal with ID {goal.id} not found.")
-            
             # Update the goal
-            query = """
-                UPDATE health_goals
-                SET goal_type = ?, target_value = ?, deadline = ?, progress = ?, notes = ?
-                WHERE id = ? AND user_id = ?
-            """
-            
             result = self.db_manager.execute_update(
-                query, (
+                _SQL_UPDATE_GOAL, (
                     goal.goal_type, goal.target_value, goal.deadline,
                     goal.progress, goal.notes, goal.id, self.user_id
                 )
             )
             
-            return result > 0
+            # Nothing matched: the goal does not exist or is not the user's
+            if result == 0:
+                raise ValueError(f"Health goal with ID {goal.id} not found.")
+            
+            return True
+        except sqlite3.IntegrityError as e:
+            # Rejected by a validation trigger; the message says why
+            logger.error(f"Error updating health goal: {str(e)}")
+            raise ValueError(str(e)) from e
         except Exception as e:
             logger.error(f"Error updating health goal: {str(e)}")
             raise
@@ -500,140 +793,137 @@ class HealthService:
             bool: True if deletion was successful
         """
         try:
-            # Check if goal exists
-            query = "SELECT id FROM health_goals WHERE id = ? AND user_id = ?"
-            results = self.db_manager.execute_query(query, (goal_id, self.user_id))
+            # Delete the goal
+            result = self.db_manager.execute_update(_SQL_DELETE_GOAL, (goal_id, self.user_id))
             
-            if not results:
+            if result == 0:
                 raise ValueError(f"Health goal with ID {goal_id} not found.")
             
-            # Delete the goal
-            query = "DELETE FROM health_goals WHERE id = ? AND user_id = ?"
-            result = self.db_manager.execute_update(query, (goal_id, self.user_id))
-            
-            return result > 0
+            return True
         except Exception as e:
             logger.error(f"Error deleting health goal: {str(e)}")
             raise
     
     def update_goal_progress(self):
         """Update the progress of all health goals based on current data"""
+        # Cleared before reading the goals so get_goals does not recurse here
+        self.mark_goals_current()
         try:
             goals = self.get_goals()
-            for goal in goals:
-                self.update_specific_goal_progress(goal)
+            if not goals:
+                return
+            
+            # The data every goal type needs is read once for the whole batch
+            context = self.goal_context()
+            
+            self.save_goal_progress(
+                (goal.id, self.calculate_goal_progress(goal, context)) for goal in goals
+            )
         except Exception as e:
             logger.error(f"Error updating goal progress: {str(e)}")
     
-    def update_specific_goal_progress(self, goal):
+    def update_specific_goal_progress(self, goal, context=None):
         """Update the progress of a specific health goal
         
         Args:
             goal (HealthGoal): The goal to update
+            context (dict, optional): Data from goal_context, read if not given
         """
         try:
-            progress = 0
-            
-            # Calculate progress based on goal type
-            if goal.goal_type == "وزن":
-                # Get latest weight
-                latest_metrics = self.get_latest_metrics()
-                if latest_metrics and latest_metrics.weight:
-                    # Get the starting weight
-                    oldest_query = """
-                        SELECT weight
-                        FROM health_metrics
-                        WHERE user_id = ? AND weight IS NOT NULL
-                        ORDER BY date ASC
-                        LIMIT 1
-                    """
-                    oldest_result = self.db_manager.execute_query(oldest_query, (self.user_id,))
-                    
-                    if oldest_result:
-                        start_weight = oldest_result[0]['weight']
-                        current_weight = latest_metrics.weight
-                        
-                        # Calculate how close we are to target
-                        if start_weight > goal.target_value:  # Weight loss
-                            weight_loss_needed = start_weight - goal.target_value
-                            weight_loss_achieved = start_weight - current_weight
-                            if weight_loss_needed > 0:
-                                progress = min(100, (weight_loss_achieved / weight_loss_needed) * 100)
-                        else:  # Weight gain
-                            weight_gain_needed = goal.target_value - start_weight
-                            weight_gain_achieved = current_weight - start_weight
-                            if weight_gain_needed > 0:
-                                progress = min(100, (weight_gain_achieved / weight_gain_needed) * 100)
-            
-            elif goal.goal_type == "ورزش هفتگی":
-                # Count weekly exercise sessions
-                today = datetime.now().date()
-                week_start = today - timedelta(days=today.weekday())
-                week_end = week_start + timedelta(days=6)
-                
-                exercise_query = """
-                    SELECT COUNT(*) as count
-                    FROM health_exercises
-                    WHERE user_id = ? AND date BETWEEN ? AND ?
-                """
-                exercise_result = self.db_manager.execute_query(
-                    exercise_query, (self.user_id, week_start.isoformat(), week_end.isoformat())
-                )
-                
-                if exercise_result:
-                    weekly_exercises = exercise_result[0]['count']
-                    progress = min(100, (weekly_exercises / goal.target_value) * 100)
-            
-            elif goal.goal_type == "کالری مصرفی هفتگی":
-                # Calculate weekly calories burned
-                today = datetime.now().date()
-                week_start = today - timedelta(days=today.weekday())
-                week_end = week_start + timedelta(days=6)
-                
-                calories_query = """
-                    SELECT SUM(calories_burned) as total
-                    FROM health_exercises
-                    WHERE user_id = ? AND date BETWEEN ? AND ?
-                """
-                calories_result = self.db_manager.execute_query(
-                    calories_query, (self.user_id, week_start.isoformat(), week_end.isoformat())
-                )
-                
-                if calories_result and calories_result[0]['total']:
-                    weekly_calories = calories_result[0]['total']
-                    progress = min(100, (weekly_calories / goal.target_value) * 100)
-            
-            elif goal.goal_type == "مدت خواب روزانه":
-                # Get average sleep hours from recent metrics
-                sleep_query = """
-                    SELECT AVG(sleep_hours) as avg_sleep
-                    FROM health_metrics
-                    WHERE user_id = ? AND sleep_hours IS NOT NULL
-                    ORDER BY date DESC
-                    LIMIT 7
-                """
-                sleep_result = self.db_manager.execute_query(sleep_query, (self.user_id,))
-                
-                if sleep_result and sleep_result[0]['avg_sleep']:
-                    avg_sleep = sleep_result[0]['avg_sleep']
-                    progress = min(100, (avg_sleep / goal.target_value) * 100)
-            
-            elif goal.goal_type == "تعداد قدم روزانه":
-                # This would require specific step tracking, which we're not directly implementing
-                # For now, we'll just leave the progress as it is
-                pass
+            if context is None:
+                context = self.goal_context()
+            progress = self.calculate_goal_progress(goal, context)
             
             # Update the goal progress in the database
             if progress > 0:
-                update_query = """
-                    UPDATE health_goals
-                    SET progress = ?
-                    WHERE id = ? AND user_id = ?
-                """
-                self.db_manager.execute_update(update_query, (progress, goal.id, self.user_id))
+                self.db_manager.execute_update(_SQL_UPDATE_GOAL_PROGRESS, (progress, goal.id, self.user_id))
         except Exception as e:
             logger.error(f"Error updating goal progress: {str(e)}")
     
+    def save_goal_progress(self, progress):
+        """Store calculated goal progress
+        
+        All goals are written by one executemany in one transaction; goals
+        whose progress could not be calculated (0) are left unchanged.
+        
+        Args:
+            progress (iterable): (goal_id, progress) pairs
+        """
+        updates = [
+            (value, goal_id, self.user_id)
+            for goal_id, value in progress
+            if value > 0
+        ]
+        if updates:
+            with self.db_manager.transaction("IMMEDIATE"):
+                self.db_manager.execute_batch(_SQL_UPDATE_GOAL_PROGRESS, updates)
+    
+    def get_weight_range(self):
+        """Get the user's first and latest recorded weight
+        
+        Returns:
+            dict: start_weight and current_weight (None if never recorded)
+        """
+        oldest_result = self.db_manager.execute_query(_SQL_OLDEST_WEIGHT, (self.user_id,))
+        latest_result = self.db_manager.execute_query(_SQL_LATEST_WEIGHT, (self.user_id,))
+        
+        return {
+            'start_weight': oldest_result[0]['weight'] if oldest_result else None,
+            'current_weight': latest_result[0]['weight'] if latest_result else None
+        }
+    
+    def get_week_activity(self):
+        """Get the exercise sessions and calories burned this week
+        
+        Returns:
+            dict: week_start, week_end, weekly_exercises and weekly_calories
+        """
+        week_start, week_end = _current_week()
+        weekly_exercises, weekly_calories, _ = self._weekly_totals(week_start)
+        
+        return {
+            'week_start': week_start,
+            'week_end': week_end,
+            'weekly_exercises': weekly_exercises,
+            'weekly_calories': weekly_calories
+        }
+    
+    def get_average_sleep(self):
+        """Get the average sleep hours over the 7 most recent readings
+        
+        Returns:
+            float: Average hours, or None if there are no readings
+        """
+        sleep_result = self.db_manager.execute_query(_SQL_RECENT_SLEEP, (self.user_id,))
+        return sleep_result[0]['avg_sleep'] if sleep_result else None
+    
+    def goal_context(self):
+        """Read the current data goal progress is calculated from
+        
+        Returns:
+            dict: start_weight, current_weight, week_start, week_end,
+                weekly_exercises, weekly_calories and avg_sleep (weights and
+                sleep may be None)
+        """
+        return {
+            **self.get_weight_range(),
+            **self.get_week_activity(),
+            'avg_sleep': self.get_average_sleep()
+        }
+    
+    def calculate_goal_progress(self, goal, context):
+        """Calculate the progress of a goal from pre-read data
+        
+        Args:
+            goal (HealthGoal): The goal
+            context (dict): Data returned by goal_context
+            
+        Returns:
+            float: Progress percentage (capped at 100 when stored), 0 if it cannot be calculated
+        """
+        handler = _GOAL_PROGRESS_HANDLERS.get(goal.goal_type_id)
+        return handler(goal, context) if handler else 0
+    
     def get_weekly_summary(self):
         """Get summary of health activities for the current week
         
@@ -641,52 +931,17 @@ class HealthService:
             dict: Dictionary with weekly health summary
         """
         try:
-            # Calculate date range for current week
-            today = datetime.now().date()
-            week_start = today - timedelta(days=today.weekday())
-            week_end = week_start + timedelta(days=6)
-            
-            # Count weekly exercises
-            exercise_query = """
-                SELECT COUNT(*) as count
-                FROM health_exercises
-                WHERE user_id = ? AND date BETWEEN ? AND ?
-            """
-            exercise_result = self.db_manager.execute_query(
-                exercise_query, (self.user_id, week_start.isoformat(), week_end.isoformat())
-            )
+            week_start, week_end = _current_week()
             
-            # Calculate total calories burned
-            calories_query = """
-                SELECT SUM(calories_burned) as total
-                FROM health_exercises
-                WHERE user_id = ? AND date BETWEEN ? AND ?
-            """
-            calories_result = self.db_manager.execute_query(
-                calories_query, (self.user_id, week_start.isoformat(), week_end.isoformat())
-            )
-            
-            # Get total exercise minutes
-            duration_query = """
-                SELECT SUM(duration) as total
-                FROM health_exercises
-                WHERE user_id = ? AND date BETWEEN ? AND ?
-            """
-            duration_result = self.db_manager.execute_query(
-                duration_query, (self.user_id, week_start.isoformat(), week_end.isoformat())
-            )
-            
-            # Get results
-            exercise_count = exercise_result[0]['count'] if exercise_result[0]['count'] else 0
-            calories_burned = calories_result[0]['total'] if calories_result[0]['total'] else 0
-            total_duration = duration_result[0]['total'] if duration_result[0]['total'] else 0
+            # Count, calories and minutes come from the week's roll-up row
+            exercise_count, calories_burned, total_duration = self._weekly_totals(week_start)
             
             return {
                 'exercise_count': exercise_count,
                 'calories_burned': calories_burned,
                 'total_duration': total_duration,
-                'week_start': week_start.isoformat(),
-                'week_end': week_end.isoformat()
+                'week_start': week_start,
+                'week_end': week_end
             }
         except Exception as e:
             logger.error(f"Error getting weekly summary: {str(e)}")
@@ -705,23 +960,21 @@ class HealthService:
             dict: Dictionary with systolic and diastolic values
         """
         try:
-            query = """
-                SELECT systolic, diastolic
-                FROM health_metrics
-                WHERE user_id = ? AND systolic IS NOT NULL AND diastolic IS NOT NULL
-                ORDER BY date DESC, id DESC
-                LIMIT 1
-            """
+            cached = _latest_bp_cache.get(self._cache_key)
+            if cached is not None and time.monotonic() - cached[0] < _LATEST_CACHE_TTL:
+                return dict(cached[1]) if cached[1] else None
             
-            result = self.db_manager.execute_query(query, (self.user_id,))
+            result = self.db_manager.execute_query(_SQL_LATEST_BLOOD_PRESSURE, (self.user_id,))
             
+            reading = None
             if result:
-                return {
+                reading = {
                     'systolic': result[0]['systolic'],
                     'diastolic': result[0]['diastolic']
                 }
             
-            return None
+            _latest_bp_cache[self._cache_key] = (time.monotonic(), reading)
+            return dict(reading) if reading else None
         except Exception as e:
             logger.error(f"Error getting latest blood pressure: {str(e)}")
             return None
@@ -733,23 +986,16 @@ class HealthService:
             days (int, optional): Number of days to include
             
         Returns:
-            list: List of dictionaries with date and duration
+            list: List of dictionaries with date and duration, one per day
+                (duration 0 on days without exercise)
         """
         try:
             # Calculate date range
             end_date = datetime.now().date()
             start_date = end_date - timedelta(days=days)
             
-            query = """
-                SELECT date, SUM(duration) as duration
-                FROM health_exercises
-                WHERE user_id = ? AND date BETWEEN ? AND ?
-                GROUP BY date
-                ORDER BY date
-            """
-            
             results = self.db_manager.execute_query(
-                query, (self.user_id, start_date.isoformat(), end_date.isoformat())
+                _SQL_EXERCISE_TREND, (start_date.isoformat(), end_date.isoformat(), self.user_id)
             )
             
             # Format results
@@ -772,14 +1018,7 @@ class HealthService:
             list: List of dictionaries with date and weight
         """
         try:
-            query = """
-                SELECT date, weight
-                FROM health_metrics
-                WHERE user_id = ? AND weight IS NOT NULL
-                ORDER BY date
-            """
-            
-            results = self.db_manager.execute_query(query, (self.user_id,))
+            results = self.db_manager.execute_query(_SQL_WEIGHT_TREND, (self.user_id,))
             
             # Format results
             trend_data = []
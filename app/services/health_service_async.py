@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Asynchronous health service for Persian Life Manager Application
+"""
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from app.services.health_service import HealthService
+
+logger = logging.getLogger(__name__)
+
+# Worker threads per service; enough for the concurrent goal progress reads
+MAX_WORKERS = 4
+
+
+class AsyncHealthService:
+    """Awaitable front end to HealthService
+    
+    Every call runs in one of the service's worker threads. The shared
+    DatabaseManager gives each thread its own connection, so independent
+    reads started together (e.g. the goal progress inputs) run on separate
+    connections and overlap under WAL instead of queueing on one connection.
+    Call close() when done so the workers' connections are closed.
+    """
+    
+    def __init__(self, user_id, db_path=None):
+        """Initialize the asynchronous health service
+        
+        Args:
+            user_id (int): User ID
+            db_path (str, optional): Path to the database file. If None, uses default path.
+        """
+        self._service = HealthService(user_id, db_path)
+        self.db_manager = self._service.db_manager
+        self.user_id = user_id
+        self._executor = ThreadPoolExecutor(
+            max_workers=MAX_WORKERS, thread_name_prefix="health"
+        )
+    
+    async def _run(self, func, *args):
+        """Run a blocking call in one of the service's worker threads
+        
+        Args:
+            func (callable): The call to run
+            *args: Its arguments
+        
+        Returns:
+            The call's result
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+    
+    def close(self):
+        """Close every worker's database connection and stop the workers"""
+        # Each task waits for all the others, so every worker runs exactly one
+        barrier = threading.Barrier(MAX_WORKERS)
+        
+        def close_connection():
+            self.db_manager.close()
+            barrier.wait()
+        
+        for _ in range(MAX_WORKERS):
+            self._executor.submit(close_connection)
+        self._executor.shutdown(wait=True)
+    
+    async def get_exercises(self, limit=None):
+        """Get exercises for the user
+        
+        Args:
+            limit (int, optional): Maximum number of exercises to return
+        
+        Returns:
+            list: List of Exercise objects
+        """
+        return await self._run(self._service.get_exercises, limit)
+    
+    async def add_exercise(self, exercise):
+        """Add a new exercise
+        
+        Args:
+            exercise (Exercise): The exercise to add
+        
+        Returns:
+            int: The ID of the new exercise
+        """
+        return await self._run(self._service.add_exercise, exercise)
+    
+    async def add_exercises_bulk(self, exercises):
+        """Add many exercises at once
+        
+        Args:
+            exercises (iterable): Exercise objects to add
+        
+        Returns:
+            int: Number of exercises added
+        """
+        return await self._run(self._service.add_exercises_bulk, list(exercises))
+    
+    async def get_metrics(self, limit=None):
+        """Get health metrics for the user
+        
+        Args:
+            limit (int, optional): Maximum number of metrics to return
+        
+        Returns:
+            list: List of HealthMetric objects
+        """
+        return await self._run(self._service.get_metrics, limit)
+    
+    async def get_latest_metrics(self):
+        """Get the latest health metrics
+        
+        Returns:
+            HealthMetric: The latest metrics, or None if there are none
+        """
+        return await self._run(self._service.get_latest_metrics)
+    
+    async def add_metrics(self, metrics):
+        """Add new health metrics
+        
+        Args:
+            metrics (HealthMetric): The health metrics to add
+        
+        Returns:
+            int: The ID of the new metrics
+        """
+        return await self._run(self._service.add_metrics, metrics)
+    
+    async def get_weekly_summary(self):
+        """Get summary of health activities for the current week
+        
+        Returns:
+            dict: Dictionary with weekly health summary
+        """
+        return await self._run(self._service.get_weekly_summary)
+    
+    async def get_goals(self):
+        """Get health goals for the user, recomputing stale progress first
+        
+        Returns:
+            list: List of HealthGoal objects
+        """
+        await self.flush_goals()
+        return await self._run(self._service.get_goals)
+    
+    async def flush_goals(self):
+        """Recompute goal progress now if exercise or metric writes are pending"""
+        if self._service.goals_stale():
+            await self.update_goal_progress()
+    
+    async def _goal_context(self):
+        """Read the goal progress inputs concurrently
+        
+        Returns:
+            dict: Same keys as HealthService.goal_context
+        """
+        weights, week, avg_sleep = await asyncio.gather(
+            self._run(self._service.get_weight_range),
+            self._run(self._service.get_week_activity),
+            self._run(self._service.get_average_sleep),
+        )
+        
+        return {**weights, **week, 'avg_sleep': avg_sleep}
+    
+    async def update_goal_progress(self):
+        """Update the progress of all health goals based on current data"""
+        # Cleared before reading the goals so get_goals does not recompute too
+        self._service.mark_goals_current()
+        try:
+            goals, context = await asyncio.gather(
+                self._run(self._service.get_goals),
+                self._goal_context(),
+            )
+            
+            progress = [
+                (goal.id, self._service.calculate_goal_progress(goal, context))
+                for goal in goals
+            ]
+            await self._run(self._service.save_goal_progress, progress)
+        except Exception as e:
+            logger.error(f"Error updating goal progress: {str(e)}")
@@ -9,27 +9,213 @@ to enable AI features even without OpenAI API access.
 
 import os
 import json
+import asyncio
 import logging
+import weakref
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+import httpx
 import requests
-from typing import Dict, List, Optional, Union, Any
+from requests.adapters import HTTPAdapter
+from typing import Dict, Iterator, List, Optional, Union, Any
+from urllib3.util.retry import Retry
+
+from app.services._response_cache import ResponseCache
+
+# orjson decodes large model responses faster; fall back to the standard
+# library when it is not installed. Both accept str and bytes.
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    orjson = None
+    _loads = json.loads
 
 logger = logging.getLogger(__name__)
 
+# Generated texts by request, so repeated questions skip the API
+_response_cache = ResponseCache()
+
+# Transient failures (connection errors, timeouts and these statuses) are
+# retried up to _MAX_RETRIES times, waiting _RETRY_BACKOFF * 2**n seconds
+# (at most _RETRY_BACKOFF_MAX) unless the response sends Retry-After
+_MAX_RETRIES = 3
+_RETRY_BACKOFF = 0.5
+_RETRY_BACKOFF_MAX = 8
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# One pooled async client per event loop; an httpx.AsyncClient must not be
+# shared across loops. query_many registers and closes its own client for
+# the private loop it runs in
+_async_clients = weakref.WeakKeyDictionary()
+
+
+# Base URL of the hosted inference API
+API_URL = "https://api-inference.huggingface.co/models"
+
+
+def _api_key_from_env() -> Optional[str]:
+    """Read the Hugging Face API key, the one source for all HF services
+    
+    Returns:
+        Optional[str]: HUGGINGFACE_API_KEY, or None if it is unset or a
+            dummy placeholder key
+    """
+    api_key = os.environ.get("HUGGINGFACE_API_KEY")
+    
+    # Check if the API key is valid (not a dummy key)
+    if api_key and (api_key.startswith("sk_dummy") or api_key.startswith("hf_dummy")):
+        logger.warning("Using dummy Hugging Face API key - AI features will be disabled")
+        return None
+    return api_key
+
+
+def _create_session() -> requests.Session:
+    """Create a pooled HTTP session for the Hugging Face API
+    
+    Keep-alive connections are reused across calls, so only the first
+    request to a host pays for the TCP and TLS handshakes. Connection
+    failures and transient statuses are retried with backoff.
+    
+    Returns:
+        requests.Session: The session
+    """
+    retry = Retry(
+        total=_MAX_RETRIES,
+        backoff_factor=_RETRY_BACKOFF,
+        backoff_max=_RETRY_BACKOFF_MAX,
+        status_forcelist=_RETRY_STATUSES,
+        allowed_methods=None,  # the inference API is all POSTs
+        respect_retry_after_header=True,
+        raise_on_status=False  # hand the last response to raise_for_status
+    )
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retry)
+    
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# Shared by every service instance and thread that calls the HTTP API
+_session = _create_session()
+
+# Seconds to wait for the API to connect or send data
+REQUEST_TIMEOUT = 60
+
+
+def _new_async_client() -> httpx.AsyncClient:
+    """Create a pooled async HTTP client
+    
+    Returns:
+        httpx.AsyncClient: A new client
+    """
+    return httpx.AsyncClient(
+        timeout=REQUEST_TIMEOUT,
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=16)
+    )
+
+
+def _get_async_client() -> httpx.AsyncClient:
+    """Get the pooled async HTTP client of the running event loop
+    
+    Returns:
+        httpx.AsyncClient: The client, created on first use in this loop
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = _new_async_client()
+        _async_clients[loop] = client
+    return client
+
+
+def _retry_delay(attempt: int, response: Optional[httpx.Response] = None) -> float:
+    """Seconds to wait before retrying a failed request
+    
+    Args:
+        attempt (int): Number of the failed attempt, from 0
+        response (httpx.Response, optional): The failed response, if one came
+        
+    Returns:
+        float: The Retry-After wait if the response gives one (at most
+            REQUEST_TIMEOUT), otherwise the exponential backoff
+    """
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after:
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            try:
+                delay = (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds()
+            except (TypeError, ValueError):
+                delay = None
+        if delay is not None:
+            return min(max(delay, 0.0), REQUEST_TIMEOUT)
+    return min(_RETRY_BACKOFF * 2 ** attempt, _RETRY_BACKOFF_MAX)
+
+
+async def _apost(url: str, **kwargs) -> httpx.Response:
+    """POST with the pooled async client, retrying transient failures
+    
+    The async counterpart of the session's urllib3 retries, with the same
+    limits, statuses and Retry-After handling.
+    
+    Args:
+        url (str): Request URL
+        **kwargs: Further httpx.AsyncClient.post arguments
+        
+    Returns:
+        httpx.Response: The last response, which may still be an error status
+    """
+    client = _get_async_client()
+    for attempt in range(_MAX_RETRIES + 1):
+        try:
+            response = await client.post(url, **kwargs)
+        except httpx.TransportError as e:
+            if attempt == _MAX_RETRIES:
+                raise
+            logger.warning(f"Retrying request after error: {str(e)}")
+            delay = _retry_delay(attempt)
+        else:
+            if attempt == _MAX_RETRIES or response.status_code not in _RETRY_STATUSES:
+                return response
+            logger.warning(f"Retrying request after HTTP {response.status_code}")
+            delay = _retry_delay(attempt, response)
+        await asyncio.sleep(delay)
+
+
+def _parse_generated(result: Any) -> str:
+    """Extract the generated text from a text-generation response
+    
+    Args:
+        result (Any): Decoded JSON response
+        
+    Returns:
+        str: The generated text
+    """
+    # Handle different response formats from different models
+    if isinstance(result, list) and len(result) > 0:
+        if "generated_text" in result[0]:
+            return result[0]["generated_text"]
+        else:
+            return str(result[0])
+    elif isinstance(result, dict) and "generated_text" in result:
+        return result["generated_text"]
+    else:
+        return str(result)
+
+
 class HuggingFaceService:
     """Service for interacting with Hugging Face API"""
     
     def __init__(self):
         """Initialize the Hugging Face Service"""
-        self.api_key = os.environ.get("HUGGINGFACE_API_KEY")
-        self.api_url = "https://api-inference.huggingface.co/models"
+        self.api_key = _api_key_from_env()
+        self.api_url = API_URL
         self.default_model = "mistralai/Mistral-7B-Instruct-v0.2"  # Good alternative to GPT models
         self.vision_model = "llava-hf/llava-1.5-7b-hf"  # For multimodal (text+image) tasks
         self.speech_model = "openai/whisper-large-v3"  # For speech to text
-        
-        # Check if the API key is valid (not a dummy key)
-        if self.api_key and (self.api_key.startswith("sk_dummy") or self.api_key.startswith("hf_dummy")):
-            logger.warning("Using dummy Hugging Face API key - AI features will be disabled")
-            self.api_key = None
     
     def is_available(self) -> bool:
         """Check if the Hugging Face API is available
@@ -61,6 +247,182 @@ class HuggingFaceService:
             logger.warning("Hugging Face API key not available - cannot query model")
             return None
         
+        url, headers, payload = self._model_request(prompt, model, system_prompt, max_tokens, temperature)
+        
+        cache_keys = _response_cache.keys_for(url, payload)
+        cached = _response_cache.get(cache_keys)
+        if cached is not None:
+            return cached
+        
+        try:
+            response = _session.post(url, headers=headers, json=payload, timeout=REQUEST_TIMEOUT)
+            response.raise_for_status()
+            
+            # Parse the response
+            text = _parse_generated(_loads(response.content))
+            _response_cache.set(cache_keys, text)
+            return text
+                
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Error querying Hugging Face model: {str(e)}")
+            return None
+        except Exception as e:
+            logger.error(f"Unexpected error in query_model: {str(e)}")
+            return None
+    
+    async def aquery_model(self, 
+                           prompt: str, 
+                           model: Optional[str] = None,
+                           system_prompt: Optional[str] = None,
+                           max_tokens: int = 800,
+                           temperature: float = 0.7) -> Optional[str]:
+        """Query the Hugging Face model without blocking the event loop
+        
+        Same arguments and result as query_model. Several calls can be awaited
+        together with asyncio.gather so their requests overlap.
+        
+        Args:
+            prompt (str): The user prompt
+            model (str, optional): Model to use. Defaults to None (will use default_model).
+            system_prompt (str, optional): System prompt for instruct models. Defaults to None.
+            max_tokens (int, optional): Maximum number of tokens to generate. Defaults to 800.
+            temperature (float, optional): Sampling temperature. Defaults to 0.7.
+            
+        Returns:
+            Optional[str]: The generated text, or None if an error occurred
+        """
+        if not self.is_available():
+            logger.warning("Hugging Face API key not available - cannot query model")
+            return None
+        
+        url, headers, payload = self._model_request(prompt, model, system_prompt, max_tokens, temperature)
+        
+        cache_keys = _response_cache.keys_for(url, payload)
+        cached = _response_cache.get(cache_keys)
+        if cached is not None:
+            return cached
+        
+        try:
+            response = await _apost(url, headers=headers, json=payload)
+            response.raise_for_status()
+            
+            text = _parse_generated(_loads(response.content))
+            _response_cache.set(cache_keys, text)
+            return text
+                
+        except httpx.HTTPError as e:
+            logger.error(f"Error querying Hugging Face model: {str(e)}")
+            return None
+        except Exception as e:
+            logger.error(f"Unexpected error in aquery_model: {str(e)}")
+            return None
+    
+    def query_many(self, prompts: List[str], **kwargs) -> List[Optional[str]]:
+        """Query the model with several prompts concurrently
+        
+        For synchronous callers; runs the requests in a private event loop
+        and waits for all of them.
+        
+        Args:
+            prompts (List[str]): The user prompts
+            **kwargs: Further query_model arguments, applied to every prompt
+            
+        Returns:
+            List[Optional[str]]: The generated texts, in prompt order
+        """
+        async def gather():
+            loop = asyncio.get_running_loop()
+            # The loop ends with this call, so close its client with it
+            async with _new_async_client() as client:
+                _async_clients[loop] = client
+                try:
+                    return await asyncio.gather(*(self.aquery_model(prompt, **kwargs) for prompt in prompts))
+                finally:
+                    _async_clients.pop(loop, None)
+        
+        return asyncio.run(gather())
+    
+    def stream_model(self, 
+                     prompt: str, 
+                     model: Optional[str] = None,
+                     system_prompt: Optional[str] = None,
+                     max_tokens: int = 800,
+                     temperature: float = 0.7) -> Iterator[str]:
+        """Query the Hugging Face model and yield the text as tokens arrive
+        
+        Same arguments as query_model. A cached answer is yielded whole;
+        otherwise the request asks for server-sent events and each token is
+        yielded as its event is read. Nothing is yielded if an error occurred
+        before the first token. Only a complete, non-empty answer is cached.
+        
+        Args:
+            prompt (str): The user prompt
+            model (str, optional): Model to use. Defaults to None (will use default_model).
+            system_prompt (str, optional): System prompt for instruct models. Defaults to None.
+            max_tokens (int, optional): Maximum number of tokens to generate. Defaults to 800.
+            temperature (float, optional): Sampling temperature. Defaults to 0.7.
+            
+        Yields:
+            str: Successive pieces of the generated text
+        """
+        if not self.is_available():
+            logger.warning("Hugging Face API key not available - cannot query model")
+            return
+        
+        url, headers, payload = self._model_request(prompt, model, system_prompt, max_tokens, temperature)
+        
+        # Keyed like query_model, so streamed and buffered calls share answers
+        cache_keys = _response_cache.keys_for(url, payload)
+        cached = _response_cache.get(cache_keys)
+        if cached is not None:
+            yield cached
+            return
+        
+        try:
+            with _session.post(url, headers=headers, json={**payload, "stream": True},
+                               stream=True, timeout=REQUEST_TIMEOUT) as response:
+                response.raise_for_status()
+                
+                parts = []
+                for line in response.iter_lines(decode_unicode=True):
+                    if not line or not line.startswith("data:"):
+                        continue
+                    event = _loads(line[5:])
+                    if event.get("error"):
+                        # The text so far is incomplete, so it is not cached
+                        logger.error(f"Error streaming from Hugging Face model: {event['error']}")
+                        return
+                    token = event.get("token") or {}
+                    if token.get("special"):
+                        continue
+                    piece = token.get("text") or ""
+                    if piece:
+                        parts.append(piece)
+                        yield piece
+                
+                # An empty stream (e.g. a plain JSON reply) must not be served
+                # to query_model as the answer
+                if parts:
+                    _response_cache.set(cache_keys, "".join(parts))
+                
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Error streaming from Hugging Face model: {str(e)}")
+        except Exception as e:
+            logger.error(f"Unexpected error in stream_model: {str(e)}")
+    
+    def _model_request(self, prompt, model, system_prompt, max_tokens, temperature):
+        """Build the URL, headers and payload of a text-generation request
+        
+        Args:
+            prompt (str): The user prompt
+            model (str): Model to use, or None for default_model
+            system_prompt (str): System prompt for instruct models, or None
+            max_tokens (int): Maximum number of tokens to generate
+            temperature (float): Sampling temperature
+            
+        Returns:
+            tuple: (url, headers, payload)
+        """
         model_id = model or self.default_model
         url = f"{self.api_url}/{model_id}"
         
@@ -94,30 +456,7 @@ class HuggingFaceService:
                 }
             }
         
-        try:
-            response = requests.post(url, headers=headers, json=payload)
-            response.raise_for_status()
-            
-            # Parse the response
-            result = response.json()
-            
-            # Handle different response formats from different models
-            if isinstance(result, list) and len(result) > 0:
-                if "generated_text" in result[0]:
-                    return result[0]["generated_text"]
-                else:
-                    return str(result[0])
-            elif isinstance(result, dict) and "generated_text" in result:
-                return result["generated_text"]
-            else:
-                return str(result)
-                
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Error querying Hugging Face model: {str(e)}")
-            return None
-        except Exception as e:
-            logger.error(f"Unexpected error in query_model: {str(e)}")
-            return None
+        return url, headers, payload
     
     def query_vision_model(self, 
                           prompt: str,
@@ -141,14 +480,6 @@ class HuggingFaceService:
         headers = {"Authorization": f"Bearer {self.api_key}"}
         
         try:
-            # Read the image file
-            with open(image_path, "rb") as image_file:
-                image_data = image_file.read()
-            
-            # Create a multipart/form-data request with both text and image
-            files = {
-                "file": image_data,
-            }
             data = {
                 "inputs": prompt,
                 "parameters": json.dumps({
@@ -157,22 +488,18 @@ class HuggingFaceService:
                 })
             }
             
-            response = requests.post(url, headers=headers, data=data, files=files)
+            # Create a multipart/form-data request with both text and image;
+            # the open file is handed over as is, so the image is not held
+            # in a separate buffer of our own
+            with open(image_path, "rb") as image_file:
+                files = {
+                    "file": image_file,
+                }
+                response = _session.post(url, headers=headers, data=data, files=files, timeout=REQUEST_TIMEOUT)
             response.raise_for_status()
             
             # Parse the response
-            result = response.json()
-            
-            # Handle different response formats
-            if isinstance(result, list) and len(result) > 0:
-                if "generated_text" in result[0]:
-                    return result[0]["generated_text"]
-                else:
-                    return str(result[0])
-            elif isinstance(result, dict) and "generated_text" in result:
-                return result["generated_text"]
-            else:
-                return str(result)
+            return _parse_generated(_loads(response.content))
                 
         except requests.exceptions.RequestException as e:
             logger.error(f"Error querying vision model: {str(e)}")
@@ -199,23 +526,21 @@ class HuggingFaceService:
         headers = {"Authorization": f"Bearer {self.api_key}"}
         
         try:
-            # Read the audio file
-            with open(audio_file_path, "rb") as audio_file:
-                audio_data = audio_file.read()
-            
-            # Create form-data with the audio file and language parameter
-            files = {
-                "file": audio_data,
-            }
+            # Create form-data with the audio file and language parameter;
+            # the open file is handed over as is, as in query_vision_model
             data = {
                 "language": language
             }
             
-            response = requests.post(url, headers=headers, data=data, files=files)
+            with open(audio_file_path, "rb") as audio_file:
+                files = {
+                    "file": audio_file,
+                }
+                response = _session.post(url, headers=headers, data=data, files=files, timeout=REQUEST_TIMEOUT)
             response.raise_for_status()
             
             # Parse the response
-            result = response.json()
+            result = _loads(response.content)
             
             # Extract the transcribed text
             if isinstance(result, dict) and "text" in result:
@@ -249,33 +574,9 @@ class HuggingFaceService:
             return None
         
         try:
-            # Format the conversation into a prompt for the model
-            prompt = ""
-            if system_message:
-                prompt += f"System: {system_message}\n\n"
-            
-            for message in messages:
-                role = message.get("role", "user")
-                content = message.get("content", "")
-                
-                # Format based on role
-                if role == "system":
-                    # System messages were already handled at the beginning
-                    continue
-                elif role == "user":
-                    prompt += f"Human: {content}\n"
-                elif role == "assistant":
-                    prompt += f"Assistant: {content}\n"
-                else:
-                    # Unknown role, skip
-                    continue
-            
-            # Add final prompt for the assistant
-            prompt += "Assistant: "
-            
             # Query the model
             return self.query_model(
-                prompt=prompt,
+                prompt=self._chat_prompt(messages, system_message),
                 model="mistralai/Mistral-7B-Instruct-v0.2",  # Mistral is great for conversation
                 max_tokens=max_tokens,
                 temperature=0.7
@@ -283,4 +584,89 @@ class HuggingFaceService:
                 
         except Exception as e:
             logger.error(f"Error in get_chat_response: {str(e)}")
-            return None
\ No newline at end of file
+            return None
+    
+    def stream_chat_response(self, 
+                             messages: List[Dict[str, str]],
+                             system_message: Optional[str] = None,
+                             max_tokens: int = 800) -> Iterator[str]:
+        """Get a response from the chat model, yielded as tokens arrive
+        
+        Args:
+            messages (List[Dict[str, str]]): List of message objects with role and content
+            system_message (str, optional): System message for the conversation. Defaults to None.
+            max_tokens (int, optional): Maximum tokens to generate. Defaults to 800.
+            
+        Yields:
+            str: Successive pieces of the response text
+        """
+        return self.stream_model(
+            prompt=self._chat_prompt(messages, system_message),
+            model="mistralai/Mistral-7B-Instruct-v0.2",
+            max_tokens=max_tokens,
+            temperature=0.7
+        )
+    
+    async def aget_chat_response(self, 
+                                 messages: List[Dict[str, str]],
+                                 system_message: Optional[str] = None,
+                                 max_tokens: int = 800) -> Optional[str]:
+        """Get a response from the chat model without blocking the event loop
+        
+        Args:
+            messages (List[Dict[str, str]]): List of message objects with role and content
+            system_message (str, optional): System message for the conversation. Defaults to None.
+            max_tokens (int, optional): Maximum tokens to generate. Defaults to 800.
+            
+        Returns:
+            Optional[str]: The response text, or None if an error occurred
+        """
+        if not self.is_available():
+            logger.warning("Hugging Face API key not available - cannot get chat response")
+            return None
+        
+        try:
+            return await self.aquery_model(
+                prompt=self._chat_prompt(messages, system_message),
+                model="mistralai/Mistral-7B-Instruct-v0.2",
+                max_tokens=max_tokens,
+                temperature=0.7
+            )
+                
+        except Exception as e:
+            logger.error(f"Error in aget_chat_response: {str(e)}")
+            return None
+    
+    def _chat_prompt(self, messages: List[Dict[str, str]], system_message: Optional[str]) -> str:
+        """Format a conversation into a prompt for the model
+        
+        Args:
+            messages (List[Dict[str, str]]): List of message objects with role and content
+            system_message (str, optional): System message for the conversation
+            
+        Returns:
+            str: The prompt, ending with the assistant's turn
+        """
+        prompt = ""
+        if system_message:
+            prompt += f"System: {system_message}\n\n"
+        
+        for message in messages:
+            role = message.get("role", "user")
+            content = message.get("content", "")
+            
+            # Format based on role
+            if role == "system":
+                # System messages were already handled at the beginning
+                continue
+            elif role == "user":
+                prompt += f"Human: {content}\n"
+            elif role == "assistant":
+                prompt += f"Assistant: {content}\n"
+            else:
+                # Unknown role, skip
+                continue
+        
+        # Add final prompt for the assistant
+        prompt += "Assistant: "
+        return prompt
\ No newline at end of file
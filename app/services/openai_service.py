@@ -4,18 +4,243 @@ OpenAI integration service for Persian Life Manager Application
 
 import os
 import json
-from openai import OpenAI
+import string
+import asyncio
+import logging
+from openai import AsyncOpenAI, OpenAI
+
+from app.services._response_cache import ResponseCache
+
+logger = logging.getLogger(__name__)
+
+# Advice texts by request, so repeated questions skip the API
+_response_cache = ResponseCache()
+
+# Transient API errors (rate limits, timeouts, 5xx) are retried by the SDK
+# with exponential backoff, honouring Retry-After
+_CLIENT_PARAMS = {"max_retries": 3, "timeout": 30}
+
+# System messages: role plus the fixed answer instructions. They are kept
+# byte-identical and ahead of the per-user data, so the provider can reuse
+# its cached prefix across users and calls.
+_HEALTH_ADVICE_SYSTEM = """شما یک متخصص سلامت و تناسب اندام هستید که توصیه‌های شخصی‌سازی شده به زبان فارسی ارائه می‌دهد.
+
+لطفاً توصیه‌های خود را در قالب HTML و در بخش‌های زیر ارائه دهید:
+1. برنامه ورزشی (شامل نوع، مدت و تکرار تمرینات)
+2. توصیه‌های تغذیه‌ای (شامل کالری روزانه و ماکرونوترینت‌ها)
+3. توصیه‌های خواب و استراحت
+4. نکات ویژه با توجه به شرایط سلامتی
+
+پاسخ باید به زبان فارسی و با تگ‌های HTML مناسب برای نمایش در وب باشد."""
+_FINANCIAL_ADVICE_SYSTEM = """شما یک مشاور مالی حرفه‌ای هستید که توصیه‌های شخصی‌سازی شده به زبان فارسی ارائه می‌دهد.
+
+لطفاً توصیه‌های خود را در قالب HTML و در بخش‌های زیر ارائه دهید:
+1. مدیریت هزینه‌ها و بودجه‌بندی
+2. استراتژی‌های پس‌انداز
+3. توصیه‌های سرمایه‌گذاری
+4. برنامه‌ریزی برای رسیدن به اهداف مالی
+
+پاسخ باید به زبان فارسی و با تگ‌های HTML مناسب برای نمایش در وب باشد."""
+_TIME_MANAGEMENT_ADVICE_SYSTEM = """شما یک متخصص مدیریت زمان هستید که توصیه‌های شخصی‌سازی شده به زبان فارسی ارائه می‌دهد.
+
+لطفاً توصیه‌های خود را در قالب HTML و در بخش‌های زیر ارائه دهید:
+1. اولویت‌بندی وظایف و زمان‌بندی
+2. مدیریت رویدادها و جلسات
+3. تکنیک‌های بهره‌وری و تمرکز
+4. توصیه‌های تعادل کار و زندگی
+
+پاسخ باید به زبان فارسی و با تگ‌های HTML مناسب برای نمایش در وب باشد."""
+
+# User prompts in Persian; only the user's data is filled in per call
+_HEALTH_ADVICE_PROMPT = string.Template("""به عنوان یک متخصص سلامت و تناسب اندام، لطفاً توصیه‌های شخصی‌سازی شده برای کاربر با مشخصات زیر ارائه دهید:
+
+قد: $height سانتی‌متر
+وزن: $weight کیلوگرم
+سطح فعالیت: $activity_level
+شرایط سلامتی: $health_conditions
+هدف: $goal_focus""")
+_FINANCIAL_ADVICE_PROMPT = string.Template("""به عنوان یک مشاور مالی، لطفاً توصیه‌های شخصی‌سازی شده برای کاربر با شرایط مالی زیر ارائه دهید:
+
+درآمد ماهانه: $income تومان
+پس‌انداز فعلی: $savings تومان
+
+هزینه‌های اخیر:
+$expenses
+
+اهداف مالی:
+$goals""")
+_TIME_MANAGEMENT_ADVICE_PROMPT = string.Template("""به عنوان یک متخصص مدیریت زمان، لطفاً توصیه‌های شخصی‌سازی شده برای کاربر با برنامه زیر ارائه دهید:
+
+وظایف در انتظار:
+$tasks
+
+رویدادهای پیش رو:
+$events
+
+اولویت‌های کاربر:
+$priorities""")
+
+# Shown in place of advice when the API call fails
+_HEALTH_ADVICE_ERROR = """<div dir="rtl" class="error-message">
+            متأسفانه در دریافت توصیه‌های هوش مصنوعی خطایی رخ داد. لطفاً بعداً دوباره امتحان کنید.
+            </div>"""
+_FINANCIAL_ADVICE_ERROR = """<div dir="rtl" class="error-message">
+            متأسفانه در دریافت توصیه‌های مالی خطایی رخ داد. لطفاً بعداً دوباره امتحان کنید.
+            </div>"""
+_TIME_MANAGEMENT_ADVICE_ERROR = """<div dir="rtl" class="error-message">
+            متأسفانه در دریافت توصیه‌های مدیریت زمان خطایی رخ داد. لطفاً بعداً دوباره امتحان کنید.
+            </div>"""
 
 class OpenAIService:
     """Service for OpenAI API integration"""
     
     def __init__(self):
         """Initialize OpenAI service"""
-        self.client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+        self.client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"), **_CLIENT_PARAMS)
         # the newest OpenAI model is "gpt-4o" which was released May 13, 2024.
         # do not change this unless explicitly requested by the user
         self.model = "gpt-4o"
     
+    def _complete(self, messages):
+        """Get a chat completion, answering repeated requests from the cache
+        
+        Args:
+            messages (list): Chat messages
+            
+        Returns:
+            str: The completion text
+        """
+        cache_keys = _response_cache.keys_for(self.model, messages)
+        content = _response_cache.get(cache_keys)
+        if content is None:
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=messages
+            )
+            content = response.choices[0].message.content
+            _response_cache.set(cache_keys, content)
+        return content
+    
+    def _stream(self, messages):
+        """Stream a chat completion as its tokens arrive
+        
+        A cached answer is yielded whole; otherwise the pieces are yielded
+        as the API sends them and the joined text, if any, is cached at the end.
+        
+        Args:
+            messages (list): Chat messages
+            
+        Yields:
+            str: Successive pieces of the completion text
+        """
+        cache_keys = _response_cache.keys_for(self.model, messages)
+        content = _response_cache.get(cache_keys)
+        if content is not None:
+            yield content
+            return
+        
+        stream = self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            stream=True
+        )
+        parts = []
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            piece = chunk.choices[0].delta.content or ""
+            if piece:
+                parts.append(piece)
+                yield piece
+        if parts:
+            _response_cache.set(cache_keys, "".join(parts))
+    
+    def _stream_advice(self, build_messages, user_data, error_html):
+        """Stream one kind of advice, ending with its error message if the call fails
+        
+        Args:
+            build_messages (callable): Builds the chat messages from user_data
+            user_data (dict): User data for the advice
+            error_html (str): Yielded in place of the rest of the advice on failure
+            
+        Yields:
+            str: Successive pieces of the advice
+        """
+        try:
+            yield from self._stream(build_messages(user_data))
+        except Exception as e:
+            logger.error(f"Error streaming advice: {str(e)}")
+            yield error_html
+    
+    async def _acomplete(self, client, messages):
+        """Get a chat completion without blocking the event loop
+        
+        Args:
+            client (AsyncOpenAI): Client to send the request with
+            messages (list): Chat messages
+            
+        Returns:
+            str: The completion text
+        """
+        cache_keys = _response_cache.keys_for(self.model, messages)
+        content = _response_cache.get(cache_keys)
+        if content is None:
+            response = await client.chat.completions.create(
+                model=self.model,
+                messages=messages
+            )
+            content = response.choices[0].message.content
+            _response_cache.set(cache_keys, content)
+        return content
+    
+    async def _aadvice(self, client, build_messages, user_data, error_html):
+        """Get one kind of advice, or its error message if the call fails
+        
+        Args:
+            client (AsyncOpenAI): Client to send the request with
+            build_messages (callable): Builds the chat messages from user_data
+            user_data (dict): User data for the advice
+            error_html (str): Returned in place of the advice on failure
+            
+        Returns:
+            str: The advice in Persian
+        """
+        try:
+            return await self._acomplete(client, build_messages(user_data))
+        except Exception as e:
+            logger.error(f"Error getting advice: {str(e)}")
+            return error_html
+    
+    async def get_all_advice(self, user_data):
+        """Get health, financial and time management advice concurrently
+        
+        The three requests are in flight together, so the wait is that of
+        the slowest one rather than the sum of all three.
+        
+        Args:
+            user_data (dict): User data with 'health', 'finance' and
+                'calendar' entries, as for the single advice methods
+                
+        Returns:
+            dict: Advice by domain ('health', 'finance', 'time_management')
+        """
+        # A client per call: its connection pool belongs to the running loop
+        async with AsyncOpenAI(api_key=os.environ.get("OPENAI_API_KEY"), **_CLIENT_PARAMS) as client:
+            health, finance, time_management = await asyncio.gather(
+                self._aadvice(client, self._health_advice_messages,
+                              user_data.get('health', {}), _HEALTH_ADVICE_ERROR),
+                self._aadvice(client, self._financial_advice_messages,
+                              user_data.get('finance', {}), _FINANCIAL_ADVICE_ERROR),
+                self._aadvice(client, self._time_management_advice_messages,
+                              user_data.get('calendar', {}), _TIME_MANAGEMENT_ADVICE_ERROR),
+            )
+        
+        return {
+            'health': health,
+            'finance': finance,
+            'time_management': time_management
+        }
+    
     def get_health_advice(self, user_data):
         """Get personalized health advice using OpenAI
         
@@ -33,38 +258,42 @@ class OpenAIService:
             str: Personalized health advice in Persian
         """
         try:
-            # Prepare the prompt in Persian
-            prompt = f"""به عنوان یک متخصص سلامت و تناسب اندام، لطفاً توصیه‌های شخصی‌سازی شده برای کاربر با مشخصات زیر ارائه دهید:
-
-قد: {user_data['height']} سانتی‌متر
-وزن: {user_data['weight']} کیلوگرم
-سطح فعالیت: {user_data['activity_level']}
-شرایط سلامتی: {user_data['health_conditions']}
-هدف: {user_data['goal_focus']}
-
-لطفاً توصیه‌های خود را در قالب HTML و در بخش‌های زیر ارائه دهید:
-1. برنامه ورزشی (شامل نوع، مدت و تکرار تمرینات)
-2. توصیه‌های تغذیه‌ای (شامل کالری روزانه و ماکرونوترینت‌ها)
-3. توصیه‌های خواب و استراحت
-4. نکات ویژه با توجه به شرایط سلامتی
-
-پاسخ باید به زبان فارسی و با تگ‌های HTML مناسب برای نمایش در وب باشد."""
-
-            # Get advice from OpenAI
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "شما یک متخصص سلامت و تناسب اندام هستید که توصیه‌های شخصی‌سازی شده به زبان فارسی ارائه می‌دهد."},
-                    {"role": "user", "content": prompt}
-                ]
-            )
+            return self._complete(self._health_advice_messages(user_data))
+        except Exception as e:
+            return _HEALTH_ADVICE_ERROR
+    
+    def stream_health_advice(self, user_data):
+        """Stream personalized health advice as it is generated
+        
+        Args:
+            user_data (dict): User data, as for get_health_advice
             
-            return response.choices[0].message.content
+        Yields:
+            str: Successive pieces of the advice in Persian
+        """
+        return self._stream_advice(self._health_advice_messages, user_data, _HEALTH_ADVICE_ERROR)
+    
+    def _health_advice_messages(self, user_data):
+        """Build the chat messages for get_health_advice
+        
+        Args:
+            user_data (dict): User data, as for get_health_advice
             
-        except Exception as e:
-            return f"""<div dir="rtl" class="error-message">
-            متأسفانه در دریافت توصیه‌های هوش مصنوعی خطایی رخ داد. لطفاً بعداً دوباره امتحان کنید.
-            </div>"""
+        Returns:
+            list: Chat messages
+        """
+        prompt = _HEALTH_ADVICE_PROMPT.substitute(
+            height=user_data['height'],
+            weight=user_data['weight'],
+            activity_level=user_data['activity_level'],
+            health_conditions=user_data['health_conditions'],
+            goal_focus=user_data['goal_focus']
+        )
+        
+        return [
+            {"role": "system", "content": _HEALTH_ADVICE_SYSTEM},
+            {"role": "user", "content": prompt}
+        ]
     
     def get_financial_advice(self, user_data):
         """Get personalized financial advice using OpenAI
@@ -80,44 +309,44 @@ class OpenAIService:
             str: Personalized financial advice in Persian
         """
         try:
-            # Prepare the prompt in Persian
-            expenses_text = "\n".join([f"- {exp['category']}: {exp['amount']:,} تومان" for exp in user_data['expenses']])
-            goals_text = "\n".join([f"- {goal}" for goal in user_data['goals']])
-            
-            prompt = f"""به عنوان یک مشاور مالی، لطفاً توصیه‌های شخصی‌سازی شده برای کاربر با شرایط مالی زیر ارائه دهید:
-
-درآمد ماهانه: {user_data['income']:,} تومان
-پس‌انداز فعلی: {user_data['savings']:,} تومان
-
-هزینه‌های اخیر:
-{expenses_text}
-
-اهداف مالی:
-{goals_text}
-
-لطفاً توصیه‌های خود را در قالب HTML و در بخش‌های زیر ارائه دهید:
-1. مدیریت هزینه‌ها و بودجه‌بندی
-2. استراتژی‌های پس‌انداز
-3. توصیه‌های سرمایه‌گذاری
-4. برنامه‌ریزی برای رسیدن به اهداف مالی
-
-پاسخ باید به زبان فارسی و با تگ‌های HTML مناسب برای نمایش در وب باشد."""
-
-            # Get advice from OpenAI
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "شما یک مشاور مالی حرفه‌ای هستید که توصیه‌های شخصی‌سازی شده به زبان فارسی ارائه می‌دهد."},
-                    {"role": "user", "content": prompt}
-                ]
-            )
+            return self._complete(self._financial_advice_messages(user_data))
+        except Exception as e:
+            return _FINANCIAL_ADVICE_ERROR
+    
+    def stream_financial_advice(self, user_data):
+        """Stream personalized financial advice as it is generated
+        
+        Args:
+            user_data (dict): User data, as for get_financial_advice
             
-            return response.choices[0].message.content
+        Yields:
+            str: Successive pieces of the advice in Persian
+        """
+        return self._stream_advice(self._financial_advice_messages, user_data, _FINANCIAL_ADVICE_ERROR)
+    
+    def _financial_advice_messages(self, user_data):
+        """Build the chat messages for get_financial_advice
+        
+        Args:
+            user_data (dict): User data, as for get_financial_advice
             
-        except Exception as e:
-            return f"""<div dir="rtl" class="error-message">
-            متأسفانه در دریافت توصیه‌های مالی خطایی رخ داد. لطفاً بعداً دوباره امتحان کنید.
-            </div>"""
+        Returns:
+            list: Chat messages
+        """
+        expenses_text = "\n".join([f"- {exp['category']}: {exp['amount']:,} تومان" for exp in user_data['expenses']])
+        goals_text = "\n".join([f"- {goal}" for goal in user_data['goals']])
+        
+        prompt = _FINANCIAL_ADVICE_PROMPT.substitute(
+            income=f"{user_data['income']:,}",
+            savings=f"{user_data['savings']:,}",
+            expenses=expenses_text,
+            goals=goals_text
+        )
+        
+        return [
+            {"role": "system", "content": _FINANCIAL_ADVICE_SYSTEM},
+            {"role": "user", "content": prompt}
+        ]
     
     def get_time_management_advice(self, user_data):
         """Get personalized time management advice using OpenAI
@@ -132,42 +361,41 @@ class OpenAIService:
             str: Personalized time management advice in Persian
         """
         try:
-            # Prepare the prompt in Persian
-            tasks_text = "\n".join([f"- {task['title']} (اولویت: {task['priority']})" for task in user_data['tasks']])
-            events_text = "\n".join([f"- {event['title']} ({event['date']})" for event in user_data['events']])
-            priorities_text = "\n".join([f"- {priority}" for priority in user_data['priorities']])
-            
-            prompt = f"""به عنوان یک متخصص مدیریت زمان، لطفاً توصیه‌های شخصی‌سازی شده برای کاربر با برنامه زیر ارائه دهید:
-
-وظایف در انتظار:
-{tasks_text}
-
-رویدادهای پیش رو:
-{events_text}
-
-اولویت‌های کاربر:
-{priorities_text}
-
-لطفاً توصیه‌های خود را در قالب HTML و در بخش‌های زیر ارائه دهید:
-1. اولویت‌بندی وظایف و زمان‌بندی
-2. مدیریت رویدادها و جلسات
-3. تکنیک‌های بهره‌وری و تمرکز
-4. توصیه‌های تعادل کار و زندگی
-
-پاسخ باید به زبان فارسی و با تگ‌های HTML مناسب برای نمایش در وب باشد."""
-
-            # Get advice from OpenAI
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "شما یک متخصص مدیریت زمان هستید که توصیه‌های شخصی‌سازی شده به زبان فارسی ارائه می‌دهد."},
-                    {"role": "user", "content": prompt}
-                ]
-            )
+            return self._complete(self._time_management_advice_messages(user_data))
+        except Exception as e:
+            return _TIME_MANAGEMENT_ADVICE_ERROR
+    
+    def stream_time_management_advice(self, user_data):
+        """Stream personalized time management advice as it is generated
+        
+        Args:
+            user_data (dict): User data, as for get_time_management_advice
             
-            return response.choices[0].message.content
+        Yields:
+            str: Successive pieces of the advice in Persian
+        """
+        return self._stream_advice(self._time_management_advice_messages, user_data, _TIME_MANAGEMENT_ADVICE_ERROR)
+    
+    def _time_management_advice_messages(self, user_data):
+        """Build the chat messages for get_time_management_advice
+        
+        Args:
+            user_data (dict): User data, as for get_time_management_advice
             
-        except Exception as e:
-            return f"""<div dir="rtl" class="error-message">
-            متأسفانه در دریافت توصیه‌های مدیریت زمان خطایی رخ داد. لطفاً بعداً دوباره امتحان کنید.
-            </div>"""
\ No newline at end of file
+        Returns:
+            list: Chat messages
+        """
+        tasks_text = "\n".join([f"- {task['title']} (اولویت: {task['priority']})" for task in user_data['tasks']])
+        events_text = "\n".join([f"- {event['title']} ({event['date']})" for event in user_data['events']])
+        priorities_text = "\n".join([f"- {priority}" for priority in user_data['priorities']])
+        
+        prompt = _TIME_MANAGEMENT_ADVICE_PROMPT.substitute(
+            tasks=tasks_text,
+            events=events_text,
+            priorities=priorities_text
+        )
+        
+        return [
+            {"role": "system", "content": _TIME_MANAGEMENT_ADVICE_SYSTEM},
+            {"role": "user", "content": prompt}
+        ]
@@ -6,7 +6,8 @@ import base64
 import io
 import logging
 import tempfile
-import requests
+
+from app.services.huggingface_service import API_URL, REQUEST_TIMEOUT, _api_key_from_env, _session
 
 logger = logging.getLogger(__name__)
 
@@ -15,13 +16,13 @@ class SpeechToTextServiceHF:
     
     def __init__(self):
         """Initialize the service"""
-        self.api_key = os.environ.get("HUGGINGFACE_API_KEY") or os.environ.get("XAI_API_KEY") or os.environ.get("OPENAI_API_KEY")
-        self.api_url = "https://api-inference.huggingface.co/models/"
+        self.api_key = _api_key_from_env()
+        self.api_url = f"{API_URL}/"
         self.model = "facebook/wav2vec2-large-960h" # Good base model for English
         self.farsi_model = "m3hrdadfi/wav2vec2-large-xlsr-persian" # Persian-specific model
         
         if not self.api_key:
-            logger.warning("Hugging Face API key not found in any environment variable (HUGGINGFACE_API_KEY, XAI_API_KEY, or OPENAI_API_KEY)")
+            logger.warning("Hugging Face API key not found (HUGGINGFACE_API_KEY)")
         else:
             logger.info("Hugging Face client initialized successfully for Speech-to-Text")
     
@@ -58,10 +59,11 @@ class SpeechToTextServiceHF:
                     "Authorization": f"Bearer {self.api_key}"
                 }
                 
-                response = requests.post(
-                    f"https://api-inference.huggingface.co/models/{selected_model}",
+                response = _session.post(
+                    f"{self.api_url}{selected_model}",
                     headers=headers,
-                    data=audio_file
+                    data=audio_file,
+                    timeout=REQUEST_TIMEOUT
                 )
                 
                 # Clean up temp file
@@ -146,9 +146,16 @@ class Dashboard(QWidget):
         """Load data for all dashboard sections"""
         self.load_finance_summary()
         self.load_health_summary()
-        self.load_tasks_summary()
-        self.load_upcoming_events()
-        self.load_pending_tasks()
+        
+        try:
+            calendar_data = self.calendar_service.get_dashboard_bundle()
+        except Exception as e:
+            logger.error(f"Error loading calendar data: {str(e)}")
+            calendar_data = {}
+        
+        self.load_tasks_summary(calendar_data.get('tasks'))
+        self.load_upcoming_events(calendar_data.get('events'))
+        self.load_pending_tasks(calendar_data.get('pending_tasks'))
         self.load_charts()
     
     def load_finance_summary(self):
@@ -198,10 +205,15 @@ class Dashboard(QWidget):
             logger.error(f"Error loading health summary: {str(e)}")
             self.health_card.setValue("خطا در بارگذاری اطلاعات")
     
-    def load_tasks_summary(self):
-        """Load tasks summary for the dashboard"""
+    def load_tasks_summary(self, today_tasks=None):
+        """Load tasks summary for the dashboard
+        
+        Args:
+            today_tasks (list, optional): Pre-fetched tasks due today
+        """
         try:
-            today_tasks = self.calendar_service.get_today_tasks()
+            if today_tasks is None:
+                today_tasks = self.calendar_service.get_today_tasks()
             
             completed = sum(1 for task in today_tasks if task.completed)
             total = len(today_tasks)
@@ -223,10 +235,15 @@ class Dashboard(QWidget):
             logger.error(f"Error loading tasks summary: {str(e)}")
             self.tasks_card.setValue("خطا در بارگذاری اطلاعات")
     
-    def load_upcoming_events(self):
-        """Load upcoming events for the dashboard"""
+    def load_upcoming_events(self, events=None):
+        """Load upcoming events for the dashboard
+        
+        Args:
+            events (list, optional): Pre-fetched upcoming events
+        """
         try:
-            events = self.calendar_service.get_upcoming_events(limit=5)
+            if events is None:
+                events = self.calendar_service.get_upcoming_events(limit=5)
             
             # Clear the table
             self.events_table.setRowCount(0)
@@ -252,10 +269,15 @@ class Dashboard(QWidget):
         except Exception as e:
             logger.error(f"Error loading upcoming events: {str(e)}")
     
-    def load_pending_tasks(self):
-        """Load pending tasks for the dashboard"""
+    def load_pending_tasks(self, tasks=None):
+        """Load pending tasks for the dashboard
+        
+        Args:
+            tasks (list, optional): Pre-fetched pending tasks
+        """
         try:
-            tasks = self.calendar_service.get_pending_tasks(limit=5)
+            if tasks is None:
+                tasks = self.calendar_service.get_pending_tasks(limit=5)
             
             # Clear the table
             self.tasks_table.setRowCount(0)
@@ -976,8 +976,7 @@ class HealthModule(QWidget):
                 self.load_exercises()
                 self.update_dashboard()
                 
-                # Update goals (exercise might affect goals)
-                self.health_service.update_goal_progress()
+                # Reload goals (exercise might affect goals; progress is recomputed on read)
                 self.load_goals()
                 
                 QMessageBox.information(self, "موفقیت", "فعالیت با موفقیت حذف شد.")
@@ -1002,8 +1001,7 @@ class HealthModule(QWidget):
                 self.load_metrics()
                 self.update_dashboard()
                 
-                # Update goals (metrics might affect goals)
-                self.health_service.update_goal_progress()
+                # Reload goals (metrics might affect goals; progress is recomputed on read)
                 self.load_goals()
                 
                 QMessageBox.information(self, "موفقیت", "شاخص سلامتی با موفقیت حذف شد.")
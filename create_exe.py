@@ -81,6 +81,7 @@ a = Analysis(
         'app.services.speech_to_text',
         'app.services.religious_service',
         'app.services.calendar_converter',
+        'app.services._jalali',
         'app.ui.widgets',
         'app.ui.style',
         'app.ui.dashboard',
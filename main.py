@@ -131,9 +131,12 @@ def run_replit_web_preview():
     
     # If provided key is a Hugging Face API key (starts with "hf_"), store it
     if OPENAI_API_KEY and OPENAI_API_KEY.startswith("hf_"):
-        os.environ["HUGGINGFACE_API_KEY"] = OPENAI_API_KEY
         HUGGINGFACE_API_KEY = OPENAI_API_KEY
         OPENAI_API_KEY = None
+    
+    # The Hugging Face services read the key from HUGGINGFACE_API_KEY only
+    if HUGGINGFACE_API_KEY:
+        os.environ["HUGGINGFACE_API_KEY"] = HUGGINGFACE_API_KEY
         
     # Log which API keys are available
     if not OPENAI_API_KEY and not HUGGINGFACE_API_KEY: